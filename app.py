@@ -1,10 +1,13 @@
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, make_response, Response
 from functools import wraps
 import os
-from datetime import datetime
+from datetime import date, datetime
+import hashlib
 import time
 from dotenv import load_dotenv
-from database import TournamentDB, init_db, get_db_connection
+from database import (TournamentDB, BulkMatchError, init_db, get_db_connection, close_request_connection,
+                      enable_read_cache, MATCH_COUNT_CACHE_SECONDS, QUERY_PROFILING, QUERY_SLOW_MS,
+                      query_profiles, start_query_profile, finish_query_profile, summarize_query_profiles)
 from imagekit_config import PhotoManager, upload_player_photo, delete_player_photo
 
 # Load environment variables
@@ -20,6 +23,14 @@ app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 
+# Return the request-scoped database connection to the pool
+app.teardown_request(close_request_connection)
+
+# Time each request's queries and report them in Server-Timing (see /admin/perf)
+if QUERY_PROFILING:
+    app.before_request(start_query_profile)
+    app.after_request(finish_query_profile)
+
 # Cache buster for static files
 @app.context_processor
 def inject_cache_buster():
@@ -36,17 +47,61 @@ def inject_cache_buster():
     
     return dict(cache_buster=cache_buster, moment=moment)
 
+def set_no_store(response):
+    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '-1'
+    return response
+
 # Decorator to prevent caching
 def no_cache(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        response = make_response(f(*args, **kwargs))
-        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '-1'
-        return response
+        return set_no_store(make_response(f(*args, **kwargs)))
     return decorated_function
 
+# Seconds one recalculation progress stream stays open; the browser's
+# EventSource then reconnects and resumes from Last-Event-ID, so a long job
+# never holds a sync worker past the gunicorn timeout
+RECALC_STREAM_SECONDS = float(os.getenv('RECALC_STREAM_SECONDS', '20'))
+
+# Part of every ETag, so a deploy with changed templates never answers 304 with old HTML
+ETAG_BUILD = os.getenv('RENDER_GIT_COMMIT') or str(int(time.time()))
+
+# Decorator for public pages: answer If-None-Match with 304 while the data the
+# page shows is unchanged, and serve its TournamentDB reads from the read cache.
+# stamp(**view_args) returns the page's data version (None if the page doesn't
+# exist); without it the global version is used. Admin pages never use this,
+# so they always see their own writes.
+def public_page(stamp=None):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                global_version = TournamentDB.get_data_version()
+                page_version = stamp(**kwargs) if stamp else global_version
+            except Exception as e:
+                print(f"Data version lookup failed: {e}")
+                global_version = page_version = None
+            enable_read_cache(global_version)
+            if page_version is None:
+                return set_no_store(make_response(f(*args, **kwargs)))
+            # Pages count "today's" matches, so the date is part of the version
+            raw_etag = f"{ETAG_BUILD}:{date.today().isoformat()}:{page_version}:{request.query_string.decode()}"
+            etag = hashlib.sha1(raw_etag.encode()).hexdigest()[:24]
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return set_no_store(response)
+            response.set_etag(etag, weak=True)
+            # Browsers and CDNs may store the page but must revalidate every time
+            response.headers['Cache-Control'] = 'public, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
 # Decorator to require admin authentication
 def admin_required(f):
     @wraps(f)
@@ -828,25 +883,16 @@ def delete_tournament(tournament_id):
 @admin_required
 @no_cache
 def recalculate_tournament_stats(tournament_id):
-    """Recalculate all stats for a specific tournament"""
+    """Queue a recalculation of all stats for a specific tournament"""
     try:
-        tournament = TournamentDB.get_tournament_by_id(tournament_id)
-        if not tournament:
-            return jsonify({'success': False, 'error': 'Tournament not found'}), 404
-        
-        # Call the recalculation method
-        result = TournamentDB.recalculate_tournament_ratings(tournament_id)
-        
-        if result['success']:
-            return jsonify({
-                'success': True,
-                'message': result['message'],
-                'players_updated': result.get('players_updated', 0),
-                'matches_processed': result.get('matches_processed', 0)
-            })
-        else:
-            return jsonify({'success': False, 'error': 'Recalculation failed'}), 500
-            
+        job_id = TournamentDB.enqueue_recalculation(tournament_id)
+        return jsonify({
+            'success': True,
+            'message': 'Recalculation queued',
+            'job_id': job_id
+        }), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -917,9 +963,11 @@ def recalculation_details(tournament_id):
         finally:
             conn.close()
         
+        job_id = TournamentDB.enqueue_recalculation(tournament_id)
         return render_template('admin/recalculation_live.html', 
                              tournament=tournament,
-                             matches=matches)
+                             matches=matches,
+                             job_id=job_id)
         
     except Exception as e:
         flash(f'Error during recalculation: {str(e)}', 'error')
@@ -929,214 +977,37 @@ def recalculation_details(tournament_id):
 @admin_required
 @no_cache
 def do_recalculate(tournament_id):
-    """Stream recalculation progress match by match"""
+    """Stream a queued recalculation's progress events (the work runs in worker.py)"""
     import json
-    import time
+    
+    job_id = request.args.get('job', type=int)
+    job = TournamentDB.get_recalculation_job(job_id=job_id, tournament_id=tournament_id)
+    last_seq = request.headers.get('Last-Event-ID', 0, type=int)
     
     def generate():
+        if not job or job['tournament_id'] != tournament_id:
+            yield f"data: {json.dumps({'type': 'error', 'message': 'Recalculation job not found'})}\n\n"
+            return
+        
+        seq = last_seq
+        deadline = time.monotonic() + RECALC_STREAM_SECONDS
+        yield "retry: 1000\n\n"
         try:
-            tournament = TournamentDB.get_tournament_by_id(tournament_id)
-            if not tournament:
-                yield f"data: {json.dumps({'error': 'Tournament not found'})}\n\n"
-                return
-            
-            conn = get_db_connection()
-            
-            # Get all players in tournament and their initial ratings
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT DISTINCT player_id, division_id
-                    FROM tournament_players
-                    WHERE tournament_id = %s
-                """, (tournament_id,))
-                tournament_players = cursor.fetchall()
-            
-            # Clear existing tournament stats
-            with conn.cursor() as cursor:
-                cursor.execute("DELETE FROM player_stats WHERE tournament_id = %s", (tournament_id,))
-            conn.commit()
-            
-            # Initialize ratings based on divisions
-            is_division = tournament.get('tournament_type') == 'division'
-            current_ratings = {}
-            
-            for tp in tournament_players:
-                player_id = tp['player_id']
-                if is_division and tp['division_id']:
-                    with conn.cursor() as cursor:
-                        cursor.execute("SELECT starting_rating FROM divisions WHERE id = %s", (tp['division_id'],))
-                        div = cursor.fetchone()
-                        current_ratings[player_id] = div['starting_rating'] if div else 300
-                else:
-                    current_ratings[player_id] = 300
-            
-            # Get all matches
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT pm.*, p1.name as player1_name, p2.name as player2_name
-                    FROM player_matches pm
-                    JOIN players p1 ON pm.player1_id = p1.id
-                    LEFT JOIN players p2 ON pm.player2_id = p2.id
-                    WHERE pm.tournament_id = %s
-                    ORDER BY pm.played_at ASC NULLS LAST, pm.match_id ASC
-                """, (tournament_id,))
-                matches = cursor.fetchall()
-            
-            total = len(matches)
-            yield f"data: {json.dumps({'type': 'start', 'total': total, 'initial_ratings': current_ratings})}\n\n"
-            
-            # Process each match
-            for index, match in enumerate(matches):
-                p1_id = match['player1_id']
-                p2_id = match['player2_id']
-                g1 = match['player1_goals']
-                g2 = match['player2_goals']
-                is_walkover = match.get('is_walkover', False)
-                is_null = match.get('is_null_match', False)
-                is_draw = match.get('is_draw', False)
-                winner_id = match.get('winner_id')
-                p1_absent = match.get('player1_absent', False)
-                p2_absent = match.get('player2_absent', False)
-                
-                # Get current ratings
-                p1_rating_before = current_ratings.get(p1_id, 300)
-                p2_rating_before = current_ratings.get(p2_id, 300) if p2_id else 0
-                
-                # Calculate rating changes
-                if is_null:
-                    NULL_PENALTY = 15
-                    p1_rating_after = max(0, min(1000, p1_rating_before - NULL_PENALTY))
-                    p2_rating_after = max(0, min(1000, p2_rating_before - NULL_PENALTY)) if p2_id else 0
-                elif is_walkover:
-                    if winner_id == p1_id:
-                        change_w, change_l = TournamentDB.calculate_rating_change(p1_rating_before, p2_rating_before, False)
-                        change1, change2 = int(change_w * 0.75), int(change_l * 0.75)
-                    else:
-                        change_w, change_l = TournamentDB.calculate_rating_change(p2_rating_before, p1_rating_before, False)
-                        change2, change1 = int(change_w * 0.75), int(change_l * 0.75)
-                    p1_rating_after = max(0, min(1000, p1_rating_before + change1))
-                    p2_rating_after = max(0, min(1000, p2_rating_before + change2)) if p2_id else 0
-                else:
-                    change1, change2 = TournamentDB.calculate_enhanced_rating_change(
-                        p1_rating_before, p2_rating_before, g1, g2, p1_absent, p2_absent
-                    )
-                    p1_rating_after = max(0, min(1000, p1_rating_before + change1))
-                    p2_rating_after = max(0, min(1000, p2_rating_before + change2)) if p2_id else 0
-                
-                # Update current ratings
-                current_ratings[p1_id] = p1_rating_after
-                if p2_id:
-                    current_ratings[p2_id] = p2_rating_after
-                
-                # Update match record
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        UPDATE player_matches SET
-                            player1_rating_before = %s,
-                            player2_rating_before = %s,
-                            player1_rating_after = %s,
-                            player2_rating_after = %s
-                        WHERE id = %s
-                    """, (p1_rating_before, p2_rating_before, p1_rating_after, p2_rating_after, match['id']))
-                conn.commit()
-                
-                # Update stats if not null
-                if not is_null:
-                    for pid, rating_after, won, drawn, lost, gf, ga in [
-                        (p1_id, p1_rating_after, 1 if winner_id == p1_id else 0, 1 if is_draw else 0, 1 if winner_id == p2_id else 0, g1, g2),
-                        (p2_id, p2_rating_after, 1 if winner_id == p2_id else 0, 1 if is_draw else 0, 1 if winner_id == p1_id else 0, g2, g1) if p2_id else None
-                    ]:
-                        if pid:
-                            glove_points = 0 if is_walkover else TournamentDB.calculate_golden_glove_points(gf, ga, winner_id == pid, is_draw)
-                            with conn.cursor() as cursor:
-                                cursor.execute("""
-                                    INSERT INTO player_stats (player_id, tournament_id, tournament_rating, matches_played, wins, draws, losses, goals_scored, goals_conceded, clean_sheets, golden_glove_points)
-                                    VALUES (%s, %s, %s, 1, %s, %s, %s, %s, %s, %s, %s)
-                                    ON CONFLICT (player_id, tournament_id) DO UPDATE SET
-                                        tournament_rating = %s, matches_played = player_stats.matches_played + 1,
-                                        wins = player_stats.wins + %s, draws = player_stats.draws + %s, losses = player_stats.losses + %s,
-                                        goals_scored = player_stats.goals_scored + %s, goals_conceded = player_stats.goals_conceded + %s,
-                                        clean_sheets = player_stats.clean_sheets + %s, golden_glove_points = player_stats.golden_glove_points + %s
-                                """, (pid, tournament_id, rating_after, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove_points,
-                                      rating_after, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove_points))
-                            conn.commit()
-                
-                # Send progress update
-                match_data = {
-                    'index': index,
-                    'player1_name': match['player1_name'],
-                    'player2_name': match.get('player2_name'),
-                    'player1_goals': g1,
-                    'player2_goals': g2,
-                    'player1_rating_before': float(p1_rating_before),
-                    'player1_rating_after': float(p1_rating_after),
-                    'player2_rating_before': float(p2_rating_before),
-                    'player2_rating_after': float(p2_rating_after),
-                    'is_guest_match': match.get('is_guest_match', False),
-                    'guest_name': match.get('guest_name')
-                }
-                
-                yield f"data: {json.dumps({'type': 'progress', 'data': match_data})}\n\n"
-                time.sleep(0.001)  # Tiny delay for smoother streaming
-            
-            # Recalculate overall ratings for ALL players who have matches
-            # This ensures consistency across all tournaments after any recalculation
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT DISTINCT player_id FROM (
-                        SELECT player1_id as player_id FROM player_matches
-                        UNION
-                        SELECT player2_id as player_id FROM player_matches WHERE player2_id IS NOT NULL
-                    ) AS all_player_ids
-                """)
-                all_players_with_matches = cursor.fetchall()
-            
-            for player_row in all_players_with_matches:
-                player_id = player_row['player_id']
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        UPDATE players SET rating = NULL, matches_played = 0, matches_won = 0, 
-                        matches_drawn = 0, matches_lost = 0, goals_scored = 0, goals_conceded = 0,
-                        clean_sheets = 0, golden_glove_points = 0 WHERE id = %s
-                    """, (player_id,))
-                    cursor.execute("""
-                        SELECT * FROM player_matches
-                        WHERE player1_id = %s OR player2_id = %s
-                        ORDER BY played_at ASC NULLS LAST, match_id ASC
-                    """, (player_id, player_id))
-                    all_matches = cursor.fetchall()
-                    
-                    overall_rating = 300
-                    for pm in all_matches:
-                        is_p1 = pm['player1_id'] == player_id
-                        rating_change = pm['player1_rating_after'] - pm['player1_rating_before'] if is_p1 else pm['player2_rating_after'] - pm['player2_rating_before']
-                        overall_rating += rating_change
-                        
-                        if not pm.get('is_null_match'):
-                            gf = pm['player1_goals'] if is_p1 else pm['player2_goals']
-                            ga = pm['player2_goals'] if is_p1 else pm['player1_goals']
-                            won = 1 if pm.get('winner_id') == player_id else 0
-                            drawn = 1 if pm.get('is_draw') else 0
-                            lost = 1 if (not pm.get('is_draw') and pm.get('winner_id') != player_id) else 0
-                            glove = 0 if pm.get('is_walkover') else TournamentDB.calculate_golden_glove_points(gf, ga, pm.get('winner_id') == player_id, pm.get('is_draw'))
-                            
-                            cursor.execute("""
-                                UPDATE players SET rating = %s, matches_played = matches_played + 1,
-                                matches_won = matches_won + %s, matches_drawn = matches_drawn + %s, matches_lost = matches_lost + %s,
-                                goals_scored = goals_scored + %s, goals_conceded = goals_conceded + %s,
-                                clean_sheets = clean_sheets + %s, golden_glove_points = golden_glove_points + %s
-                                WHERE id = %s
-                            """, (overall_rating, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove, player_id))
-                conn.commit()
-            
-            conn.close()
-            
-            # Small delay to ensure all progress updates are received
-            time.sleep(0.1)
-            
-            # Send completion message
-            yield f"data: {json.dumps({'type': 'complete', 'message': f'Successfully recalculated {total} matches'})}\n\n"
-            
+            while time.monotonic() < deadline:
+                events = TournamentDB.get_recalculation_events(job['id'], seq)
+                for event in events:
+                    seq = event['seq']
+                    yield f"id: {seq}\ndata: {event['payload']}\n\n"
+                if events and json.loads(events[-1]['payload'])['type'] in ('complete', 'error'):
+                    return
+                if not events:
+                    current = TournamentDB.get_recalculation_job(job_id=job['id'])
+                    if current['status'] == 'failed':
+                        # Failed without recording an event (its worker was lost too often)
+                        yield f"data: {json.dumps({'type': 'error', 'message': current['error'] or 'Recalculation failed'})}\n\n"
+                        return
+                    time.sleep(0.5)
+            # Stream window over; the browser reconnects with Last-Event-ID
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
     
@@ -1400,6 +1271,28 @@ def view_player_stats():
                          golden_glove_tournament_top=golden_glove_tournament_top)
 
 
+@app.route('/admin/perf')
+@admin_required
+@no_cache
+def admin_perf():
+    """Recent request query profiles from this worker's ring buffer"""
+    sort = request.args.get('sort', 'recent')
+    profiles = list(query_profiles)
+    if sort == 'queries':
+        profiles.sort(key=lambda profile: profile.count, reverse=True)
+    elif sort == 'db':
+        profiles.sort(key=lambda profile: profile.db_ms, reverse=True)
+    else:
+        profiles.reverse()
+    return render_template('admin/perf.html',
+                         enabled=QUERY_PROFILING,
+                         slow_ms=QUERY_SLOW_MS,
+                         worker_pid=os.getpid(),
+                         capacity=query_profiles.maxlen,
+                         profiles=profiles[:50],
+                         endpoints=summarize_query_profiles(),
+                         sort=sort)
+
 @app.route('/admin/matches/bulk', methods=['GET', 'POST'])
 @admin_required
 @no_cache
@@ -1520,6 +1413,7 @@ def bulk_record_matches():
                 
                 # If validation passes, add to matches_data
                 matches_data.append({
+                    'row': match_number,
                     'tournament_id': tournament_id,
                     'player1_id': player1_id,
                     'player2_id': player2_id,
@@ -1574,6 +1468,10 @@ def bulk_record_matches():
                 try:
                     regular_match_ids = TournamentDB.record_bulk_matches(regular_matches)
                     match_ids.extend(regular_match_ids)
+                except BulkMatchError as e:
+                    # Nothing from the regular batch was recorded
+                    for row, message in e.errors:
+                        processing_errors.append(f'Match {row}: {message}')
                 except Exception as e:
                     processing_errors.append(f'Regular matches processing error: {str(e)}')
             
@@ -1610,21 +1508,14 @@ def bulk_record_matches():
 @admin_required
 @no_cache
 def manage_matches():
-    """View and manage all matches with pagination and search"""
+    """View and manage all matches with server-side search and pagination"""
     tournament_id = request.args.get('tournament_id')
     search_query = request.args.get('search', '').strip()
-    page = int(request.args.get('page', 1))
+    page_token = request.args.get('cursor') or None
     
-    # Get per_page from request with default of 25, allow up to 10000 matches
+    # Get per_page from request with default of 25, allow up to 500 matches
     per_page = int(request.args.get('per_page', 25))
-    per_page = max(1, min(per_page, 10000))  # Limit between 1 and 10000
-    
-    # For search functionality, we'll load more matches than requested
-    # This allows client-side search to work across more data
-    search_limit = max(per_page, 1000)  # Load at least 1000 matches for search
-    
-    # Calculate offset for pagination
-    offset = (page - 1) * per_page
+    per_page = max(1, min(per_page, 500))  # Limit between 1 and 500
     
     # Convert tournament_id to int if provided
     tournament_id_int = None
@@ -1634,31 +1525,25 @@ def manage_matches():
         except ValueError:
             tournament_id = None
     
-    # Get matches - load more for better search functionality
-    all_matches = TournamentDB.get_all_matches(
-        tournament_id=tournament_id_int, 
-        limit=search_limit, 
-        offset=0,  # Start from beginning for search
-        search_query=None  # Don't filter server-side, we'll do client-side
-    )
-    
-    # For display, we'll use client-side pagination and search
-    matches = all_matches
+    # Search and paging both run in the database; only one page is rendered
+    try:
+        match_page = TournamentDB.get_matches_page(
+            tournament_id=tournament_id_int,
+            search_query=search_query or None,
+            page_token=page_token,
+            per_page=per_page
+        )
+    except ValueError:
+        return redirect(url_for('manage_matches', tournament_id=tournament_id_int,
+                                search=search_query or None, per_page=per_page))
+    matches = match_page['matches']
     
-    # Get total count for pagination (all matches, not just loaded)
+    # Exact count (admins expect it to move as soon as they edit matches)
     total_matches = TournamentDB.get_matches_count(
         tournament_id=tournament_id_int,
-        search_query=None  # Total count without search filter
+        search_query=search_query or None
     )
     
-    # For client-side pagination, we work with loaded matches
-    loaded_matches_count = len(matches)
-    
-    # Calculate pagination info based on total matches
-    total_pages = (total_matches + per_page - 1) // per_page
-    has_prev = page > 1
-    has_next = page < total_pages
-    
     # Get tournaments for filter
     tournaments = TournamentDB.get_all_tournaments()
     
@@ -1670,12 +1555,9 @@ def manage_matches():
                          matches=matches, 
                          tournaments=tournaments,
                          selected_tournament=selected_tournament,
-                         current_page=page,
-                         total_pages=total_pages,
-                         has_prev=has_prev,
-                         has_next=has_next,
+                         next_token=match_page['next_token'],
+                         prev_token=match_page['prev_token'],
                          total_matches=total_matches,
-                         loaded_matches_count=loaded_matches_count,
                          per_page=per_page,
                          search_query=search_query)
 
@@ -1753,15 +1635,8 @@ def bulk_delete_matches():
             flash('No matches selected for deletion.', 'error')
             return redirect(url_for('manage_matches'))
         
-        deleted_count = 0
-        errors = []
-        
-        for match_id in match_ids:
-            try:
-                TournamentDB.delete_match(int(match_id))
-                deleted_count += 1
-            except Exception as e:
-                errors.append(f'Match #{match_id}: {str(e)}')
+        deleted_count, failures = TournamentDB.delete_matches([int(match_id) for match_id in match_ids])
+        errors = [f'Match #{match_id}: {message}' for match_id, message in failures]
         
         if deleted_count > 0:
             flash(f'Successfully deleted {deleted_count} match{"es" if deleted_count > 1 else ""}! Player ratings have been recalculated.', 'success')
@@ -1795,7 +1670,7 @@ def get_tournament_players_api(tournament_id):
 # Public Routes (No Authentication Required)
 @app.route('/')  # Root URL now shows public homepage
 @app.route('/public')
-@no_cache
+@public_page()
 def public_home():
     """Public homepage with tournament overview"""
     try:
@@ -1809,48 +1684,19 @@ def public_home():
         golden_ball_overall = TournamentDB.get_golden_ball_overall() if hasattr(TournamentDB, 'get_golden_ball_overall') else None
         
         # Get comprehensive statistics
-        conn = get_db_connection()
+        total_tournaments = len(tournaments)
+        active_tournaments = [t for t in tournaments if t['status'] == 'active']
         try:
-            with conn.cursor() as cursor:
-                # Total players
-                cursor.execute("SELECT COUNT(*) as count FROM players")
-                total_players = cursor.fetchone()['count']
-                
-                # Total tournaments
-                total_tournaments = len(tournaments)
-                
-                # Active tournaments
-                active_tournaments = [t for t in tournaments if t['status'] == 'active']
-                
-                # Total matches
-                cursor.execute("SELECT COUNT(*) as count FROM player_matches")
-                total_matches = cursor.fetchone()['count']
-                
-                # Average rating
-                cursor.execute("SELECT AVG(rating) as avg_rating FROM players")
-                avg_rating_result = cursor.fetchone()
-                average_rating = int(avg_rating_result['avg_rating']) if avg_rating_result['avg_rating'] else 300
-                
-                # Recent matches for activity feed
-                cursor.execute("""
-                    SELECT pm.*, p1.name as player1_name, p2.name as player2_name, t.name as tournament_name
-                    FROM player_matches pm
-                    JOIN players p1 ON pm.player1_id = p1.id
-                    LEFT JOIN players p2 ON pm.player2_id = p2.id
-                    JOIN tournaments t ON pm.tournament_id = t.id
-                    ORDER BY pm.played_at DESC
-                    LIMIT 10
-                """)
-                recent_matches = cursor.fetchall()
+            site_stats = TournamentDB.get_site_stats()
+            total_players = site_stats['total_players']
+            total_matches = site_stats['total_matches']
+            average_rating = site_stats['average_rating']
+            recent_matches = site_stats['recent_matches']
         except Exception as e:
             total_players = len(players)
-            total_tournaments = len(tournaments)
-            active_tournaments = [t for t in tournaments if t['status'] == 'active']
             total_matches = 0
             average_rating = 300
             recent_matches = []
-        finally:
-            conn.close()
         
         # Create stats object
         stats = {
@@ -1874,13 +1720,18 @@ def public_home():
         return f"Error loading public homepage: {str(e)}", 500
 
 @app.route('/public/rankings')
-@no_cache
+@public_page()
 def public_rankings():
     """Public player rankings page"""
     try:
         search = request.args.get('search', '')
         award_filter = request.args.get('award')
         scope = request.args.get('scope', 'overall')  # overall, or tournament_id
+        # Tournament standings as they stood at the end of a past day (YYYY-MM-DD)
+        try:
+            as_of = datetime.strptime(request.args.get('as_of', ''), '%Y-%m-%d').date()
+        except ValueError:
+            as_of = None
         
         # Get tournaments for the filter tabs
         tournaments = TournamentDB.get_all_tournaments()
@@ -1892,7 +1743,12 @@ def public_rankings():
             # Try to get tournament-specific stats
             try:
                 tournament_id = int(scope)
-                players_stats = TournamentDB.get_player_tournament_stats(tournament_id)
+                if as_of:
+                    players_stats = TournamentDB.get_tournament_standings_as_of(
+                        tournament_id, datetime.combine(as_of, datetime.max.time())
+                    )
+                else:
+                    players_stats = TournamentDB.get_player_tournament_stats(tournament_id)
                 # Do NOT fall back to overall stats if tournament has no players
                 # Tournament-specific stats will be empty list if no data exists
                 # (no fallback needed, keep the empty list)
@@ -1939,17 +1795,19 @@ def public_rankings():
                              search=search,
                              award_filter=award_filter,
                              scope=scope,
+                             as_of=as_of if scope != 'overall' else None,
                              selected_tournament=selected_tournament)
     except Exception as e:
         return f"Error loading rankings: {str(e)}", 500
 
 @app.route('/public/matches')
-@no_cache
+@public_page()
 def public_matches():
     """Public match results page with pagination and search"""
     try:
         tournament_id = request.args.get('tournament_id')
-        page = int(request.args.get('page', 1))
+        search_query = request.args.get('search', '').strip()
+        page_token = request.args.get('cursor') or None
         per_page = 25  # Fixed at 25 matches per page for public view
         
         # Convert tournament_id to int if provided
@@ -1960,37 +1818,30 @@ def public_matches():
             except ValueError:
                 tournament_id = None
         
-        # For search functionality, we'll load more matches than displayed
-        # This allows client-side search to work across more data
-        search_limit = max(per_page, 1000)  # Load at least 1000 matches for search
-        
-        # Calculate offset for pagination
-        offset = (page - 1) * per_page
-        
-        # Get matches - load more for better search functionality
-        matches = TournamentDB.get_all_matches(
-            tournament_id=selected_tournament_id, 
-            limit=search_limit, 
-            offset=0,  # Start from beginning for search
-            search_query=None  # Don't filter server-side, we'll do client-side
-        )
+        # Keyset pagination: each page is fetched from its boundary match, so
+        # deep pages cost the same as the first one
+        try:
+            match_page = TournamentDB.get_matches_page(
+                tournament_id=selected_tournament_id,
+                search_query=search_query or None,
+                page_token=page_token,
+                per_page=per_page
+            )
+        except ValueError:
+            # Stale or tampered cursor - start again from the newest matches
+            return redirect(url_for('public_matches', tournament_id=selected_tournament_id,
+                                    search=search_query or None))
+        matches = match_page['matches']
         
         tournaments = TournamentDB.get_all_tournaments()
         
-        # Get total count for pagination (all matches, not just loaded)
+        # Total for display only; recounted at most once a minute per worker
         total_matches = TournamentDB.get_matches_count(
             tournament_id=selected_tournament_id,
-            search_query=None  # Total count without search filter
+            search_query=search_query or None,
+            max_age=MATCH_COUNT_CACHE_SECONDS
         )
         
-        # For client-side pagination, we work with loaded matches
-        loaded_matches_count = len(matches)
-        
-        # Calculate pagination info based on total matches
-        total_pages = (total_matches + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
-        
         # Find selected tournament
         selected_tournament = None
         if selected_tournament_id:
@@ -2019,12 +1870,10 @@ def public_matches():
                              tournaments=tournaments,
                              selected_tournament=selected_tournament,
                              selected_tournament_id=selected_tournament_id,
-                             current_page=page,
-                             total_pages=total_pages,
-                             has_prev=has_prev,
-                             has_next=has_next,
+                             search_query=search_query,
+                             next_token=match_page['next_token'],
+                             prev_token=match_page['prev_token'],
                              total_matches=total_matches,
-                             loaded_matches_count=loaded_matches_count,
                              per_page=per_page,
                              total_goals=total_goals,
                              avg_goals_per_match=avg_goals_per_match,
@@ -2038,111 +1887,42 @@ def public_matches():
         return f"Error loading matches: {str(e)}", 500
 
 @app.route('/public/player/<int:player_id>')
-@no_cache
+@public_page(lambda player_id: TournamentDB.get_player_page_version(player_id))
 def public_player_profile(player_id):
     """Public player profile page"""
     try:
-        player = TournamentDB.get_player_details(player_id)
-        if not player:
+        # Matches are fetched once; history, form and trends are derived from them
+        profile = TournamentDB.get_player_profile_bundle(player_id)
+        if not profile:
             return "Player not found", 404
         
-        # Get comprehensive player data
-        match_history = TournamentDB.get_player_match_history(player_id)
-        tournament_participation = TournamentDB.get_player_tournament_participation(player_id)
-        rating_history = TournamentDB.get_player_rating_history(player_id)
-        vs_opponents = TournamentDB.get_player_vs_opponents(player_id)
-        player_awards = TournamentDB.get_player_awards(player_id)
-        
-        # Calculate additional statistics
-        total_goals_for = sum([match['player_goals'] for match in match_history])
-        total_goals_against = sum([match['opponent_goals'] for match in match_history])
-        
-        # Calculate recent form (last 5 matches)
-        recent_matches = match_history[:5] if match_history else []
-        recent_form = [match['result'] for match in recent_matches]
-        
-        # Calculate rating trend (last 10 matches)
-        rating_trend = []
-        if len(rating_history) > 1:
-            recent_ratings = rating_history[-11:] if len(rating_history) >= 11 else rating_history
-            for i in range(1, len(recent_ratings)):
-                rating_change = recent_ratings[i]['rating'] - recent_ratings[i-1]['rating']
-                rating_trend.append({
-                    'match': recent_ratings[i]['event'],
-                    'change': rating_change,
-                    'rating': recent_ratings[i]['rating']
-                })
-        
-        # Get player's rank
-        all_players = TournamentDB.get_overall_player_stats()
-        player_rank = None
-        for idx, p in enumerate(all_players):
-            if p['id'] == player_id:
-                player_rank = idx + 1
-                break
-        
         return render_template('public_player_profile.html',
-                             player=player,
-                             match_history=match_history,
-                             tournament_participation=tournament_participation,
-                             rating_history=rating_history,
-                             vs_opponents=vs_opponents,
-                             total_goals_for=total_goals_for,
-                             total_goals_against=total_goals_against,
-                             recent_form=recent_form,
-                             rating_trend=rating_trend,
-                             player_awards=player_awards,
-                             player_rank=player_rank)
+                             player=profile['player'],
+                             match_history=profile['match_history'],
+                             rating_history=profile['rating_history'],
+                             vs_opponents=profile['vs_opponents'],
+                             total_goals_for=profile['total_goals_for'],
+                             total_goals_against=profile['total_goals_against'],
+                             recent_form=profile['recent_form'],
+                             rating_trend=profile['rating_trend'],
+                             player_awards=profile['awards'],
+                             player_rank=profile['rank'])
     except Exception as e:
         return f"Error loading player profile: {str(e)}", 500
 
 @app.route('/public/tournaments')
-@no_cache
+@public_page()
 def public_tournaments():
     """Public tournaments listing page"""
     try:
-        tournaments = TournamentDB.get_all_tournaments()
+        # Counts and top player for every tournament in one query
+        tournaments = TournamentDB.get_tournaments_overview()
         
         # Calculate tournament statistics
         active_tournaments = [t for t in tournaments if t['status'] == 'active']
         active_count = len(active_tournaments)
-        
-        # Get additional tournament data
-        conn = get_db_connection()
-        total_participants = 0
-        total_tournament_matches = 0
-        
-        try:
-            with conn.cursor() as cursor:
-                # Get participant and match counts for each tournament
-                for tournament in tournaments:
-                    # Get player count
-                    cursor.execute("SELECT COUNT(*) as count FROM tournament_players WHERE tournament_id = %s", (tournament['id'],))
-                    tournament['player_count'] = cursor.fetchone()['count']
-                    total_participants += tournament['player_count']
-                    
-                    # Get match count
-                    cursor.execute("SELECT COUNT(*) as count FROM player_matches WHERE tournament_id = %s", (tournament['id'],))
-                    tournament['match_count'] = cursor.fetchone()['count']
-                    total_tournament_matches += tournament['match_count']
-                    
-                    # Get top player in tournament
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.rating, p.photo_url
-                        FROM players p
-                        JOIN tournament_players tp ON p.id = tp.player_id
-                        WHERE tp.tournament_id = %s
-                        ORDER BY p.rating DESC
-                        LIMIT 1
-                    """, (tournament['id'],))
-                    top_player = cursor.fetchone()
-                    if top_player:
-                        tournament['top_player_id'] = top_player['id']
-                        tournament['top_player_name'] = top_player['name']
-                        tournament['top_player_rating'] = top_player['rating']
-                        tournament['top_player_photo_url'] = top_player['photo_url']
-        finally:
-            conn.close()
+        total_participants = sum(t['player_count'] for t in tournaments)
+        total_tournament_matches = sum(t['match_count'] for t in tournaments)
         
         return render_template('public_tournaments.html',
                              tournaments=tournaments,
@@ -2154,7 +1934,7 @@ def public_tournaments():
         return f"Error loading tournaments: {str(e)}", 500
 
 @app.route('/public/tournament/<int:tournament_id>')
-@no_cache
+@public_page(lambda tournament_id: TournamentDB.get_data_version('tournament', tournament_id))
 def public_tournament_detail(tournament_id):
     """Public tournament detail page"""
     try:
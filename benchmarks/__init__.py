@@ -0,0 +1,14 @@
+"""
+Benchmark suite for the TournamentDB hot paths.
+
+  generator     - seeded synthetic league data (players, tournaments, divisions,
+                  guest matches, walkovers, null matches) at any scale
+  run           - times the hot paths against a scratch Postgres database and
+                  writes/compares a JSON baseline
+  overall_stats - per-player vs set-based overall stats aggregation
+
+SAFETY: benchmarks.run wipes the database named by BENCHMARK_DATABASE_URL.
+Never point it at the production DATABASE_URL.
+
+Usage: python -m benchmarks.run --matches 10000 --output benchmarks/baseline.json
+"""
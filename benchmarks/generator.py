@@ -0,0 +1,152 @@
+"""
+Synthetic Tournament Data
+
+Fills a freshly migrated database with a seeded, reproducible league shaped
+like production: a pool of players, many overlapping tournaments (some of
+them division tournaments), guest matches, walkovers and null matches, all
+played in chronological order. Ratings are left NULL, the way a restore
+leaves them; TournamentDB.recalculate_all_ratings() fills them in.
+
+Rows are streamed with COPY so a million matches load in seconds.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from database import TournamentDB
+
+DEFAULT_SEED = 42
+MATCHES_PER_PLAYER = 50
+MATCHES_PER_TOURNAMENT = 500
+ROSTER_SIZES = (8, 64)
+DIVISION_TOURNAMENT_SHARE = 0.3
+DIVISION_STARTING_RATINGS = (('Division A', 400), ('Division B', 300), ('Division C', 200))
+GUEST_MATCH_SHARE = 0.10
+WALKOVER_SHARE = 0.05
+NULL_MATCH_SHARE = 0.03
+INITIAL_RATING_SHARE = 0.10
+FIRST_MATCH_AT = datetime(2023, 1, 1, 18, 0)
+
+PLAYER_MATCH_COLUMNS = ('match_id', 'tournament_id', 'player1_id', 'player2_id',
+                        'player1_goals', 'player2_goals', 'winner_id', 'is_draw',
+                        'is_walkover', 'is_null_match', 'player1_absent', 'player2_absent',
+                        'played_at')
+GUEST_MATCH_COLUMNS = ('match_id', 'tournament_id', 'clan_player_id', 'guest_name',
+                       'clan_goals', 'guest_goals', 'clan_absent', 'guest_absent',
+                       'is_null_match', 'is_walkover', 'played_at')
+
+
+def league_shape(match_count):
+    """(players, tournaments) generated for a given number of matches"""
+    return max(20, match_count // MATCHES_PER_PLAYER), max(1, match_count // MATCHES_PER_TOURNAMENT)
+
+
+def _goals(rng):
+    return min(int(rng.expovariate(0.6)), 9)
+
+
+def _outcome(player1_id, player2_id, goals1, goals2):
+    """(winner_id, is_draw) for a played match"""
+    if goals1 == goals2:
+        return None, True
+    return (player1_id if goals1 > goals2 else player2_id), False
+
+
+def generate(cursor, match_count, seed=DEFAULT_SEED):
+    """Insert the synthetic league into an empty schema.
+
+    The same (match_count, seed) always produces the same rows. Returns a
+    dict of row counts per table.
+    """
+    rng = random.Random(seed)
+    player_count, tournament_count = league_shape(match_count)
+    copy = TournamentDB._copy_rows
+
+    copy(cursor, 'players', ('id', 'name', 'initial_rating'), (
+        (player_id, f"Bench Player {player_id:07d}",
+         rng.randrange(200, 450, 10) if rng.random() < INITIAL_RATING_SHARE else None)
+        for player_id in range(1, player_count + 1)
+    ))
+
+    tournaments = []
+    divisions = []
+    rosters = {}
+    roster_rows = []
+    for tournament_id in range(1, tournament_count + 1):
+        is_division = rng.random() < DIVISION_TOURNAMENT_SHARE
+        tournaments.append((tournament_id, f"Bench Tournament {tournament_id:05d}",
+                            'division' if is_division else 'normal',
+                            'active' if tournament_id > tournament_count * 0.8 else 'completed'))
+        roster = rng.sample(range(1, player_count + 1),
+                            min(player_count, rng.randint(*ROSTER_SIZES)))
+        rosters[tournament_id] = roster
+        division_ids = [None]
+        if is_division:
+            division_ids = []
+            for name, starting_rating in DIVISION_STARTING_RATINGS:
+                divisions.append((len(divisions) + 1, tournament_id, name, starting_rating))
+                division_ids.append(len(divisions))
+        roster_rows.extend((tournament_id, player_id, division_ids[index % len(division_ids)])
+                           for index, player_id in enumerate(roster))
+
+    copy(cursor, 'tournaments', ('id', 'name', 'tournament_type', 'status'), tournaments)
+    copy(cursor, 'divisions', ('id', 'tournament_id', 'name', 'starting_rating'), divisions)
+    copy(cursor, 'tournament_players', ('tournament_id', 'player_id', 'division_id'), roster_rows)
+
+    player_matches = []
+    guest_matches = []
+    played_at = FIRST_MATCH_AT
+    for match_id in range(1, match_count + 1):
+        # Tournaments overlap: any of them may host the next match
+        tournament_id = rng.randint(1, tournament_count)
+        roster = rosters[tournament_id]
+        played_at += timedelta(minutes=rng.randint(1, 30))
+        kind = rng.random()
+
+        if kind < GUEST_MATCH_SHARE:
+            clan_player_id = rng.choice(roster)
+            guest_absent = rng.random() < WALKOVER_SHARE
+            clan_goals, guest_goals = (0, 0) if guest_absent else (_goals(rng), _goals(rng))
+            winner_id, is_draw = ((clan_player_id, False) if guest_absent
+                                  else _outcome(clan_player_id, None, clan_goals, guest_goals))
+            guest_matches.append((match_id, tournament_id, clan_player_id,
+                                  f"Guest {rng.randint(1, 500)}", clan_goals, guest_goals,
+                                  False, guest_absent, False, guest_absent, played_at))
+            player_matches.append((match_id, tournament_id, clan_player_id, None,
+                                   clan_goals, guest_goals, winner_id, is_draw,
+                                   guest_absent, False, False, guest_absent, played_at))
+            continue
+
+        player1_id, player2_id = rng.sample(roster, 2)
+        if kind < GUEST_MATCH_SHARE + NULL_MATCH_SHARE:
+            player_matches.append((match_id, tournament_id, player1_id, player2_id, 0, 0,
+                                   None, False, False, True, True, True, played_at))
+        elif kind < GUEST_MATCH_SHARE + NULL_MATCH_SHARE + WALKOVER_SHARE:
+            player1_absent = rng.random() < 0.5
+            player_matches.append((match_id, tournament_id, player1_id, player2_id, 0, 0,
+                                   player2_id if player1_absent else player1_id, False,
+                                   True, False, player1_absent, not player1_absent, played_at))
+        else:
+            goals1, goals2 = _goals(rng), _goals(rng)
+            winner_id, is_draw = _outcome(player1_id, player2_id, goals1, goals2)
+            player_matches.append((match_id, tournament_id, player1_id, player2_id,
+                                   goals1, goals2, winner_id, is_draw,
+                                   False, False, False, False, played_at))
+
+    copy(cursor, 'player_matches', PLAYER_MATCH_COLUMNS, player_matches)
+    copy(cursor, 'guest_matches', GUEST_MATCH_COLUMNS, guest_matches)
+
+    # Explicit ids were copied in, so move the sequences past them
+    for table in ('players', 'tournaments', 'divisions'):
+        cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                       f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)")
+    cursor.execute("SELECT setval('match_id_seq', %s, false)", (match_count + 1,))
+
+    return {
+        'players': player_count,
+        'tournaments': tournament_count,
+        'divisions': len(divisions),
+        'tournament_players': len(roster_rows),
+        'player_matches': len(player_matches),
+        'guest_matches': len(guest_matches),
+    }
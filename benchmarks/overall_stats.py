@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Overall Stats Benchmark
+
+Compares the old per-player overall aggregation (one SELECT and one UPDATE
+per player, aggregated in Python) with the set-based statement used by
+TournamentDB._refresh_overall_stats.
+
+SAFETY: Everything runs against TEMP copies of players and player_matches
+filled with generated data, inside a transaction that is rolled back.
+No real data is read or changed.
+
+Usage: python -m benchmarks.overall_stats [match_count ...]   (default: 10000 100000)
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rating_engine
+from database import TournamentDB, get_db_connection
+
+MATCHES_PER_PLAYER = 50
+
+STAT_COLUMNS = ('rating', 'matches_played', 'matches_won', 'matches_drawn', 'matches_lost',
+                'goals_scored', 'goals_conceded', 'clean_sheets', 'golden_glove_points')
+
+
+def create_scratch_tables(cursor, match_count):
+    """Temp tables shadow the real ones for the rest of the transaction"""
+    cursor.execute("""
+        CREATE TEMP TABLE players (
+            id SERIAL PRIMARY KEY,
+            name TEXT,
+            rating INTEGER,
+            matches_played INTEGER DEFAULT 0,
+            matches_won INTEGER DEFAULT 0,
+            matches_drawn INTEGER DEFAULT 0,
+            matches_lost INTEGER DEFAULT 0,
+            goals_scored INTEGER DEFAULT 0,
+            goals_conceded INTEGER DEFAULT 0,
+            clean_sheets INTEGER DEFAULT 0,
+            golden_glove_points INTEGER DEFAULT 0
+        ) ON COMMIT DROP
+    """)
+    cursor.execute("""
+        CREATE TEMP TABLE player_matches (
+            id SERIAL PRIMARY KEY,
+            match_id INTEGER,
+            tournament_id INTEGER,
+            player1_id INTEGER,
+            player2_id INTEGER,
+            player1_goals INTEGER,
+            player2_goals INTEGER,
+            winner_id INTEGER,
+            is_draw BOOLEAN DEFAULT FALSE,
+            is_walkover BOOLEAN DEFAULT FALSE,
+            is_null_match BOOLEAN DEFAULT FALSE,
+            player1_rating_before INTEGER,
+            player2_rating_before INTEGER,
+            player1_rating_after INTEGER,
+            player2_rating_after INTEGER,
+            played_at TIMESTAMP
+        ) ON COMMIT DROP
+    """)
+    cursor.execute("CREATE INDEX ON player_matches (player1_id)")
+    cursor.execute("CREATE INDEX ON player_matches (player2_id)")
+
+    player_count = max(2, match_count // MATCHES_PER_PLAYER)
+    cursor.execute("SELECT setseed(0.42)")
+    cursor.execute("""
+        INSERT INTO players (name)
+        SELECT 'Player ' || n FROM generate_series(1, %s) AS n
+    """, (player_count,))
+    # Roughly 10% guest matches, 5% walkovers and 3% null matches
+    cursor.execute("""
+        WITH raw AS (
+            SELECT n,
+                   1 + floor(random() * %(players)s)::int AS p1,
+                   CASE WHEN random() < 0.1 THEN NULL ELSE 1 + floor(random() * %(players)s)::int END AS p2,
+                   floor(random() * 6)::int AS g1,
+                   floor(random() * 6)::int AS g2,
+                   random() AS kind,
+                   200 + floor(random() * 600)::int AS r1,
+                   200 + floor(random() * 600)::int AS r2
+            FROM generate_series(1, %(matches)s) AS n
+        ),
+        shaped AS (
+            SELECT n, p1, CASE WHEN p2 = p1 THEN NULL ELSE p2 END AS p2,
+                   CASE WHEN kind < 0.08 THEN 0 ELSE g1 END AS g1,
+                   CASE WHEN kind < 0.08 THEN 0 ELSE g2 END AS g2,
+                   kind < 0.03 AS is_null_match,
+                   kind >= 0.03 AND kind < 0.08 AS is_walkover,
+                   r1, r2
+            FROM raw
+        )
+        INSERT INTO player_matches
+            (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals, winner_id,
+             is_draw, is_walkover, is_null_match, player1_rating_before, player2_rating_before,
+             player1_rating_after, player2_rating_after, played_at)
+        SELECT n, 1 + n %% 20, p1, p2, g1, g2,
+               CASE WHEN is_null_match THEN NULL
+                    WHEN is_walkover THEN p1
+                    WHEN g1 > g2 THEN p1
+                    WHEN g2 > g1 THEN p2 END,
+               NOT is_null_match AND NOT is_walkover AND g1 = g2,
+               is_walkover, is_null_match,
+               r1, r2, r1 + (g1 - g2) * 4, r2 + (g2 - g1) * 4,
+               TIMESTAMP '2024-01-01' + n * INTERVAL '1 minute'
+        FROM shaped
+    """, {'players': player_count, 'matches': match_count})
+    cursor.execute("ANALYZE players")
+    cursor.execute("ANALYZE player_matches")
+    return player_count
+
+
+def reset_player_stats(cursor):
+    cursor.execute(f"UPDATE players SET {', '.join(f'{column} = NULL' for column in STAT_COLUMNS)}")
+
+
+def snapshot(cursor):
+    cursor.execute(f"SELECT id, {', '.join(STAT_COLUMNS)} FROM players ORDER BY id")
+    return [tuple(row.values()) for row in cursor.fetchall()]
+
+
+def refresh_per_player(cursor):
+    """The old approach: one SELECT and one UPDATE per player"""
+    cursor.execute("SELECT id FROM players")
+    for player in cursor.fetchall():
+        cursor.execute("""
+            SELECT * FROM player_matches
+            WHERE player1_id = %s OR player2_id = %s
+            ORDER BY played_at ASC NULLS LAST, match_id ASC
+        """, (player['id'], player['id']))
+        totals = rating_engine.overall_totals(player['id'], cursor.fetchall())
+        cursor.execute("""
+            UPDATE players SET rating = %s, matches_played = %s, matches_won = %s, matches_drawn = %s,
+                matches_lost = %s, goals_scored = %s, goals_conceded = %s, clean_sheets = %s,
+                golden_glove_points = %s
+            WHERE id = %s
+        """, (totals['rating'],) + tuple(totals[field] for field in rating_engine.STAT_FIELDS) + (player['id'],))
+
+
+def run(match_count):
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            player_count = create_scratch_tables(cursor, match_count)
+            print(f"\n{match_count} matches, {player_count} players")
+
+            reset_player_stats(cursor)
+            start = time.perf_counter()
+            refresh_per_player(cursor)
+            per_player_seconds = time.perf_counter() - start
+            expected = snapshot(cursor)
+
+            reset_player_stats(cursor)
+            start = time.perf_counter()
+            TournamentDB._refresh_overall_stats(cursor)
+            set_based_seconds = time.perf_counter() - start
+            actual = snapshot(cursor)
+
+            mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+            print(f"  Per-player loop : {per_player_seconds:8.3f}s ({2 * player_count + 1} queries)")
+            print(f"  Set-based SQL   : {set_based_seconds:8.3f}s (1 query)")
+            print(f"  Speedup         : {per_player_seconds / set_based_seconds:8.1f}x")
+            print(f"  Mismatched rows : {mismatches}")
+            return mismatches
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    print("=" * 60)
+    print("OVERALL STATS BENCHMARK")
+    print("=" * 60)
+    mismatches = sum(run(size) for size in sizes)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmarks
+
+Builds a synthetic league (benchmarks.generator) in a scratch Postgres
+database and times the TournamentDB hot paths and the public routes:
+
+  recalculate_all_ratings, recalculate_tournament_ratings,
+  record_match, record_bulk_matches, get_all_matches,
+  get_player_tournament_breakdown, /public/* via the Flask test client
+
+Results (median/min/p95 in ms) are written to a JSON baseline; --compare
+checks a run against an earlier baseline and exits 1 on regressions.
+
+SAFETY: The database named by BENCHMARK_DATABASE_URL is WIPED (schema
+public is dropped and recreated). The run refuses to start if it equals
+DATABASE_URL, and refuses non-local hosts unless --allow-remote is given.
+
+Usage: BENCHMARK_DATABASE_URL=postgresql://localhost/eskplayer_bench \\
+       python -m benchmarks.run [--matches 10000] [--seed 42] [--repeat 5]
+                                [--output FILE] [--compare FILE] [--tolerance 0.25]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from dotenv import dotenv_values
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1', '')
+BULK_BATCH_SIZE = 50
+PUBLIC_ROUTES = (
+    ('public_home', '/public'),
+    ('public_rankings', '/public/rankings'),
+    ('public_matches', '/public/matches'),
+    ('public_tournaments', '/public/tournaments'),
+    ('public_tournament', '/public/tournament/{tournament_id}'),
+    ('public_player', '/public/player/{player_id}'),
+)
+
+
+def benchmark_database_url(allow_remote):
+    """The scratch database URL, or SystemExit if it looks like a real database"""
+    url = os.getenv('BENCHMARK_DATABASE_URL')
+    if not url:
+        raise SystemExit("Set BENCHMARK_DATABASE_URL to a scratch database (it is wiped on every run)")
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    live_urls = {os.getenv('DATABASE_URL'), dotenv_values(os.path.join(root, '.env')).get('DATABASE_URL')}
+    if url in live_urls:
+        raise SystemExit("BENCHMARK_DATABASE_URL must not be the application's DATABASE_URL")
+
+    host = psycopg2.extensions.parse_dsn(url).get('host', '')
+    if not allow_remote and host not in LOCAL_HOSTS and not host.startswith('/'):
+        raise SystemExit(f"Refusing to wipe non-local database host '{host}' (pass --allow-remote)")
+    return url
+
+
+def timed(fn, repeat):
+    """Run fn() repeat times with its output silenced; returns a result dict"""
+    samples = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'runs': len(samples),
+        'median_ms': round(statistics.median(samples), 2),
+        'min_ms': round(samples[0], 2),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+    }
+
+
+def reset_schema():
+    from database import get_db_connection, init_db
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DROP SCHEMA public CASCADE")
+            cursor.execute("CREATE SCHEMA public")
+        conn.commit()
+    finally:
+        conn.close()
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+
+
+def load_league(match_count, seed):
+    from database import get_db_connection
+    from benchmarks.generator import generate
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            counts = generate(cursor, match_count, seed)
+        conn.commit()
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        conn.autocommit = False
+    finally:
+        conn.close()
+    return counts
+
+
+def sample_ids():
+    """The busiest tournament, its busiest player and two of its roster"""
+    from database import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT tournament_id, player1_id AS player_id
+                FROM player_matches
+                GROUP BY tournament_id, player1_id
+                ORDER BY COUNT(*) DESC, tournament_id, player1_id
+                LIMIT 1
+            """)
+            ids = dict(cursor.fetchone())
+            cursor.execute("""
+                SELECT player_id FROM tournament_players
+                WHERE tournament_id = %s ORDER BY player_id
+            """, (ids['tournament_id'],))
+            ids['roster'] = [row['player_id'] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+    return ids
+
+
+def run_benchmarks(ids, repeat, seed):
+    from app import app
+    from database import TournamentDB
+
+    rng = random.Random(seed)
+    tournament_id = ids['tournament_id']
+    roster = ids['roster']
+
+    def record_one():
+        player1_id, player2_id = rng.sample(roster, 2)
+        TournamentDB.record_match(tournament_id, player1_id, player2_id,
+                                  rng.randint(0, 5), rng.randint(0, 5))
+
+    def record_bulk():
+        rows = []
+        for _ in range(BULK_BATCH_SIZE):
+            player1_id, player2_id = rng.sample(roster, 2)
+            rows.append({'tournament_id': tournament_id, 'player1_id': player1_id,
+                         'player2_id': player2_id, 'player1_goals': rng.randint(0, 5),
+                         'player2_goals': rng.randint(0, 5)})
+        TournamentDB.record_bulk_matches(rows)
+
+    cases = [
+        ('recalculate_all_ratings', TournamentDB.recalculate_all_ratings, max(1, repeat // 2)),
+        ('recalculate_tournament_ratings',
+         lambda: TournamentDB.recalculate_tournament_ratings(tournament_id), repeat),
+        ('record_match', record_one, repeat),
+        (f'record_bulk_matches_{BULK_BATCH_SIZE}', record_bulk, repeat),
+        ('get_all_matches_first_page', lambda: TournamentDB.get_all_matches(limit=25), repeat),
+        ('get_all_matches_deep_page', lambda: TournamentDB.get_all_matches(limit=25, offset=2000), repeat),
+        ('get_all_matches_tournament', lambda: TournamentDB.get_all_matches(tournament_id=tournament_id), repeat),
+        ('get_player_tournament_breakdown',
+         lambda: TournamentDB.get_player_tournament_breakdown(ids['player_id']), repeat),
+    ]
+
+    client = app.test_client()
+    for name, path in PUBLIC_ROUTES:
+        url = path.format(**ids)
+
+        def fetch(url=url):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} returned {response.status_code}")
+        cases.append((name, fetch, repeat))
+
+    results = {}
+    for name, fn, runs in cases:
+        try:
+            results[name] = timed(fn, runs)
+            print(f"  {name:<36} {results[name]['median_ms']:>10.2f} ms median")
+        except Exception as e:
+            results[name] = {'error': str(e)}
+            print(f"  {name:<36} FAILED: {e}")
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Print median deltas against a baseline; returns the names that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        before = baseline.get(name, {}).get('median_ms')
+        after = result.get('median_ms')
+        if before is None or after is None:
+            print(f"  {name:<36} {'(no baseline)' if after is not None else '(failed)'}")
+            if after is None:
+                regressions.append(name)
+            continue
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"  {name:<36} {before:>10.2f} -> {after:>10.2f} ms ({change:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the TournamentDB hot paths on synthetic data")
+    parser.add_argument('--matches', type=int, default=10000, help="matches to generate (1k to 1M)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument('--output', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', help="baseline JSON to check this run against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed median slowdown before a regression is reported")
+    parser.add_argument('--allow-remote', action='store_true')
+    args = parser.parse_args()
+
+    # database reads DATABASE_URL at connect time; the read cache would hide query cost
+    os.environ['DATABASE_URL'] = benchmark_database_url(args.allow_remote)
+    os.environ['READ_CACHE_SECONDS'] = '0'
+
+    print("=" * 80)
+    print(f"BENCHMARK  ({args.matches} matches, seed {args.seed}, {args.repeat} runs)")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    reset_schema()
+    counts = load_league(args.matches, args.seed)
+    print(f"Generated {counts} in {time.perf_counter() - started:.1f}s")
+
+    ids = sample_ids()
+    results = run_benchmarks(ids, args.repeat, args.seed)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'matches': args.matches,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'rows': counts,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.output}")
+
+    failed = [name for name, result in results.items() if 'error' in result]
+    if args.compare:
+        failed = sorted(set(failed) | set(compare(results, args.compare, args.tolerance)))
+    if failed:
+        print(f"\n{len(failed)} problem(s): {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
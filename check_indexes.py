@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Index Check
+
+EXPLAINs the hot statements TournamentDB runs (the shared SQL constants and
+query builders in database.py) and reports which of the managed indexes
+(database.MANAGED_INDEXES) each plan uses.
+
+Every query is planned twice:
+  chosen - with the normal planner settings, i.e. what production runs now
+  usable - with sequential scans disabled, i.e. whether the index *can* serve
+           the query. On small tables the planner rightly prefers a seq scan,
+           so only this column decides the exit status.
+
+Nothing is executed or changed (EXPLAIN without ANALYZE, rolled back).
+
+Usage: python check_indexes.py
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import (TournamentDB, get_db_connection, MANAGED_INDEXES, PLAYER_LEDGER_SQL,
+                      DELETE_PLAYER_MATCHES_SQL, REPLAY_MATCHES_SQL, TOURNAMENT_STANDINGS_SQL,
+                      OVERALL_RANKINGS_SQL, PLAYER_PROFILE_SQL)
+
+# (description, statement(ids) -> (SQL, params), expected indexes). Every
+# statement is the one TournamentDB executes, so a query change that loses its
+# index shows up here.
+HOT_QUERIES = (
+    ("Player match ledger (overall rating replay)",
+     lambda ids: (PLAYER_LEDGER_SQL, ids),
+     ('idx_player_match_ledger_player',)),
+    ("Delete a player's matches (delete_player)",
+     lambda ids: (DELETE_PLAYER_MATCHES_SQL, ids),
+     ('idx_player_matches_player1_played', 'idx_player_matches_player2_played')),
+    ("Tournament replay (_fetch_replay_matches)",
+     lambda ids: (REPLAY_MATCHES_SQL, ids),
+     ('idx_player_matches_tournament_played',)),
+    ("Match list first page (get_all_matches)",
+     lambda ids: TournamentDB._match_list_query(limit=25),
+     ('idx_player_matches_played_at_match', 'idx_guest_matches_played_at_match')),
+    ("Tournament match list first page (get_all_matches)",
+     lambda ids: TournamentDB._match_list_query(tournament_id=ids['tournament_id'], limit=25),
+     ('idx_player_matches_tournament_played', 'idx_guest_matches_tournament_played')),
+    ("Tournament standings (get_player_tournament_stats)",
+     lambda ids: (TOURNAMENT_STANDINGS_SQL, ids),
+     ('idx_player_stats_tournament_rating',)),
+    ("Overall rankings (get_overall_player_stats)",
+     lambda ids: (OVERALL_RANKINGS_SQL, ids),
+     ('idx_players_ranked',)),
+    ("Profile rank count (get_player_profile_bundle)",
+     lambda ids: (PLAYER_PROFILE_SQL, ids),
+     ('idx_players_ranked',)),
+    ("Top players (get_all_players limit)",
+     lambda ids: TournamentDB._players_query(limit=5),
+     ('idx_players_rating_name',)),
+)
+
+
+def plan_indexes(node):
+    """Every index name referenced anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    found = set()
+    if 'Index Name' in node:
+        found.add(node['Index Name'])
+    for child in node.get('Plans', []):
+        found |= plan_indexes(child)
+    return found
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = list(cursor.fetchone().values())[0]
+    return plan_indexes(plan[0]['Plan'])
+
+
+def sample_ids(cursor):
+    """The busiest player and tournament, so the plans reflect realistic selectivity"""
+    cursor.execute("""
+        SELECT player1_id AS player_id, tournament_id
+        FROM player_matches
+        GROUP BY player1_id, tournament_id
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+    """)
+    row = cursor.fetchone()
+    return {'player_id': row['player_id'], 'tournament_id': row['tournament_id']} if row else {'player_id': 1, 'tournament_id': 1}
+
+
+def main():
+    conn = get_db_connection()
+    failures = 0
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+            existing = {row['indexname'] for row in cursor.fetchall()}
+            missing = [name for name, _ in MANAGED_INDEXES if name not in existing]
+            if missing:
+                print(f"Missing managed indexes (run the app once to migrate): {', '.join(missing)}")
+                failures += len(missing)
+
+            params = sample_ids(cursor)
+            print("=" * 80)
+            print(f"INDEX CHECK  (player {params['player_id']}, tournament {params['tournament_id']})")
+            print("=" * 80)
+            for description, statement, expected in HOT_QUERIES:
+                sql, sql_params = statement(params)
+                chosen = explain(cursor, sql, sql_params)
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                usable = explain(cursor, sql, sql_params)
+                cursor.execute("SET LOCAL enable_seqscan = on")
+
+                ok = set(expected) <= usable
+                failures += 0 if ok else 1
+                print(f"{'✓' if ok else '✗'} {description}")
+                print(f"    expected : {', '.join(expected)}")
+                print(f"    chosen   : {', '.join(sorted(chosen)) or 'seq scan'}")
+                if not ok:
+                    print(f"    usable   : {', '.join(sorted(usable)) or 'seq scan'}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print("\n" + ("All hot queries can use their index" if not failures else f"{failures} problem(s) found"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,367 @@
+import base64
+import io
+import json
 import os
+import sys
+import threading
+import time
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2 import extensions as pg_extensions
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
+from collections import OrderedDict, deque
 from datetime import datetime
+from functools import wraps
+from flask import g, has_request_context, request
+import rating_engine
 # Load environment variables
 load_dotenv()
 
-def get_db_connection():
-    """Get database connection"""
+# Connection pool settings (per worker process)
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+# Idle seconds after which a pooled connection is pinged before reuse
+DB_POOL_CHECK_AFTER = float(os.getenv('DB_POOL_CHECK_AFTER', '30'))
+
+# Seconds a match count is reused before it is recounted (per worker process)
+MATCH_COUNT_CACHE_SECONDS = float(os.getenv('MATCH_COUNT_CACHE_SECONDS', '60'))
+
+# Read-through cache for public pages (per worker process). Writes in this
+# worker invalidate it immediately and other workers on their next public
+# request (via data_versions); READ_CACHE_SECONDS bounds staleness if the
+# version lookup fails. 0 disables the cache.
+READ_CACHE_SECONDS = float(os.getenv('READ_CACHE_SECONDS', '30'))
+READ_CACHE_MAX_ENTRIES = int(os.getenv('READ_CACHE_MAX_ENTRIES', '512'))
+
+# Background recalculation jobs (worker.py). A running job whose heartbeat is
+# older than RECALC_JOB_STALE_SECONDS is assumed lost with its worker and is
+# picked up again, up to RECALC_JOB_MAX_ATTEMPTS times.
+RECALC_JOB_STALE_SECONDS = int(os.getenv('RECALC_JOB_STALE_SECONDS', '300'))
+RECALC_JOB_MAX_ATTEMPTS = int(os.getenv('RECALC_JOB_MAX_ATTEMPTS', '3'))
+
+# Per-request query profiling (per worker process). With QUERY_PROFILING=1 each
+# request's statements are timed at the cursor, summed into a Server-Timing
+# header and kept in a ring buffer of the last QUERY_PROFILE_HISTORY requests
+# (shown on /admin/perf). Statements slower than QUERY_SLOW_MS are logged.
+QUERY_PROFILING = os.getenv('QUERY_PROFILING', '0') == '1'
+QUERY_PROFILE_HISTORY = int(os.getenv('QUERY_PROFILE_HISTORY', '200'))
+QUERY_SLOW_MS = float(os.getenv('QUERY_SLOW_MS', '200'))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_pool_last_used = {}
+# Pools inherited from a parent process (gunicorn preload_app). They are kept
+# referenced so their sockets are never finalized in the child, which would
+# terminate the parent's server sessions.
+_orphaned_pools = []
+
+
+class PooledConnection:
+    """Connection checked out of the pool; close() hands it back"""
+
+    def __init__(self, conn, pool=None):
+        self._conn = conn
+        self._pool = pool
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def closed(self):
+        return 1 if self._released else self._conn.closed
+
+    def discard(self):
+        """Close the real connection so the pool drops it on release"""
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+    def reset_isolation(self):
+        """Put the real connection back to the server's default isolation level"""
+        # Assigning through __getattr__ would only set it on this wrapper
+        self._conn.isolation_level = pg_extensions.ISOLATION_LEVEL_DEFAULT
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        _release_connection(self._conn, self._pool)
+
+
+class RequestConnection:
+    """Handle on the request-scoped connection; close() leaves it open"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        # Released by close_request_connection() when the request ends
+        pass
+
+
+class QueryProfile:
+    """Statements run during one request: count, DB time, slowest and call sites"""
+
+    KEEP_SLOWEST = 5
+
+    def __init__(self, method, path, endpoint):
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.total_ms = None
+        self.status = None
+        self.count = 0
+        self.db_ms = 0.0
+        self.slowest = []
+        self.call_sites = {}
+
+    def record(self, query, elapsed_ms, call_site):
+        self.count += 1
+        self.db_ms += elapsed_ms
+        site = self.call_sites.setdefault(call_site, [0, 0.0])
+        site[0] += 1
+        site[1] += elapsed_ms
+        if len(self.slowest) < self.KEEP_SLOWEST or elapsed_ms > self.slowest[-1]['ms']:
+            self.slowest.append({'ms': elapsed_ms, 'sql': _statement_text(query), 'call_site': call_site})
+            self.slowest.sort(key=lambda statement: statement['ms'], reverse=True)
+            del self.slowest[self.KEEP_SLOWEST:]
+        if elapsed_ms >= QUERY_SLOW_MS:
+            print(f"Slow query ({elapsed_ms:.0f} ms) at {call_site} during {self.method} {self.path}: "
+                  f"{_statement_text(query)}")
+
+    def finish(self, status):
+        self.total_ms = (time.perf_counter() - self._started) * 1000
+        self.status = status
+
+    def top_call_sites(self, limit=5):
+        """[(call_site, statements, ms)] with the most statements first; N+1 loops stand out here"""
+        sites = sorted(self.call_sites.items(), key=lambda item: (-item[1][0], -item[1][1]))
+        return [(site, count, ms) for site, (count, ms) in sites[:limit]]
+
+    def server_timing(self):
+        """Value for the Server-Timing response header"""
+        return f'db;dur={self.db_ms:.1f};desc="{self.count} queries", total;dur={self.total_ms:.1f}'
+
+
+# Finished profiles, oldest first (deque appends are thread-safe)
+query_profiles = deque(maxlen=QUERY_PROFILE_HISTORY)
+
+
+def _statement_text(query, limit=300):
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    text = ' '.join(str(query).split())
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+def _query_call_site():
+    """The innermost caller outside the cursor layer and psycopg2, e.g. 'get_player_awards (database.py:812)'"""
+    frame = sys._getframe(3)
+    while frame.f_back is not None and 'psycopg2' in frame.f_code.co_filename:
+        frame = frame.f_back
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+
+class ProfilingCursor(RealDictCursor):
+    """RealDictCursor that times its statements into the request's QueryProfile"""
+
+    def _profiled(self, run, query, *args):
+        profile = g.get('_query_profile') if has_request_context() else None
+        if profile is None:
+            return run(query, *args)
+        started = time.perf_counter()
+        try:
+            return run(query, *args)
+        finally:
+            profile.record(query, (time.perf_counter() - started) * 1000, _query_call_site())
+
+    def execute(self, query, vars=None):
+        return self._profiled(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._profiled(super().executemany, query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._profiled(super().copy_expert, sql, file, size)
+
+
+def summarize_query_profiles():
+    """Per-endpoint totals over the ring buffer, the most DB time first"""
+    endpoints = {}
+    for profile in list(query_profiles):
+        summary = endpoints.setdefault(profile.endpoint, {
+            'endpoint': profile.endpoint, 'requests': 0, 'queries': 0,
+            'max_queries': 0, 'db_ms': 0.0, 'total_ms': 0.0,
+        })
+        summary['requests'] += 1
+        summary['queries'] += profile.count
+        summary['max_queries'] = max(summary['max_queries'], profile.count)
+        summary['db_ms'] += profile.db_ms
+        summary['total_ms'] += profile.total_ms
+    for summary in endpoints.values():
+        summary['avg_queries'] = summary['queries'] / summary['requests']
+        summary['avg_db_ms'] = summary['db_ms'] / summary['requests']
+        summary['avg_total_ms'] = summary['total_ms'] / summary['requests']
+    return sorted(endpoints.values(), key=lambda summary: summary['db_ms'], reverse=True)
+
+
+def start_query_profile():
+    """Begin profiling the current request (Flask before_request hook)"""
+    if request.endpoint != 'static':
+        g._query_profile = QueryProfile(request.method, request.full_path.rstrip('?'), request.endpoint)
+
+
+def finish_query_profile(response):
+    """Store the request's profile and add its Server-Timing header (after_request hook)"""
+    profile = g.pop('_query_profile', None)
+    if profile is not None:
+        profile.finish(response.status_code)
+        query_profiles.append(profile)
+        response.headers['Server-Timing'] = profile.server_timing()
+    return response
+
+
+def _get_pool():
+    """Return the pool for this process, creating it after a fork"""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                if _pool is not None:
+                    _orphaned_pools.append(_pool)
+                    _pool_last_used.clear()
+                _pool = pg_pool.ThreadedConnectionPool(
+                    DB_POOL_MIN,
+                    DB_POOL_MAX,
+                    os.getenv('DATABASE_URL'),
+                    cursor_factory=ProfilingCursor
+                )
+                _pool_pid = pid
+    return _pool
+
+
+def _connection_is_usable(conn):
+    """Check a pooled connection before handing it out"""
+    if conn.closed:
+        return False
+    last_used = _pool_last_used.get(id(conn))
+    if last_used is not None and time.monotonic() - last_used < DB_POOL_CHECK_AFTER:
+        return True
     try:
-        conn = psycopg2.connect(
-            os.getenv('DATABASE_URL'),
-            cursor_factory=RealDictCursor
-        )
-        return conn
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _release_connection(conn, pool):
+    """Return a connection to its pool, discarding it if it is broken"""
+    if pool is None:
+        conn.close()
+        return
+    if pool is not _pool:
+        # Checked out from a pool that belongs to another process
+        return
+    discard = bool(conn.closed)
+    if not discard and conn.info.transaction_status != pg_extensions.TRANSACTION_STATUS_IDLE:
+        try:
+            conn.rollback()
+        except Exception:
+            discard = True
+    if discard or conn.info.transaction_status != pg_extensions.TRANSACTION_STATUS_IDLE:
+        _pool_last_used.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+        return
+    _pool_last_used[id(conn)] = time.monotonic()
+    pool.putconn(conn)
+
+
+def close_db_pool():
+    """Close every connection held by this process's pool"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+        _pool_last_used.clear()
+
+
+def _checkout_connection():
+    """Check a healthy connection out of the pool"""
+    try:
+        pool = _get_pool()
+        for _ in range(DB_POOL_MAX + 1):
+            try:
+                conn = pool.getconn()
+            except pg_pool.PoolError:
+                # Pool exhausted (e.g. nested calls); fall back to a direct connection
+                print("Database pool exhausted, opening a direct connection")
+                conn = psycopg2.connect(
+                    os.getenv('DATABASE_URL'),
+                    cursor_factory=ProfilingCursor
+                )
+                return PooledConnection(conn)
+            if _connection_is_usable(conn):
+                return PooledConnection(conn, pool)
+            _pool_last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("Could not obtain a healthy pooled connection")
     except Exception as e:
         print(f"Database connection error: {e}")
         raise
 
+
+def _get_request_connection():
+    """Return the connection shared by every TournamentDB call in this request"""
+    conn = g.get('_db_conn')
+    if conn is None or conn.closed:
+        conn = _checkout_connection()
+        if request.method in ('GET', 'HEAD'):
+            # Page renders read from a single snapshot
+            conn.set_session(isolation_level=pg_extensions.ISOLATION_LEVEL_REPEATABLE_READ)
+        g._db_conn = conn
+    elif conn.info.transaction_status == pg_extensions.TRANSACTION_STATUS_INERROR:
+        # A previous call failed without rolling back; don't poison the next one
+        conn.rollback()
+    return RequestConnection(conn)
+
+
+def close_request_connection(exc=None):
+    """Release the request-scoped connection (Flask teardown hook)"""
+    conn = g.pop('_db_conn', None)
+    if conn is None:
+        return
+    try:
+        if not conn.closed:
+            conn.rollback()
+            conn.reset_isolation()
+    except Exception as e:
+        print(f"Error resetting request connection: {e}")
+        # Don't hand a connection of unknown isolation level to the next caller
+        conn.discard()
+    finally:
+        conn.close()
+
+
+def get_db_connection():
+    """Get database connection (shared for the duration of a Flask request)"""
+    if has_request_context():
+        return _get_request_connection()
+    return _checkout_connection()
+
 def init_db():
     """Initialize database with required tables"""
     conn = get_db_connection()
@@ -263,10 +607,7 @@ def init_db():
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_tournaments_status ON tournaments(status);')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_tournament_players_tournament ON tournament_players(tournament_id);')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_tournament_players_player ON tournament_players(player_id);')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_tournament ON player_matches(tournament_id);')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_players ON player_matches(player1_id, player2_id);')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_stats(player_id);')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_stats_tournament ON player_stats(tournament_id);')
             
             # Groups removed - no longer needed
             
@@ -307,6 +648,150 @@ def create_default_admin(conn):
     except Exception as e:
         print(f"Error creating admin user: {e}")
 
+# Indexes behind the hot TournamentDB query shapes, created by ensure_indexes().
+# check_indexes.py EXPLAINs those queries to confirm the planner uses them.
+MANAGED_INDEXES = (
+    # A player's matches in order: WHERE player1_id/player2_id = ? ORDER BY played_at, match_id
+    ('idx_player_matches_player1_played',
+     'player_matches (player1_id, played_at, match_id)'),
+    ('idx_player_matches_player2_played',
+     'player_matches (player2_id, played_at, match_id)'),
+    # Tournament replays and tournament match lists
+    ('idx_player_matches_tournament_played',
+     'player_matches (tournament_id, played_at, match_id)'),
+    ('idx_player_matches_match_id',
+     'player_matches (match_id)'),
+    ('idx_player_matches_played_at_match',
+     'player_matches (played_at DESC, match_id DESC)'),
+    ('idx_guest_matches_clan_player_played',
+     'guest_matches (clan_player_id, played_at, match_id)'),
+    ('idx_guest_matches_tournament_played',
+     'guest_matches (tournament_id, played_at, match_id)'),
+    ('idx_guest_matches_played_at_match',
+     'guest_matches (played_at DESC, match_id DESC)'),
+    # Tournament standings, read in index order
+    ('idx_player_stats_tournament_rating',
+     'player_stats (tournament_id, tournament_rating DESC NULLS LAST, wins DESC, goals_scored DESC) '
+     'INCLUDE (player_id, matches_played)'),
+    # Overall rankings and the rank count on the profile page
+    ('idx_players_ranked',
+     'players (rating, matches_won, goals_scored) WHERE rating IS NOT NULL'),
+    ('idx_players_rating_name',
+     'players (rating DESC NULLS LAST, name)'),
+)
+
+# Indexes made redundant by the composites above, or that no query can use
+# (award lookups read award_standings, whose refresh scans every row)
+REDUNDANT_INDEXES = (
+    'idx_player_matches_player1',
+    'idx_player_matches_player2',
+    'idx_player_matches_players',
+    'idx_player_matches_tournament',
+    'idx_player_matches_played_at',
+    'idx_guest_matches_clan_player',
+    'idx_guest_matches_tournament',
+    'idx_guest_matches_played_at',
+    'idx_player_stats_tournament',
+    'idx_player_stats_award_pool',
+    'idx_players_award_pool',
+)
+
+
+# One row per (player, match) in player_matches, kept in sync by triggers.
+# {source} is player_matches for the backfill or the trigger's transition table.
+LEDGER_COLUMNS = (
+    'match_row_id, player_id, is_player1, match_id, tournament_id, opponent_id, '
+    'goals_for, goals_against, rating_before, rating_after, result, '
+    'is_walkover, is_null_match, is_draw, player_absent, opponent_absent, played_at'
+)
+
+LEDGER_ROWS_SQL = """
+    SELECT pm.id, pm.player1_id, TRUE, pm.match_id, pm.tournament_id, pm.player2_id,
+           pm.player1_goals, pm.player2_goals, pm.player1_rating_before, pm.player1_rating_after,
+           CASE WHEN pm.is_null_match THEN 'N' WHEN pm.winner_id = pm.player1_id THEN 'W'
+                WHEN pm.is_draw THEN 'D' ELSE 'L' END,
+           COALESCE(pm.is_walkover, FALSE), COALESCE(pm.is_null_match, FALSE), COALESCE(pm.is_draw, FALSE),
+           COALESCE(pm.player1_absent, FALSE), COALESCE(pm.player2_absent, FALSE), pm.played_at
+    FROM {source} pm
+    WHERE pm.player1_id IS NOT NULL
+    UNION ALL
+    SELECT pm.id, pm.player2_id, FALSE, pm.match_id, pm.tournament_id, pm.player1_id,
+           pm.player2_goals, pm.player1_goals, pm.player2_rating_before, pm.player2_rating_after,
+           CASE WHEN pm.is_null_match THEN 'N' WHEN pm.winner_id = pm.player2_id THEN 'W'
+                WHEN pm.is_draw THEN 'D' ELSE 'L' END,
+           COALESCE(pm.is_walkover, FALSE), COALESCE(pm.is_null_match, FALSE), COALESCE(pm.is_draw, FALSE),
+           COALESCE(pm.player2_absent, FALSE), COALESCE(pm.player1_absent, FALSE), pm.played_at
+    FROM {source} pm
+    WHERE pm.player2_id IS NOT NULL AND pm.player2_id IS DISTINCT FROM pm.player1_id
+"""
+
+# Hot statements, shared with check_indexes.py so it EXPLAINs exactly what
+# TournamentDB runs. Parameters are named (player_id, tournament_id).
+PLAYER_LEDGER_SQL = """
+    SELECT rating_before as tournament_rating_before,
+           rating_after as tournament_rating_after
+    FROM player_match_ledger
+    WHERE player_id = %(player_id)s
+    ORDER BY played_at ASC, match_id ASC
+"""
+
+DELETE_PLAYER_MATCHES_SQL = """
+    DELETE FROM player_matches WHERE player1_id = %(player_id)s OR player2_id = %(player_id)s
+"""
+
+REPLAY_MATCHES_SQL = """
+    SELECT id, match_id, tournament_id, played_at, player1_id, player2_id,
+           player1_goals, player2_goals, winner_id, is_draw,
+           is_walkover, is_null_match, player1_absent, player2_absent
+    FROM player_matches
+    WHERE %(tournament_id)s::int IS NULL OR tournament_id = %(tournament_id)s
+    ORDER BY tournament_id, played_at ASC NULLS LAST, match_id ASC
+"""
+
+TOURNAMENT_STANDINGS_SQL = """
+    SELECT 
+        p.name, 
+        p.photo_url, 
+        ps.*, 
+        p.rating as overall_rating,
+        tp.division_id,
+        d.name as division_name,
+        d.starting_rating as division_starting_rating
+    FROM player_stats ps
+    JOIN players p ON ps.player_id = p.id
+    LEFT JOIN tournament_players tp ON ps.player_id = tp.player_id AND ps.tournament_id = tp.tournament_id
+    LEFT JOIN divisions d ON tp.division_id = d.id
+    WHERE ps.tournament_id = %(tournament_id)s
+    ORDER BY ps.tournament_rating DESC NULLS LAST, ps.wins DESC, ps.goals_scored DESC
+"""
+
+OVERALL_RANKINGS_SQL = """
+    SELECT * FROM players
+    WHERE rating IS NOT NULL
+    ORDER BY rating DESC, matches_won DESC, goals_scored DESC
+"""
+
+# Rank uses the same order as OVERALL_RANKINGS_SQL
+PLAYER_PROFILE_SQL = """
+    SELECT p.*,
+           CASE WHEN p.rating IS NULL THEN NULL ELSE (
+               SELECT COUNT(*) + 1 FROM players o
+               WHERE o.rating IS NOT NULL
+                 AND (o.rating, o.matches_won, o.goals_scored) > (p.rating, p.matches_won, p.goals_scored)
+           ) END as overall_rank
+    FROM players p
+    WHERE p.id = %(player_id)s
+"""
+
+
+def ensure_indexes(cursor):
+    """Create any missing managed index and drop the ones they replace"""
+    for name, definition in MANAGED_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    for name in REDUNDANT_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
 def migrate_database(conn):
     """Run database migrations"""
     try:
@@ -484,38 +969,195 @@ def migrate_database(conn):
                     )
                 ''');
                 
-                # Add indexes for guest matches
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_guest_matches_clan_player ON guest_matches(clan_player_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_guest_matches_tournament ON guest_matches(tournament_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_guest_matches_played_at ON guest_matches(played_at DESC);')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_guest_matches_match_id ON guest_matches(match_id);')
-                
-                # Add indexes for player_matches table for better performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_played_at ON player_matches(played_at DESC);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_tournament ON player_matches(tournament_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_player1 ON player_matches(player1_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_player2 ON player_matches(player2_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_match_id ON player_matches(match_id);')
-                
-                # Add indexes for players table for search performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_rating ON players(rating DESC);')
-                
-                conn.commit()
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_played_at ON player_matches(played_at DESC);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_tournament ON player_matches(tournament_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_player1 ON player_matches(player1_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_player2 ON player_matches(player2_id);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_player_matches_match_id ON player_matches(match_id);')
-                
-                # Add indexes for players table for search performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_rating ON players(rating DESC);')
+                # Other guest and player match indexes are created by ensure_indexes()
                 
                 conn.commit()
                 print("guest_matches table created successfully!")
             else:
                 print("guest_matches table already exists")
+            
+            # Migration 10: Shared match id sequence for player_matches and guest_matches
+            cursor.execute("CREATE SEQUENCE IF NOT EXISTS match_id_seq")
+            # Seed from the current maximum; also catches up with ids written by older code
+            cursor.execute("""
+                SELECT GREATEST(
+                    (SELECT COALESCE(MAX(match_id), 0) FROM player_matches),
+                    (SELECT COALESCE(MAX(match_id), 0) FROM guest_matches)
+                ) AS max_id,
+                (SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM match_id_seq) AS seq_value
+            """)
+            seq_state = cursor.fetchone()
+            if seq_state['max_id'] > seq_state['seq_value']:
+                print(f"Seeding match_id_seq from {seq_state['max_id']}...")
+                cursor.execute("SELECT setval('match_id_seq', %s)", (seq_state['max_id'],))
+            cursor.execute("ALTER TABLE player_matches ALTER COLUMN match_id SET DEFAULT nextval('match_id_seq')")
+            cursor.execute("ALTER TABLE guest_matches ALTER COLUMN match_id SET DEFAULT nextval('match_id_seq')")
+            conn.commit()
+            print("match_id_seq is ready")
+            
+            # Migration 11: Precomputed award rankings (tournament_id 0 = overall)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS award_standings (
+                    tournament_id INTEGER NOT NULL,
+                    award VARCHAR(30) NOT NULL,
+                    rank INTEGER NOT NULL,
+                    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+                    PRIMARY KEY (tournament_id, award, rank)
+                )
+            """)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_award_standings_player ON award_standings(player_id, rank);')
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM award_standings) AS populated")
+            if not cursor.fetchone()['populated']:
+                print("Building award_standings...")
+                TournamentDB._refresh_award_standings(cursor, tournament_ids=None)
+            conn.commit()
+            print("award_standings is ready")
+            
+            # Migration 12: Keyset pagination indexes for match history are
+            # managed indexes (MANAGED_INDEXES), created by migration 15
+            
+            # Migration 13: Trigram indexes for substring search on player and guest names
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON players USING gin (LOWER(name) gin_trgm_ops);')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_guest_matches_guest_name_trgm ON guest_matches USING gin (LOWER(guest_name) gin_trgm_ops);')
+                conn.commit()
+                print("Name search indexes are ready")
+            except psycopg2.Error as e:
+                # Search still works without the extension, just without an index
+                conn.rollback()
+                print(f"Could not create trigram search indexes (non-critical): {e}")
+            
+            # Migration 14: Data-version stamps for HTTP revalidation of public pages
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    scope VARCHAR(20) NOT NULL,
+                    scope_id INTEGER NOT NULL,
+                    version BIGINT NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (scope, scope_id)
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO data_versions (scope, scope_id, version) VALUES ('global', 0, 0)
+                ON CONFLICT (scope, scope_id) DO NOTHING
+            """)
+            conn.commit()
+            print("data_versions is ready")
+            
+            # Migration 15: Managed index set for the player/tournament query shapes
+            try:
+                ensure_indexes(cursor)
+                conn.commit()
+                print("Managed indexes are ready")
+            except psycopg2.Error as e:
+                conn.rollback()
+                print(f"Could not update managed indexes (non-critical): {e}")
+            
+            # Migration 16: Per-player match ledger, maintained by triggers on player_matches
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS player_match_ledger (
+                    match_row_id INTEGER NOT NULL REFERENCES player_matches(id) ON DELETE CASCADE,
+                    player_id INTEGER NOT NULL,
+                    is_player1 BOOLEAN NOT NULL,
+                    match_id INTEGER NOT NULL,
+                    tournament_id INTEGER,
+                    opponent_id INTEGER,
+                    goals_for INTEGER,
+                    goals_against INTEGER,
+                    rating_before INTEGER,
+                    rating_after INTEGER,
+                    result CHAR(1) NOT NULL,
+                    is_walkover BOOLEAN NOT NULL DEFAULT FALSE,
+                    is_null_match BOOLEAN NOT NULL DEFAULT FALSE,
+                    is_draw BOOLEAN NOT NULL DEFAULT FALSE,
+                    player_absent BOOLEAN NOT NULL DEFAULT FALSE,
+                    opponent_absent BOOLEAN NOT NULL DEFAULT FALSE,
+                    played_at TIMESTAMP,
+                    PRIMARY KEY (match_row_id, player_id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_player_match_ledger_player
+                ON player_match_ledger (player_id, played_at, match_id)
+            """)
+            # Statement-level triggers so bulk inserts and replays sync in one pass;
+            # deletes are covered by the ON DELETE CASCADE
+            cursor.execute(f"""
+                CREATE OR REPLACE FUNCTION player_match_ledger_sync() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'UPDATE' THEN
+                        DELETE FROM player_match_ledger WHERE match_row_id IN (SELECT id FROM new_rows);
+                    END IF;
+                    INSERT INTO player_match_ledger ({LEDGER_COLUMNS})
+                    {LEDGER_ROWS_SQL.format(source='new_rows')};
+                    RETURN NULL;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            for event in ('INSERT', 'UPDATE'):
+                trigger = f"player_match_ledger_{event.lower()}"
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON player_matches")
+                cursor.execute(f"""
+                    CREATE TRIGGER {trigger}
+                    AFTER {event} ON player_matches
+                    REFERENCING NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION player_match_ledger_sync()
+                """)
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM player_match_ledger) AS filled")
+            if not cursor.fetchone()['filled']:
+                cursor.execute(f"""
+                    INSERT INTO player_match_ledger ({LEDGER_COLUMNS})
+                    {LEDGER_ROWS_SQL.format(source='player_matches')}
+                """)
+                print(f"Backfilled player_match_ledger with {cursor.rowcount} rows")
+            conn.commit()
+            print("player_match_ledger is ready")
+            
+            # Migration 17: Background recalculation jobs and their progress events
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recalculation_jobs (
+                    id SERIAL PRIMARY KEY,
+                    tournament_id INTEGER REFERENCES tournaments(id) ON DELETE CASCADE,
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker VARCHAR(100),
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    heartbeat_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_recalculation_jobs_pending
+                ON recalculation_jobs (id) WHERE status IN ('queued', 'running')
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS recalculation_job_events (
+                    job_id INTEGER NOT NULL REFERENCES recalculation_jobs(id) ON DELETE CASCADE,
+                    seq INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+            """)
+            conn.commit()
+            print("recalculation_jobs is ready")
+            
+            # Migration 18: Tournament rating checkpoints (state after every N matches)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rating_checkpoints (
+                    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+                    match_count INTEGER NOT NULL,
+                    played_at TIMESTAMP,
+                    match_id INTEGER NOT NULL,
+                    state JSONB NOT NULL,
+                    PRIMARY KEY (tournament_id, match_count)
+                )
+            """)
+            conn.commit()
+            print("rating_checkpoints is ready")
                 
     except Exception as e:
         print(f"Migration error (non-critical): {e}")
@@ -523,6 +1165,206 @@ def migrate_database(conn):
 
 # Team population removed - system is now player-centric
 
+class RecalculationEventLog:
+    """Appends a job's progress events as they happen.
+
+    Events go through their own autocommit connection in small batches, so
+    the progress stream sees them while the recalculation's transaction is
+    still open.
+    """
+
+    BATCH_SIZE = 200
+    FLUSH_SECONDS = 0.5
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.seq = 0
+        self._pending = []
+        self._flushed_at = time.monotonic()
+        self._conn = _checkout_connection()
+        self._conn.autocommit = True
+
+    def add(self, event):
+        self.seq += 1
+        self._pending.append((self.job_id, self.seq, json.dumps(event)))
+        if len(self._pending) >= self.BATCH_SIZE or time.monotonic() - self._flushed_at >= self.FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self._conn.cursor() as cursor:
+                execute_values(cursor, "INSERT INTO recalculation_job_events (job_id, seq, payload) VALUES %s",
+                               self._pending, page_size=self.BATCH_SIZE)
+            self._pending = []
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._conn.autocommit = False
+            self._conn.close()
+
+
+class BulkMatchError(ValueError):
+    """Raised when a bulk match upload has invalid rows; nothing is recorded"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = '; '.join(f"Match {row}: {message}" for row, message in errors)
+        super().__init__(f"{len(errors)} match(es) could not be recorded: {details}")
+
+
+# award_standings.tournament_id for overall (all-tournament) rankings
+OVERALL_AWARD_SCOPE = 0
+
+# Recent match counts by (tournament_id, search_query), least recently used first
+MATCH_COUNT_CACHE_MAX_ENTRIES = 256
+_match_count_cache = OrderedDict()
+_match_count_lock = threading.Lock()
+
+
+def clear_match_count_cache():
+    with _match_count_lock:
+        _match_count_cache.clear()
+
+
+def encode_page_token(match, direction):
+    """Opaque token pointing just past a match in (played_at, match_id) order.
+
+    direction is 'after' (older matches) or 'before' (newer matches).
+    """
+    payload = [direction, match['played_at'].isoformat(), match['match_id']]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_page_token(token):
+    """Inverse of encode_page_token(): (direction, (played_at, match_id))"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, played_at, match_id = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ('after', 'before'):
+            raise ValueError(direction)
+        return direction, (datetime.fromisoformat(played_at), int(match_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid page token") from e
+
+
+class ReadCache:
+    """TTL + LRU cache of TournamentDB read results, tagged with the data version"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._data_version = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def bump(self):
+        """Invalidate every cached result (called after each write)"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get(self, key):
+        """Return (True, value) for a fresh entry, else (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, version, value = entry
+                if version == self._version and time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, version, value):
+        """Store a result read at `version`; dropped if a write happened since"""
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = (time.monotonic(), version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def sync(self, data_version):
+        """Invalidate if the shared data version moved (a write in another process)"""
+        with self._lock:
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._version += 1
+                self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+read_cache = ReadCache(READ_CACHE_SECONDS, READ_CACHE_MAX_ENTRIES)
+
+
+def enable_read_cache(data_version=None):
+    """Let TournamentDB reads in the current request be served from read_cache.
+
+    Passing the global data version first drops entries that a write in
+    another process has made stale.
+    """
+    if data_version is not None:
+        read_cache.sync(data_version)
+    g.use_read_cache = True
+
+
+def _copy_result(value):
+    """Copy the containers of a cached result so callers can mutate their rows"""
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    return value
+
+
+def cached_read(func):
+    """Memoize a TournamentDB read for requests that called enable_read_cache()"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if read_cache.ttl <= 0 or not has_request_context() or not g.get('use_read_cache'):
+            return func(*args, **kwargs)
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            found, value = read_cache.get(key)
+        except TypeError:
+            # Unhashable arguments; not worth caching
+            return func(*args, **kwargs)
+        if not found:
+            version = read_cache.version
+            value = func(*args, **kwargs)
+            read_cache.put(key, version, value)
+        return _copy_result(value)
+    return wrapper
+
+
+def invalidates_reads(func):
+    """Bump the read cache version (and drop cached match counts) once a TournamentDB write returns or fails"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            read_cache.bump()
+            clear_match_count_cache()
+    return wrapper
+
+
 class TournamentDB:
     """Database operations for tournament management"""
     
@@ -551,6 +1393,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def insert_match(match_data):
         """Insert regular match data"""
         conn = get_db_connection()
@@ -569,6 +1412,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def insert_knockout_match(match_data):
         """Insert knockout match data"""
         conn = get_db_connection()
@@ -587,6 +1431,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def insert_knockout_game(game_data):
         """Insert individual knockout game data"""
         conn = get_db_connection()
@@ -650,6 +1495,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def add_player(name, photo_url=None, photo_file_id=None, initial_rating=None):
         """Add a new player with optional photo and initial rating"""
         conn = get_db_connection()
@@ -660,6 +1506,7 @@ class TournamentDB:
                     (name, None, photo_url, photo_file_id, initial_rating)
                 )
                 player_id = cursor.fetchone()['id']
+                TournamentDB._bump_data_versions(cursor)
                 conn.commit()
                 return player_id
         except Exception as e:
@@ -669,6 +1516,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def add_players_bulk(player_names):
         """Add multiple players at once"""
         conn = get_db_connection()
@@ -676,15 +1524,17 @@ class TournamentDB:
             with conn.cursor() as cursor:
                 added_players = []
                 for name in player_names:
-                    try:
-                        cursor.execute(
-                            "INSERT INTO players (name, rating) VALUES (%s, %s) RETURNING id, name",
-                            (name.strip(), None)
-                        )
-                        result = cursor.fetchone()
+                    # ON CONFLICT keeps the transaction usable after a duplicate
+                    cursor.execute(
+                        "INSERT INTO players (name, rating) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING RETURNING id, name",
+                        (name.strip(), None)
+                    )
+                    result = cursor.fetchone()
+                    if result:
                         added_players.append(result)
-                    except Exception as e:
+                    else:
                         print(f"Skipping duplicate player: {name}")
+                TournamentDB._bump_data_versions(cursor)
                 conn.commit()
                 return added_players
         except Exception as e:
@@ -694,30 +1544,37 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_all_players(search=None, limit=None):
         """Get all players with optional search and limit"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                query = "SELECT * FROM players"
-                params = []
-                
-                if search:
-                    query += " WHERE name ILIKE %s"
-                    params.append(f"%{search}%")
-                
-                query += " ORDER BY rating DESC NULLS LAST, name ASC"
-                
-                if limit:
-                    query += " LIMIT %s"
-                    params.append(limit)
-                
-                cursor.execute(query, params)
+                cursor.execute(*TournamentDB._players_query(search, limit))
                 return cursor.fetchall()
         finally:
             conn.close()
     
     @staticmethod
+    def _players_query(search=None, limit=None):
+        """(query, params) run by get_all_players()"""
+        query = "SELECT * FROM players"
+        params = []
+        
+        if search:
+            # LOWER(name) LIKE can use the trigram index on players
+            query += " WHERE LOWER(name) LIKE %s"
+            params.append(TournamentDB._like_pattern(search))
+        
+        query += " ORDER BY rating DESC NULLS LAST, name ASC"
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        return query, params
+    
+    @staticmethod
+    @invalidates_reads
     def create_tournament(name, tournament_photo_url=None, tournament_photo_file_id=None, tournament_type='normal'):
         """Create a new tournament with optional photo and type"""
         conn = get_db_connection()
@@ -728,6 +1585,7 @@ class TournamentDB:
                     (name, tournament_photo_url, tournament_photo_file_id, tournament_type)
                 )
                 tournament_id = cursor.fetchone()['id']
+                TournamentDB._bump_data_versions(cursor, [tournament_id])
                 conn.commit()
                 return tournament_id
         except Exception as e:
@@ -737,6 +1595,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_all_tournaments():
         """Get all tournaments"""
         conn = get_db_connection()
@@ -750,20 +1609,61 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
+    def get_tournaments_overview():
+        """All tournaments with participant count, match count and top-rated participant"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT
+                        t.*,
+                        COALESCE(pc.player_count, 0) as player_count,
+                        COALESCE(mc.match_count, 0) as match_count,
+                        top.id as top_player_id,
+                        top.name as top_player_name,
+                        top.rating as top_player_rating,
+                        top.photo_url as top_player_photo_url
+                    FROM tournaments t
+                    LEFT JOIN (
+                        SELECT tournament_id, COUNT(*) as player_count
+                        FROM tournament_players
+                        GROUP BY tournament_id
+                    ) pc ON pc.tournament_id = t.id
+                    LEFT JOIN (
+                        SELECT tournament_id, COUNT(*) as match_count
+                        FROM player_matches
+                        GROUP BY tournament_id
+                    ) mc ON mc.tournament_id = t.id
+                    LEFT JOIN LATERAL (
+                        SELECT p.id, p.name, p.rating, p.photo_url
+                        FROM tournament_players tp
+                        JOIN players p ON p.id = tp.player_id
+                        WHERE tp.tournament_id = t.id
+                        ORDER BY p.rating DESC NULLS LAST, p.id
+                        LIMIT 1
+                    ) top ON TRUE
+                    ORDER BY t.created_at DESC
+                """)
+                return cursor.fetchall()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @invalidates_reads
     def add_players_to_tournament(tournament_id, player_ids, division_id=None):
         """Add players to a tournament, optionally with a division"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 for player_id in player_ids:
-                    try:
-                        cursor.execute(
-                            "INSERT INTO tournament_players (tournament_id, player_id, division_id) VALUES (%s, %s, %s)",
-                            (tournament_id, player_id, division_id)
-                        )
-                    except Exception:
-                        # Skip if already exists
-                        pass
+                    # Skip if already exists
+                    cursor.execute(
+                        "INSERT INTO tournament_players (tournament_id, player_id, division_id) VALUES (%s, %s, %s) "
+                        "ON CONFLICT (tournament_id, player_id) DO NOTHING",
+                        (tournament_id, player_id, division_id)
+                    )
+                TournamentDB._bump_data_versions(cursor, [tournament_id], player_ids)
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -772,6 +1672,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_tournament_players(tournament_id):
         """Get all players in a tournament with their division info and tournament-specific rating"""
         conn = get_db_connection()
@@ -797,6 +1698,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_tournament_by_id(tournament_id):
         """Get a specific tournament by ID"""
         conn = get_db_connection()
@@ -808,6 +1710,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def update_tournament_photo(tournament_id, tournament_photo_url, tournament_photo_file_id):
         """Update tournament photo information"""
         conn = get_db_connection()
@@ -824,6 +1727,7 @@ class TournamentDB:
                     "UPDATE tournaments SET tournament_photo_url = %s, tournament_photo_file_id = %s WHERE id = %s",
                     (tournament_photo_url, tournament_photo_file_id, tournament_id)
                 )
+                TournamentDB._bump_data_versions(cursor, [tournament_id], related=True)
                 conn.commit()
                 return tournament_id
         except Exception as e:
@@ -833,6 +1737,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def update_tournament(tournament_id, name, tournament_photo_url=None, tournament_photo_file_id=None, tournament_type=None):
         """Update tournament name, photo, and optionally type"""
         conn = get_db_connection()
@@ -861,6 +1766,7 @@ class TournamentDB:
                         "UPDATE tournaments SET name = %s, tournament_photo_url = %s, tournament_photo_file_id = %s WHERE id = %s",
                         (name.strip(), tournament_photo_url, tournament_photo_file_id, tournament_id)
                     )
+                TournamentDB._bump_data_versions(cursor, [tournament_id], related=True)
                 conn.commit()
                 return tournament_id
         except Exception as e:
@@ -870,12 +1776,16 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def delete_division(division_id):
         """Delete a division"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                cursor.execute("DELETE FROM divisions WHERE id = %s", (division_id,))
+                cursor.execute("DELETE FROM divisions WHERE id = %s RETURNING tournament_id", (division_id,))
+                division = cursor.fetchone()
+                if division:
+                    TournamentDB._bump_data_versions(cursor, [division['tournament_id']], related=True)
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -884,15 +1794,19 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def update_division(division_id, name, starting_rating):
         """Update a division's name and starting rating"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 cursor.execute(
-                    "UPDATE divisions SET name = %s, starting_rating = %s WHERE id = %s",
+                    "UPDATE divisions SET name = %s, starting_rating = %s WHERE id = %s RETURNING tournament_id",
                     (name, starting_rating, division_id)
                 )
+                division = cursor.fetchone()
+                if division:
+                    TournamentDB._bump_data_versions(cursor, [division['tournament_id']], related=True)
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -901,6 +1815,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def create_division(tournament_id, name, starting_rating):
         """Create a new division for a tournament"""
         conn = get_db_connection()
@@ -911,6 +1826,7 @@ class TournamentDB:
                     (tournament_id, name, starting_rating)
                 )
                 division_id = cursor.fetchone()['id']
+                TournamentDB._bump_data_versions(cursor, [tournament_id])
                 conn.commit()
                 return division_id
         except Exception as e:
@@ -920,6 +1836,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_divisions_by_tournament(tournament_id):
         """Get all divisions for a tournament"""
         conn = get_db_connection()
@@ -945,6 +1862,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def assign_player_to_division(tournament_id, player_id, division_id):
         """Assign a player to a division in a tournament"""
         conn = get_db_connection()
@@ -954,6 +1872,7 @@ class TournamentDB:
                     "UPDATE tournament_players SET division_id = %s WHERE tournament_id = %s AND player_id = %s",
                     (division_id, tournament_id, player_id)
                 )
+                TournamentDB._bump_data_versions(cursor, [tournament_id], [player_id])
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -979,72 +1898,15 @@ class TournamentDB:
     @staticmethod
     def calculate_rating_change(winner_rating, loser_rating, is_draw=False):
         """Calculate rating change based on ELO-like system"""
-        # K-factor (maximum rating change)
-        K = 32
-        
-        # Expected scores
-        expected_winner = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
-        expected_loser = 1 / (1 + 10 ** ((winner_rating - loser_rating) / 400))
-        
-        if is_draw:
-            # Draw: both players get 0.5 points
-            winner_change = K * (0.5 - expected_winner)
-            loser_change = K * (0.5 - expected_loser)
-        else:
-            # Win/Loss: winner gets 1 point, loser gets 0
-            winner_change = K * (1 - expected_winner)
-            loser_change = K * (0 - expected_loser)
-        
-        return int(round(winner_change)), int(round(loser_change))
+        return rating_engine.rating_change(winner_rating, loser_rating, is_draw)
     
     @staticmethod
     def calculate_enhanced_rating_change(player1_rating, player2_rating, player1_goals, player2_goals, 
                                        player1_absent=False, player2_absent=False):
         """Calculate enhanced rating change with constant points for goals and clean sheets"""
-        # Constant point values
-        GOAL_SCORED_POINTS = 2      # +2 points per goal scored
-        GOAL_CONCEDED_PENALTY = -1  # -1 point per goal conceded
-        CLEAN_SHEET_BONUS = 5       # +5 points for clean sheet
-        
-        is_draw = player1_goals == player2_goals
-        
-        # Get base ELO rating changes
-        if is_draw:
-            base_change1, base_change2 = TournamentDB.calculate_rating_change(
-                player1_rating, player2_rating, is_draw=True
-            )
-        else:
-            winner_rating = player1_rating if player1_goals > player2_goals else player2_rating
-            loser_rating = player2_rating if player1_goals > player2_goals else player1_rating
-            winner_change, loser_change = TournamentDB.calculate_rating_change(
-                winner_rating, loser_rating, is_draw=False
-            )
-            if player1_goals > player2_goals:
-                base_change1, base_change2 = winner_change, loser_change
-            else:
-                base_change1, base_change2 = loser_change, winner_change
-        
-        # Calculate constant points for player 1
-        constant_points1 = 0
-        if not player1_absent:
-            constant_points1 += player1_goals * GOAL_SCORED_POINTS  # Points for goals scored
-            constant_points1 += player2_goals * GOAL_CONCEDED_PENALTY  # Penalty for goals conceded
-            if player2_goals == 0:  # Clean sheet bonus
-                constant_points1 += CLEAN_SHEET_BONUS
-        
-        # Calculate constant points for player 2
-        constant_points2 = 0
-        if not player2_absent:
-            constant_points2 += player2_goals * GOAL_SCORED_POINTS  # Points for goals scored
-            constant_points2 += player1_goals * GOAL_CONCEDED_PENALTY  # Penalty for goals conceded
-            if player1_goals == 0:  # Clean sheet bonus
-                constant_points2 += CLEAN_SHEET_BONUS
-        
-        # Combine base ELO change with constant points
-        total_change1 = base_change1 + constant_points1
-        total_change2 = base_change2 + constant_points2
-        
-        return int(round(total_change1)), int(round(total_change2))
+        return rating_engine.enhanced_rating_change(
+            player1_rating, player2_rating, player1_goals, player2_goals, player1_absent, player2_absent
+        )
     
     @staticmethod
     def calculate_overall_rating_from_last_matches(cursor, player_id, limit=40):
@@ -1063,27 +1925,24 @@ class TournamentDB:
         Returns:
             Cumulative overall rating
         """
+        total = TournamentDB._overall_rating_total(cursor, player_id)
+        if total is None:
+            # No matches played, return default rating
+            return 300
+        
+        # Clamp the accumulated total once (as _apply_overall_rating_change assumes)
+        return int(round(rating_engine.clamp_rating(total)))
+    
+    @staticmethod
+    def _overall_rating_total(cursor, player_id):
+        """The unclamped running total behind the overall rating (None without matches)"""
         # Get all matches for this player in chronological order
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN player1_id = %s THEN player1_rating_before
-                    ELSE player2_rating_before
-                END as tournament_rating_before,
-                CASE 
-                    WHEN player1_id = %s THEN player1_rating_after
-                    ELSE player2_rating_after
-                END as tournament_rating_after
-            FROM player_matches
-            WHERE (player1_id = %s OR player2_id = %s)
-            ORDER BY played_at ASC, match_id ASC
-        """, (player_id, player_id, player_id, player_id))
+        cursor.execute(PLAYER_LEDGER_SQL, {'player_id': player_id})
         
         matches = cursor.fetchall()
         
         if not matches:
-            # No matches played, return default rating
-            return 300
+            return None
         
         # Start from the first tournament's starting rating (rating_before of first match)
         cumulative_rating = matches[0]['tournament_rating_before']
@@ -1095,12 +1954,100 @@ class TournamentDB:
             # Apply the change to cumulative overall rating
             cumulative_rating += tournament_change
         
-        # Ensure rating stays within bounds
-        cumulative_rating = max(0, min(1000, cumulative_rating))
-        
-        return int(round(cumulative_rating))
+        return cumulative_rating
     
     @staticmethod
+    def _next_match_id(cursor):
+        """Allocate a match id shared by player_matches and guest_matches"""
+        cursor.execute("SELECT nextval('match_id_seq') AS next_id")
+        return cursor.fetchone()['next_id']
+    
+    @staticmethod
+    def _reserve_match_ids(cursor, count):
+        """Reserve a block of match ids for a bulk insert, in ascending order"""
+        cursor.execute(
+            "SELECT nextval('match_id_seq') AS next_id FROM generate_series(1, %s)",
+            (count,)
+        )
+        return sorted(row['next_id'] for row in cursor.fetchall())
+    
+    @staticmethod
+    def _apply_overall_rating_change(cursor, player_id, match_id, rating_before, rating_after):
+        """Apply one new match's tournament rating change to the stored overall rating.
+
+        Equivalent to replaying the player's history with
+        calculate_overall_rating_from_last_matches() when the new match is the
+        latest one, but costs the same regardless of career length. The replay
+        clamps the accumulated total once, so a stored rating strictly inside
+        the bounds is that total; at a bound the total is unknown and the
+        history is replayed instead.
+        """
+        cursor.execute("""
+            SELECT rating, EXISTS (
+                SELECT 1 FROM player_match_ledger
+                WHERE player_id = %s AND match_id <> %s
+            ) AS has_history
+            FROM players WHERE id = %s
+        """, (player_id, match_id, player_id))
+        row = cursor.fetchone()
+        
+        if not row['has_history']:
+            # First match: the replay starts at its rating_before and adds its
+            # change, which lands on its rating_after
+            new_overall_rating = int(round(rating_engine.clamp_rating(rating_after)))
+        elif row['rating'] is None or not rating_engine.MIN_RATING < row['rating'] < rating_engine.MAX_RATING:
+            # Stored rating lost, or clamped so the running total is unknown
+            new_overall_rating = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player_id)
+        else:
+            new_overall_rating = int(round(rating_engine.clamp_rating(row['rating'] + (rating_after - rating_before))))
+        
+        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating, player_id))
+        return new_overall_rating
+    
+    @staticmethod
+    @invalidates_reads
+    def verify_overall_ratings(repair=False):
+        """Compare stored overall ratings against a full history replay.
+
+        Returns the players whose stored rating differs; with repair=True the
+        replayed value is written back.
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT DISTINCT p.id, p.name, p.rating
+                    FROM players p
+                    JOIN player_matches pm ON p.id = pm.player1_id OR p.id = pm.player2_id
+                    ORDER BY p.id
+                """)
+                players = cursor.fetchall()
+                
+                mismatches = []
+                for player in players:
+                    expected = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player['id'])
+                    if player['rating'] != expected:
+                        mismatches.append({
+                            'player_id': player['id'],
+                            'name': player['name'],
+                            'stored_rating': player['rating'],
+                            'expected_rating': expected
+                        })
+                        if repair:
+                            cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (expected, player['id']))
+                
+                if repair:
+                    TournamentDB._bump_data_versions(cursor, player_ids=[m['player_id'] for m in mismatches])
+                    conn.commit()
+                return mismatches
+        except Exception as e:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @invalidates_reads
     def record_match(tournament_id, player1_id, player2_id, player1_goals, player2_goals, player1_absent=False, player2_absent=False):
         """Record a one-on-one match and update ratings, handling absences"""
         conn = get_db_connection()
@@ -1155,8 +2102,7 @@ class TournamentDB:
         new_rating2 = max(0, min(1000, player2_rating - NULL_MATCH_PENALTY))
         
         # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
+        match_id = TournamentDB._next_match_id(cursor)
         
         # Record the null match with negative penalty applied
         cursor.execute("""
@@ -1168,13 +2114,13 @@ class TournamentDB:
         """, (match_id, tournament_id, player1_id, player2_id, 
               player1_rating, player2_rating, new_rating1, new_rating2))
         
-        # Calculate and update overall ratings for both players
+        # Update overall ratings for both players
         # Null matches apply penalty so they affect cumulative rating
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
-        
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
+        TournamentDB._apply_overall_rating_change(cursor, player1_id, match_id, player1_rating, new_rating1)
+        TournamentDB._apply_overall_rating_change(cursor, player2_id, match_id, player2_rating, new_rating2)
+        TournamentDB._extend_checkpoints(cursor, [tournament_id])
+        TournamentDB._refresh_award_standings(cursor, [tournament_id])
+        TournamentDB._bump_data_versions(cursor, [tournament_id], [player1_id, player2_id])
         
         conn.commit()
         return match_id
@@ -1272,8 +2218,7 @@ class TournamentDB:
         new_tournament_rating2 = new_winner_tournament_rating if winner_id == player2_id else new_loser_tournament_rating
         
         # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
+        match_id = TournamentDB._next_match_id(cursor)
         
         # Record the walkover match (store tournament-specific ratings)
         # Walkover matches: 0-0 score, update ratings, matches_played, wins/losses but NO goals
@@ -1330,12 +2275,12 @@ class TournamentDB:
                   1 if is_winner else 0,
                   1 if not is_winner else 0))
         
-        # Calculate and update overall ratings for both players
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
-        
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
+        # Update overall ratings for both players
+        TournamentDB._apply_overall_rating_change(cursor, player1_id, match_id, player1_rating, new_tournament_rating1)
+        TournamentDB._apply_overall_rating_change(cursor, player2_id, match_id, player2_rating, new_tournament_rating2)
+        TournamentDB._extend_checkpoints(cursor, [tournament_id])
+        TournamentDB._refresh_award_standings(cursor, [tournament_id])
+        TournamentDB._bump_data_versions(cursor, [tournament_id], [player1_id, player2_id])
         
         conn.commit()
         return match_id
@@ -1417,8 +2362,7 @@ class TournamentDB:
         new_tournament_rating2 = max(0, min(1000, player2_rating + rating_change2))
         
         # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
+        match_id = TournamentDB._next_match_id(cursor)
         
         # Record the match (store tournament-specific ratings)
         cursor.execute("""
@@ -1512,54 +2456,121 @@ class TournamentDB:
                   1 if goals_conceded == 0 else 0,
                   glove_points))
         
-        # Calculate and update overall ratings for both players
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
-        
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
+        # Update overall ratings for both players
+        TournamentDB._apply_overall_rating_change(cursor, player1_id, match_id, player1_rating, new_tournament_rating1)
+        TournamentDB._apply_overall_rating_change(cursor, player2_id, match_id, player2_rating, new_tournament_rating2)
+        TournamentDB._extend_checkpoints(cursor, [tournament_id])
+        TournamentDB._refresh_award_standings(cursor, [tournament_id])
+        TournamentDB._bump_data_versions(cursor, [tournament_id], [player1_id, player2_id])
         
         conn.commit()
         return match_id
     
     @staticmethod
+    @cached_read
     def get_player_tournament_stats(tournament_id):
         """Get tournament-specific player statistics with division information"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
+                cursor.execute(TOURNAMENT_STANDINGS_SQL, {'tournament_id': tournament_id})
+                return cursor.fetchall()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @cached_read
+    def get_tournament_standings_as_of(tournament_id, as_of):
+        """Tournament standings counting only the matches played up to as_of.
+
+        Starts from the latest checkpoint taken by then and replays the few
+        matches after it. Rows have the same fields and order as
+        get_player_tournament_stats().
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                checkpoint = TournamentDB._load_checkpoint(cursor, tournament_id, as_of=as_of)
+                position = {'tournament_id': tournament_id, 'as_of': as_of}
+                if checkpoint:
+                    position.update(played_at=checkpoint['played_at'], match_id=checkpoint['match_id'])
+                cursor.execute(f"""
+                    SELECT id, match_id, tournament_id, played_at, player1_id, player2_id,
+                           player1_goals, player2_goals, winner_id, is_draw,
+                           is_walkover, is_null_match, player1_absent, player2_absent
+                    FROM player_matches pm
+                    WHERE pm.tournament_id = %(tournament_id)s
+                      AND pm.played_at <= %(as_of)s
+                      {'AND ' + TournamentDB._AFTER_POSITION_SQL if checkpoint else ''}
+                    ORDER BY pm.played_at ASC, pm.match_id ASC
+                """, position)
+                matches = cursor.fetchall()
+                
+                starting_ratings = TournamentDB._load_starting_ratings(cursor, tournament_id).get(tournament_id, {})
+                state = checkpoint['state'] if checkpoint else rating_engine.new_state()
+                _, totals = rating_engine.replay_from_state(matches, starting_ratings, state)
+                if not totals:
+                    return []
+                
                 cursor.execute("""
-                    SELECT 
-                        p.name, 
-                        p.photo_url, 
-                        ps.*, 
-                        p.rating as overall_rating,
-                        tp.division_id,
-                        d.name as division_name,
-                        d.starting_rating as division_starting_rating
-                    FROM player_stats ps
-                    JOIN players p ON ps.player_id = p.id
-                    LEFT JOIN tournament_players tp ON ps.player_id = tp.player_id AND ps.tournament_id = tp.tournament_id
+                    SELECT p.id as player_id, p.name, p.photo_url, p.rating as overall_rating,
+                           tp.division_id, d.name as division_name,
+                           d.starting_rating as division_starting_rating
+                    FROM players p
+                    LEFT JOIN tournament_players tp ON tp.player_id = p.id AND tp.tournament_id = %s
                     LEFT JOIN divisions d ON tp.division_id = d.id
-                    WHERE ps.tournament_id = %s
-                    ORDER BY ps.tournament_rating DESC NULLS LAST, ps.wins DESC, ps.goals_scored DESC
-                """, (tournament_id,))
-                return cursor.fetchall()
+                    WHERE p.id = ANY(%s)
+                """, (tournament_id, list(totals)))
+                standings = [
+                    dict(row, tournament_id=tournament_id, **totals[row['player_id']])
+                    for row in cursor.fetchall()
+                ]
         finally:
             conn.close()
+        
+        standings.sort(key=lambda row: (-row['tournament_rating'], -row['wins'], -row['goals_scored']))
+        return standings
     
     @staticmethod
+    @cached_read
     def get_overall_player_stats():
         """Get overall player statistics across all tournaments"""
         conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(OVERALL_RANKINGS_SQL)
+                return cursor.fetchall()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @cached_read
+    def get_site_stats():
+        """Player/match totals, average rating and the latest matches for the public homepage"""
+        conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT * FROM players
-                    WHERE rating IS NOT NULL
-                    ORDER BY rating DESC, matches_won DESC, goals_scored DESC
+                    SELECT (SELECT COUNT(*) FROM players) as total_players,
+                           (SELECT COUNT(*) FROM player_matches) as total_matches,
+                           (SELECT AVG(rating) FROM players) as avg_rating
                 """)
-                return cursor.fetchall()
+                stats = cursor.fetchone()
+                cursor.execute("""
+                    SELECT pm.*, p1.name as player1_name, p2.name as player2_name, t.name as tournament_name
+                    FROM player_matches pm
+                    JOIN players p1 ON pm.player1_id = p1.id
+                    LEFT JOIN players p2 ON pm.player2_id = p2.id
+                    JOIN tournaments t ON pm.tournament_id = t.id
+                    ORDER BY pm.played_at DESC
+                    LIMIT 10
+                """)
+                return {
+                    'total_players': stats['total_players'],
+                    'total_matches': stats['total_matches'],
+                    'average_rating': int(stats['avg_rating']) if stats['avg_rating'] else 300,
+                    'recent_matches': cursor.fetchall()
+                }
         finally:
             conn.close()
     
@@ -1599,552 +2610,846 @@ class TournamentDB:
                 
                 tournaments = cursor.fetchall()
                 
-                # Calculate rating contributions
-                tournament_breakdown = []
-                for tournament in tournaments:
-                    # Get first and last match ratings in this tournament
-                    cursor.execute("""
-                        SELECT 
-                            MIN(played_at) as first_match,
-                            MAX(played_at) as last_match
-                        FROM player_matches
-                        WHERE tournament_id = %s 
-                        AND (player1_id = %s OR player2_id = %s)
-                    """, (tournament['tournament_id'], player_id, player_id))
-                    
-                    match_dates = cursor.fetchone()
-                    
-                    # Get all matches in this tournament with rating changes
-                    cursor.execute("""
-                        SELECT 
-                            pm.match_id,
-                            pm.played_at,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN p2.name 
-                                ELSE p1.name 
-                            END as opponent_name,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player1_goals
-                                ELSE pm.player2_goals
-                            END as goals_for,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player2_goals
-                                ELSE pm.player1_goals
-                            END as goals_against,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player1_rating_before
-                                ELSE pm.player2_rating_before
-                            END as tournament_rating_before,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player1_rating_after
-                                ELSE pm.player2_rating_after
-                            END as tournament_rating_after,
-                            pm.winner_id,
-                            pm.is_draw,
-                            pm.is_walkover,
-                            pm.is_null_match,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player1_absent
-                                ELSE pm.player2_absent
-                            END as player_absent,
-                            CASE 
-                                WHEN pm.player1_id = %s THEN pm.player2_absent
-                                ELSE pm.player1_absent
-                            END as opponent_absent
-                        FROM player_matches pm
-                        JOIN players p1 ON pm.player1_id = p1.id
-                        JOIN players p2 ON pm.player2_id = p2.id
-                        WHERE pm.tournament_id = %s 
-                        AND (pm.player1_id = %s OR pm.player2_id = %s)
-                        ORDER BY pm.played_at ASC, pm.match_id ASC
-                    """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id, 
-                          tournament['tournament_id'], player_id, player_id))
-                    
-                    tournament_matches = cursor.fetchall()
-                    
-                    # Get rating at start of tournament (first match rating_before)
-                    cursor.execute("""
-                        SELECT 
-                            CASE 
-                                WHEN player1_id = %s THEN player1_rating_before
-                                ELSE player2_rating_before
-                            END as rating_before
-                        FROM player_matches
-                        WHERE tournament_id = %s 
-                        AND (player1_id = %s OR player2_id = %s)
-                        ORDER BY played_at ASC, match_id ASC
-                        LIMIT 1
-                    """, (player_id, tournament['tournament_id'], player_id, player_id))
-                    
-                    start_rating_result = cursor.fetchone()
-                    start_rating = start_rating_result['rating_before'] if start_rating_result else 300
-                    
-                    # Calculate rating change in this tournament
-                    current_rating = tournament['tournament_rating'] if tournament['tournament_rating'] else start_rating
-                    rating_change = current_rating - start_rating
-                    
-                    # Process each match to get overall rating progression
-                    matches_with_overall = []
-                    for match in tournament_matches:
-                        # Get overall rating at this point (from players table)
-                        # We need to get this from a separate overall rating history
-                        tournament_rating_change = match['tournament_rating_after'] - match['tournament_rating_before']
-                        
-                        # Determine result
-                        if match['is_null_match']:
-                            result = 'NULL'
-                        elif match['is_draw']:
-                            result = 'DRAW'
-                        elif match['winner_id'] == player_id:
-                            result = 'WIN'
-                        else:
-                            result = 'LOSS'
-                        
-                        matches_with_overall.append({
-                            'match_id': match['match_id'],
-                            'played_at': match['played_at'],
-                            'opponent': match['opponent_name'],
-                            'score': f"{match['goals_for']}-{match['goals_against']}",
-                            'goals_for': match['goals_for'],
-                            'goals_against': match['goals_against'],
-                            'result': result,
-                            'is_walkover': match['is_walkover'],
-                            'player_absent': match['player_absent'],
-                            'opponent_absent': match['opponent_absent'],
-                            'tournament_rating_before': match['tournament_rating_before'],
-                            'tournament_rating_after': match['tournament_rating_after'],
-                            'tournament_rating_change': tournament_rating_change
-                        })
-                    
-                    tournament_breakdown.append({
-                        'tournament_id': tournament['tournament_id'],
-                        'tournament_name': tournament['tournament_name'],
-                        'tournament_status': tournament['tournament_status'],
-                        'tournament_rating': current_rating,
-                        'start_rating': start_rating,
-                        'rating_change': rating_change,
-                        'matches': tournament['tournament_matches'],
-                        'wins': tournament['tournament_wins'],
-                        'draws': tournament['tournament_draws'],
-                        'losses': tournament['tournament_losses'],
-                        'goals_for': tournament['tournament_goals_for'],
-                        'goals_against': tournament['tournament_goals_against'],
-                        'clean_sheets': tournament['tournament_clean_sheets'],
-                        'glove_points': tournament['tournament_glove_points'],
-                        'first_match': match_dates['first_match'] if match_dates else None,
-                        'last_match': match_dates['last_match'] if match_dates else None,
-                        'match_history': matches_with_overall
-                    })
-                
-                # Get all matches for overall rating progression
+                # Every match of the player in one ledger range scan. Guest matches
+                # (no opponent) only count towards a tournament's first/last match
+                # and start rating.
                 cursor.execute("""
-                    SELECT 
-                        pm.match_id,
-                        pm.tournament_id,
-                        pm.played_at,
-                        t.name as tournament_name,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN p2.name 
-                            ELSE p1.name 
-                        END as opponent_name,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN pm.player1_goals
-                            ELSE pm.player2_goals
-                        END as goals_for,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN pm.player2_goals
-                            ELSE pm.player1_goals
-                        END as goals_against,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN pm.player1_rating_before
-                            ELSE pm.player2_rating_before
-                        END as tournament_rating_before,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN pm.player1_rating_after
-                            ELSE pm.player2_rating_after
-                        END as tournament_rating_after,
-                        pm.winner_id,
-                        pm.is_draw,
-                        pm.is_null_match
-                    FROM player_matches pm
-                    JOIN players p1 ON pm.player1_id = p1.id
-                    JOIN players p2 ON pm.player2_id = p2.id
-                    JOIN tournaments t ON pm.tournament_id = t.id
-                    WHERE pm.player1_id = %s OR pm.player2_id = %s
-                    ORDER BY pm.played_at ASC, pm.match_id ASC
-                """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id))
-                
-                overall_matches = cursor.fetchall()
-                
-                # Calculate overall rating progression using cumulative Elo
-                # Overall rating starts at 300 and applies all rating changes sequentially
-                overall_rating_history = []
-                cumulative_overall_rating = 300  # Start from 300
-                
-                for match in overall_matches:
-                    # Calculate rating change for this match (from tournament rating changes)
-                    tournament_change = match['tournament_rating_after'] - match['tournament_rating_before']
-                    
-                    # For overall rating, we apply the change cumulatively
-                    rating_before_match = cumulative_overall_rating
-                    cumulative_overall_rating += tournament_change  # Apply the change to cumulative rating
-                    
-                    # Determine result
-                    if match['is_null_match']:
-                        result = 'NULL'
-                    elif match['is_draw']:
-                        result = 'DRAW'
-                    elif match['winner_id'] == player_id:
-                        result = 'WIN'
-                    else:
-                        result = 'LOSS'
-                    
-                    overall_rating_history.append({
-                        'match_id': match['match_id'],
-                        'tournament_name': match['tournament_name'],
-                        'opponent': match['opponent_name'],
-                        'score': f"{match['goals_for']}-{match['goals_against']}",
-                        'result': result,
-                        'rating_before': rating_before_match,
-                        'rating_after': cumulative_overall_rating,
-                        'rating_change': tournament_change,
-                        'played_at': match['played_at']
-                    })
-                
-                return {
-                    'player': player,
-                    'tournaments': tournament_breakdown,
-                    'total_tournaments': len(tournament_breakdown),
-                    'overall_rating': player['rating'],
-                    'overall_matches': player['matches_played'],
-                    'overall_rating_history': overall_rating_history
+                    SELECT l.*, opp.name as opponent_name, t.name as tournament_name
+                    FROM player_match_ledger l
+                    LEFT JOIN players opp ON opp.id = l.opponent_id
+                    JOIN tournaments t ON t.id = l.tournament_id
+                    WHERE l.player_id = %s
+                    ORDER BY l.played_at ASC, l.match_id ASC
+                """, (player_id,))
+                all_matches = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        matches_by_tournament = {}
+        overall_matches = []
+        results = {'N': 'NULL', 'D': 'DRAW', 'W': 'WIN', 'L': 'LOSS'}
+        for match in all_matches:
+            row = {
+                'match_id': match['match_id'],
+                'tournament_id': match['tournament_id'],
+                'tournament_name': match['tournament_name'],
+                'played_at': match['played_at'],
+                'is_guest': match['opponent_id'] is None,
+                'opponent_name': match['opponent_name'],
+                'goals_for': match['goals_for'],
+                'goals_against': match['goals_against'],
+                'tournament_rating_before': match['rating_before'],
+                'tournament_rating_after': match['rating_after'],
+                'result': results[match['result']],
+                'is_walkover': match['is_walkover'],
+                'player_absent': match['player_absent'],
+                'opponent_absent': match['opponent_absent']
+            }
+            matches_by_tournament.setdefault(match['tournament_id'], []).append(row)
+            if not row['is_guest']:
+                overall_matches.append(row)
+        
+        # Calculate rating contributions
+        tournament_breakdown = []
+        for tournament in tournaments:
+            tournament_matches = matches_by_tournament.get(tournament['tournament_id'], [])
+            played_dates = [m['played_at'] for m in tournament_matches if m['played_at'] is not None]
+            
+            # Rating at start of tournament (first match rating_before)
+            start_rating = tournament_matches[0]['tournament_rating_before'] if tournament_matches else 300
+            
+            # Calculate rating change in this tournament
+            current_rating = tournament['tournament_rating'] if tournament['tournament_rating'] else start_rating
+            rating_change = current_rating - start_rating
+            
+            matches_with_overall = []
+            for match in tournament_matches:
+                if match['is_guest']:
+                    continue
+                matches_with_overall.append({
+                    'match_id': match['match_id'],
+                    'played_at': match['played_at'],
+                    'opponent': match['opponent_name'],
+                    'score': f"{match['goals_for']}-{match['goals_against']}",
+                    'goals_for': match['goals_for'],
+                    'goals_against': match['goals_against'],
+                    'result': match['result'],
+                    'is_walkover': match['is_walkover'],
+                    'player_absent': match['player_absent'],
+                    'opponent_absent': match['opponent_absent'],
+                    'tournament_rating_before': match['tournament_rating_before'],
+                    'tournament_rating_after': match['tournament_rating_after'],
+                    'tournament_rating_change': match['tournament_rating_after'] - match['tournament_rating_before']
+                })
+            
+            tournament_breakdown.append({
+                'tournament_id': tournament['tournament_id'],
+                'tournament_name': tournament['tournament_name'],
+                'tournament_status': tournament['tournament_status'],
+                'tournament_rating': current_rating,
+                'start_rating': start_rating,
+                'rating_change': rating_change,
+                'matches': tournament['tournament_matches'],
+                'wins': tournament['tournament_wins'],
+                'draws': tournament['tournament_draws'],
+                'losses': tournament['tournament_losses'],
+                'goals_for': tournament['tournament_goals_for'],
+                'goals_against': tournament['tournament_goals_against'],
+                'clean_sheets': tournament['tournament_clean_sheets'],
+                'glove_points': tournament['tournament_glove_points'],
+                'first_match': min(played_dates) if played_dates else None,
+                'last_match': max(played_dates) if played_dates else None,
+                'match_history': matches_with_overall
+            })
+        
+        # Calculate overall rating progression using cumulative Elo
+        # Overall rating starts at 300 and applies all rating changes sequentially
+        overall_rating_history = []
+        cumulative_overall_rating = 300  # Start from 300
+        
+        for match in overall_matches:
+            # Calculate rating change for this match (from tournament rating changes)
+            tournament_change = match['tournament_rating_after'] - match['tournament_rating_before']
+            
+            # For overall rating, we apply the change cumulatively
+            rating_before_match = cumulative_overall_rating
+            cumulative_overall_rating += tournament_change  # Apply the change to cumulative rating
+            
+            overall_rating_history.append({
+                'match_id': match['match_id'],
+                'tournament_name': match['tournament_name'],
+                'opponent': match['opponent_name'],
+                'score': f"{match['goals_for']}-{match['goals_against']}",
+                'result': match['result'],
+                'rating_before': rating_before_match,
+                'rating_after': cumulative_overall_rating,
+                'rating_change': tournament_change,
+                'played_at': match['played_at']
+            })
+        
+        return {
+            'player': player,
+            'tournaments': tournament_breakdown,
+            'total_tournaments': len(tournament_breakdown),
+            'overall_rating': player['rating'],
+            'overall_matches': player['matches_played'],
+            'overall_rating_history': overall_rating_history
+        }
+    
+    @staticmethod
+    def _fetch_replay_matches(cursor, tournament_id=None):
+        """Load matches for replay, grouped by tournament in (played_at, match_id) order"""
+        cursor.execute(REPLAY_MATCHES_SQL, {'tournament_id': tournament_id})
+        
+        matches_by_tournament = {}
+        for row in cursor.fetchall():
+            matches_by_tournament.setdefault(row['tournament_id'], []).append(row)
+        return matches_by_tournament
+    
+    @staticmethod
+    def _load_starting_ratings(cursor, tournament_id=None):
+        """Starting tournament ratings for everyone registered in or playing in a tournament.
+
+        Same precedence as recording a match: division starting rating (division
+        tournaments) > player's initial_rating > 300.
+        """
+        cursor.execute("""
+            WITH participants AS (
+                SELECT tournament_id, player_id FROM tournament_players
+                UNION
+                SELECT tournament_id, player1_id FROM player_matches
+                UNION
+                SELECT tournament_id, player2_id FROM player_matches WHERE player2_id IS NOT NULL
+            )
+            SELECT pa.tournament_id, pa.player_id,
+                   COALESCE(
+                       CASE WHEN t.tournament_type = 'division' THEN d.starting_rating END,
+                       p.initial_rating,
+                       300
+                   ) AS starting_rating
+            FROM participants pa
+            JOIN tournaments t ON t.id = pa.tournament_id
+            JOIN players p ON p.id = pa.player_id
+            LEFT JOIN tournament_players tp
+                ON tp.tournament_id = pa.tournament_id AND tp.player_id = pa.player_id
+            LEFT JOIN divisions d ON d.id = tp.division_id
+            WHERE %(tournament_id)s::int IS NULL OR pa.tournament_id = %(tournament_id)s
+        """, {'tournament_id': tournament_id})
+        
+        starting_ratings = {}
+        for row in cursor.fetchall():
+            starting_ratings.setdefault(row['tournament_id'], {})[row['player_id']] = row['starting_rating']
+        return starting_ratings
+    
+    @staticmethod
+    def _write_tournament_replay(cursor, tournament_id, result, replace_stats=True):
+        """Persist a replay_tournament() result: match ratings and player_stats rows"""
+        TournamentDB._write_match_ratings(cursor, result.match_ratings)
+        
+        if replace_stats:
+            cursor.execute("DELETE FROM player_stats WHERE tournament_id = %s", (tournament_id,))
+        
+        TournamentDB._write_player_stats(cursor, [
+            (player_id, tournament_id, totals['tournament_rating'])
+            + tuple(totals[field] for field in rating_engine.STAT_FIELDS)
+            for player_id, totals in result.player_totals.items()
+        ])
+    
+    # Below this many rows a multi-row statement beats creating and filling a temp table
+    _COPY_MIN_ROWS = 200
+    
+    @staticmethod
+    def _write_match_ratings(cursor, match_ratings):
+        """Rewrite player_matches ratings from (id, p1 before, p2 before, p1 after, p2 after) tuples.
+
+        Large rewrites are COPYed into a session temp table and applied with a
+        single UPDATE ... FROM, so the cost is one round trip and one
+        statement regardless of the number of matches.
+        """
+        match_ratings = list(match_ratings)
+        if not match_ratings:
+            return
+        if len(match_ratings) < TournamentDB._COPY_MIN_ROWS:
+            execute_values(cursor, """
+                UPDATE player_matches AS pm SET
+                    player1_rating_before = v.player1_rating_before,
+                    player2_rating_before = v.player2_rating_before,
+                    player1_rating_after = v.player1_rating_after,
+                    player2_rating_after = v.player2_rating_after
+                FROM (VALUES %s) AS v(id, player1_rating_before, player2_rating_before,
+                                      player1_rating_after, player2_rating_after)
+                WHERE pm.id = v.id
+            """, match_ratings, page_size=1000)
+            return
+        
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS replay_match_ratings (
+                id INTEGER PRIMARY KEY,
+                player1_rating_before INTEGER,
+                player2_rating_before INTEGER,
+                player1_rating_after INTEGER,
+                player2_rating_after INTEGER
+            ) ON COMMIT DELETE ROWS
+        """)
+        cursor.execute("TRUNCATE replay_match_ratings")
+        TournamentDB._copy_rows(
+            cursor, 'replay_match_ratings',
+            ('id', 'player1_rating_before', 'player2_rating_before', 'player1_rating_after', 'player2_rating_after'),
+            match_ratings
+        )
+        cursor.execute("""
+            UPDATE player_matches AS pm SET
+                player1_rating_before = v.player1_rating_before,
+                player2_rating_before = v.player2_rating_before,
+                player1_rating_after = v.player1_rating_after,
+                player2_rating_after = v.player2_rating_after
+            FROM replay_match_ratings AS v
+            WHERE pm.id = v.id
+        """)
+    
+    @staticmethod
+    def _write_player_stats(cursor, rows):
+        """Insert player_stats rows (player_id, tournament_id, tournament_rating, *STAT_FIELDS).
+
+        The caller must have cleared the rows being replaced.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        columns = ('player_id', 'tournament_id', 'tournament_rating') + rating_engine.STAT_FIELDS
+        if len(rows) < TournamentDB._COPY_MIN_ROWS:
+            execute_values(cursor, f"INSERT INTO player_stats ({', '.join(columns)}) VALUES %s",
+                           rows, page_size=1000)
+        else:
+            TournamentDB._copy_rows(cursor, 'player_stats', columns, rows)
+    
+    # Position of a match in replay order (played_at ASC NULLS LAST, match_id ASC):
+    # true when the row aliased "{alias}" comes strictly before it
+    _BEFORE_POSITION_SQL = """
+        COALESCE(
+            ({alias}.played_at IS NOT NULL AND %(played_at)s::timestamp IS NULL)
+            OR {alias}.played_at < %(played_at)s::timestamp
+            OR ({alias}.played_at IS NOT DISTINCT FROM %(played_at)s::timestamp
+                AND {alias}.match_id < %(match_id)s),
+            FALSE
+        )
+    """
+    
+    # Matches of player_matches pm strictly after (played_at, match_id): the
+    # replay suffix that follows a checkpoint
+    _AFTER_POSITION_SQL = "NOT " + _BEFORE_POSITION_SQL.format(alias='pm') + \
+        " AND NOT (pm.played_at IS NOT DISTINCT FROM %(played_at)s::timestamp AND pm.match_id = %(match_id)s)"
+    
+    @staticmethod
+    def _load_checkpoint(cursor, tournament_id, played_at=None, match_id=None, as_of=None):
+        """Latest checkpoint before a match position, or taken no later than as_of.
+
+        With neither, the tournament's latest checkpoint. Returns the row with
+        its state decoded (player ids back to ints), or None when the
+        tournament has no usable checkpoint.
+        """
+        if as_of is not None:
+            cursor.execute("""
+                SELECT * FROM rating_checkpoints
+                WHERE tournament_id = %s AND played_at <= %s
+                ORDER BY match_count DESC LIMIT 1
+            """, (tournament_id, as_of))
+        elif match_id is None:
+            cursor.execute("""
+                SELECT * FROM rating_checkpoints
+                WHERE tournament_id = %s
+                ORDER BY match_count DESC LIMIT 1
+            """, (tournament_id,))
+        else:
+            before = TournamentDB._BEFORE_POSITION_SQL.format(alias='c')
+            cursor.execute(f"""
+                SELECT * FROM rating_checkpoints c
+                WHERE c.tournament_id = %(tournament_id)s AND {before}
+                ORDER BY c.match_count DESC LIMIT 1
+            """, {'tournament_id': tournament_id, 'played_at': played_at, 'match_id': match_id})
+        checkpoint = cursor.fetchone()
+        if not checkpoint:
+            return None
+        checkpoint = dict(checkpoint)
+        state = checkpoint['state']
+        checkpoint['state'] = {
+            'ratings': {int(player_id): rating for player_id, rating in state['ratings'].items()},
+            'totals': {
+                int(player_id): dict(zip(('tournament_rating',) + rating_engine.STAT_FIELDS, values))
+                for player_id, values in state['totals'].items()
+            }
+        }
+        return checkpoint
+    
+    @staticmethod
+    def _write_checkpoints(cursor, tournament_id, snapshots):
+        """Store rating_engine.checkpoint_states() snapshots for a tournament"""
+        if not snapshots:
+            return
+        execute_values(cursor, """
+            INSERT INTO rating_checkpoints (tournament_id, match_count, played_at, match_id, state)
+            VALUES %s
+            ON CONFLICT (tournament_id, match_count) DO UPDATE SET
+                played_at = EXCLUDED.played_at, match_id = EXCLUDED.match_id, state = EXCLUDED.state
+        """, [
+            (tournament_id, match_count, match['played_at'], match['match_id'], json.dumps({
+                'ratings': state['ratings'],
+                'totals': {
+                    player_id: [totals['tournament_rating']] + [totals[field] for field in rating_engine.STAT_FIELDS]
+                    for player_id, totals in state['totals'].items()
                 }
+            }))
+            for match_count, match, state in snapshots
+        ], page_size=200)
+    
+    @staticmethod
+    def _rebuild_checkpoints(cursor, tournament_id, matches, match_ratings):
+        """Replace a tournament's checkpoints after a full replay"""
+        cursor.execute("DELETE FROM rating_checkpoints WHERE tournament_id = %s", (tournament_id,))
+        TournamentDB._write_checkpoints(
+            cursor, tournament_id, rating_engine.checkpoint_states(matches, match_ratings)
+        )
+    
+    @staticmethod
+    def _extend_checkpoints(cursor, tournament_ids):
+        """Append the checkpoints that newly recorded matches complete.
+
+        Recording only adds matches at the end of the replay order, so once
+        CHECKPOINT_INTERVAL matches follow a tournament's latest checkpoint
+        they are replayed from it and the new snapshots are stored. A
+        tournament without checkpoints is replayed from its first match once.
+        """
+        for tournament_id in tournament_ids:
+            checkpoint = TournamentDB._load_checkpoint(cursor, tournament_id)
+            position = {'tournament_id': tournament_id}
+            if checkpoint:
+                position.update(played_at=checkpoint['played_at'], match_id=checkpoint['match_id'])
+            after = 'AND ' + TournamentDB._AFTER_POSITION_SQL if checkpoint else ''
+            
+            cursor.execute(f"""
+                SELECT COUNT(*) AS pending FROM player_matches pm
+                WHERE pm.tournament_id = %(tournament_id)s {after}
+            """, position)
+            if cursor.fetchone()['pending'] < rating_engine.CHECKPOINT_INTERVAL:
+                continue
+            
+            cursor.execute(f"""
+                SELECT id, match_id, tournament_id, played_at, player1_id, player2_id,
+                       player1_goals, player2_goals, winner_id, is_draw,
+                       is_walkover, is_null_match, player1_absent, player2_absent
+                FROM player_matches pm
+                WHERE pm.tournament_id = %(tournament_id)s {after}
+                ORDER BY pm.played_at ASC NULLS LAST, pm.match_id ASC
+            """, position)
+            matches = cursor.fetchall()
+            
+            starting_ratings = TournamentDB._load_starting_ratings(cursor, tournament_id).get(tournament_id, {})
+            state = checkpoint['state'] if checkpoint else rating_engine.new_state()
+            result, _ = rating_engine.replay_from_state(matches, starting_ratings, state)
+            TournamentDB._write_checkpoints(cursor, tournament_id, rating_engine.checkpoint_states(
+                matches, result.match_ratings, state=state,
+                match_count=checkpoint['match_count'] if checkpoint else 0
+            ))
+    
+    @staticmethod
+    def _replay_tournament_from(cursor, tournament_id, played_at, match_id):
+        """Re-rate a tournament from one position in its match order forward.
+
+        The replay resumes from the latest checkpoint before (played_at,
+        match_id), so at most CHECKPOINT_INTERVAL unchanged matches are
+        replayed on top of the changed suffix. Only rows whose ratings changed
+        are rewritten, checkpoints from the position on are rebuilt, and the
+        tournament's player_stats are re-aggregated from its matches.
+        Returns the ids of the players whose ratings or stats may have changed.
+        """
+        checkpoint = TournamentDB._load_checkpoint(cursor, tournament_id, played_at, match_id)
+        if checkpoint:
+            resume = {'tournament_id': tournament_id, 'played_at': checkpoint['played_at'],
+                      'match_id': checkpoint['match_id']}
+            cursor.execute("DELETE FROM rating_checkpoints WHERE tournament_id = %s AND match_count > %s",
+                           (tournament_id, checkpoint['match_count']))
+        else:
+            resume = {'tournament_id': tournament_id, 'played_at': None, 'match_id': None}
+            cursor.execute("DELETE FROM rating_checkpoints WHERE tournament_id = %s", (tournament_id,))
+        
+        cursor.execute(f"""
+            SELECT id, match_id, tournament_id, played_at, player1_id, player2_id,
+                   player1_goals, player2_goals, winner_id, is_draw,
+                   is_walkover, is_null_match, player1_absent, player2_absent,
+                   player1_rating_before, player2_rating_before,
+                   player1_rating_after, player2_rating_after
+            FROM player_matches pm
+            WHERE pm.tournament_id = %(tournament_id)s
+              {'AND ' + TournamentDB._AFTER_POSITION_SQL if checkpoint else ''}
+            ORDER BY pm.played_at ASC NULLS LAST, pm.match_id ASC
+        """, resume)
+        matches = cursor.fetchall()
+        
+        starting_ratings = TournamentDB._load_starting_ratings(cursor, tournament_id).get(tournament_id, {})
+        state = checkpoint['state'] if checkpoint else rating_engine.new_state()
+        result, _ = rating_engine.replay_from_state(matches, starting_ratings, state)
+        
+        stored = {
+            match['id']: (match['id'], match['player1_rating_before'], match['player2_rating_before'],
+                          match['player1_rating_after'], match['player2_rating_after'])
+            for match in matches
+        }
+        TournamentDB._write_match_ratings(
+            cursor, [ratings for ratings in result.match_ratings if stored[ratings[0]] != tuple(ratings)]
+        )
+        TournamentDB._write_checkpoints(cursor, tournament_id, rating_engine.checkpoint_states(
+            matches, result.match_ratings, state=state,
+            match_count=checkpoint['match_count'] if checkpoint else 0
+        ))
+        TournamentDB._refresh_tournament_stats(cursor, tournament_id)
+        
+        return {player_id for match in matches for player_id in (match['player1_id'], match['player2_id'])
+                if player_id is not None}
+    
+    @staticmethod
+    def _refresh_tournament_stats(cursor, tournament_id):
+        """Rebuild a tournament's player_stats from its matches in one statement.
+
+        Same rules as rating_engine.match_stats: null matches count for
+        nothing, walkovers only for the result, and tournament_rating is the
+        rating after the player's last non-null match.
+        """
+        cursor.execute("DELETE FROM player_stats WHERE tournament_id = %s", (tournament_id,))
+        cursor.execute("""
+            WITH sides AS (
+                SELECT s.player_id, pm.played_at, pm.match_id, s.rating_after,
+                       COALESCE(pm.is_walkover, FALSE) AS is_walkover,
+                       COALESCE(pm.is_draw, FALSE) AS is_draw,
+                       pm.winner_id IS NOT DISTINCT FROM s.player_id AS is_winner,
+                       COALESCE(s.goals_for, 0) AS goals_for,
+                       COALESCE(s.goals_against, 0) AS goals_against
+                FROM player_matches pm
+                CROSS JOIN LATERAL (VALUES
+                    (pm.player1_id, pm.player1_rating_after, pm.player1_goals, pm.player2_goals),
+                    (pm.player2_id, pm.player2_rating_after, pm.player2_goals, pm.player1_goals)
+                ) AS s(player_id, rating_after, goals_for, goals_against)
+                WHERE pm.tournament_id = %(tournament_id)s
+                  AND s.player_id IS NOT NULL
+                  AND NOT COALESCE(pm.is_null_match, FALSE)
+            )
+            INSERT INTO player_stats
+                (player_id, tournament_id, tournament_rating, matches_played, wins, draws, losses,
+                 goals_scored, goals_conceded, clean_sheets, golden_glove_points)
+            SELECT player_id, %(tournament_id)s,
+                   (ARRAY_AGG(rating_after ORDER BY played_at DESC NULLS FIRST, match_id DESC))[1],
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE is_winner),
+                   COUNT(*) FILTER (WHERE is_draw),
+                   COUNT(*) FILTER (WHERE NOT is_winner AND NOT is_draw),
+                   COALESCE(SUM(goals_for) FILTER (WHERE NOT is_walkover), 0),
+                   COALESCE(SUM(goals_against) FILTER (WHERE NOT is_walkover), 0),
+                   COUNT(*) FILTER (WHERE NOT is_walkover AND goals_against = 0),
+                   COALESCE(SUM(
+                       CASE WHEN goals_against = 0 THEN 5 ELSE 0 END
+                       + CASE WHEN is_winner THEN 2 ELSE 0 END
+                       - goals_against
+                   ) FILTER (WHERE NOT is_walkover), 0)
+            FROM sides
+            GROUP BY player_id
+        """, {'tournament_id': tournament_id})
+    
+    @staticmethod
+    def _finish_partial_replay(cursor, tournament_id, player_ids):
+        """Refresh everything derived from a tournament's ratings after a partial replay"""
+        player_ids = {player_id for player_id in player_ids if player_id is not None}
+        TournamentDB._refresh_overall_stats(cursor, player_ids)
+        TournamentDB._refresh_award_standings(cursor, [tournament_id])
+        TournamentDB._bump_data_versions(cursor, [tournament_id], player_ids)
+    
+    @staticmethod
+    def _copy_rows(cursor, table, columns, rows):
+        """Stream rows into a table with COPY (text format, NULL as \\N)"""
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join('\\N' if value is None else str(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    
+    @staticmethod
+    def _copy_tournament_replays(cursor, results):
+        """Persist many replay_tournament() results at once.
+
+        All match ratings go through one _write_match_ratings() call and all
+        player_stats rows through one _write_player_stats() call, so the
+        caller must have cleared the affected tournaments' stats first.
+        """
+        TournamentDB._write_match_ratings(
+            cursor, [row for result in results.values() for row in result.match_ratings]
+        )
+        TournamentDB._write_player_stats(cursor, [
+            (player_id, tournament_id, totals['tournament_rating'])
+            + tuple(totals[field] for field in rating_engine.STAT_FIELDS)
+            for tournament_id, result in results.items()
+            for player_id, totals in result.player_totals.items()
+        ])
+    
+    @staticmethod
+    def _refresh_overall_stats(cursor, player_ids=None):
+        """Rebuild overall rating and career stats from player_matches in one statement.
+
+        Covers the given players, or every player when player_ids is None.
+        Each match is unpivoted into one row per player; the overall rating is
+        the first match's rating_before plus every tournament rating change,
+        clamped to 0-1000 (same rules as rating_engine.overall_totals).
+        Players without matches get a NULL rating and zeroed stats.
+        Returns the number of players written.
+        """
+        if player_ids is not None:
+            player_ids = list(player_ids)
+            if not player_ids:
+                return 0
+        
+        cursor.execute("""
+            WITH target AS (
+                SELECT id FROM players
+                WHERE %(player_ids)s::int[] IS NULL OR id = ANY(%(player_ids)s::int[])
+            ),
+            sides AS (
+                SELECT s.player_id, pm.played_at, pm.match_id, pm.winner_id,
+                       COALESCE(pm.is_null_match, FALSE) AS is_null_match,
+                       COALESCE(pm.is_walkover, FALSE) AS is_walkover,
+                       COALESCE(pm.is_draw, FALSE) AS is_draw,
+                       s.rating_before, s.rating_after,
+                       COALESCE(s.goals_for, 0) AS goals_for,
+                       COALESCE(s.goals_against, 0) AS goals_against
+                FROM player_matches pm
+                CROSS JOIN LATERAL (VALUES
+                    (pm.player1_id, pm.player1_rating_before, pm.player1_rating_after,
+                     pm.player1_goals, pm.player2_goals),
+                    (pm.player2_id, pm.player2_rating_before, pm.player2_rating_after,
+                     pm.player2_goals, pm.player1_goals)
+                ) AS s(player_id, rating_before, rating_after, goals_for, goals_against)
+                WHERE s.player_id IN (SELECT id FROM target)
+            ),
+            ordered AS (
+                SELECT sides.*,
+                       FIRST_VALUE(rating_before) OVER (
+                           PARTITION BY player_id ORDER BY played_at ASC NULLS LAST, match_id ASC
+                       ) AS first_rating
+                FROM sides
+            ),
+            totals AS (
+                SELECT player_id,
+                       MIN(first_rating) + SUM(rating_after - rating_before) AS rating,
+                       COUNT(*) FILTER (WHERE NOT is_null_match) AS matches_played,
+                       COUNT(*) FILTER (WHERE NOT is_null_match AND winner_id = player_id) AS wins,
+                       COUNT(*) FILTER (WHERE NOT is_null_match AND is_draw) AS draws,
+                       COUNT(*) FILTER (WHERE NOT is_null_match AND NOT is_draw
+                                        AND winner_id IS DISTINCT FROM player_id) AS losses,
+                       COALESCE(SUM(goals_for) FILTER (WHERE NOT is_null_match AND NOT is_walkover), 0) AS goals_scored,
+                       COALESCE(SUM(goals_against) FILTER (WHERE NOT is_null_match AND NOT is_walkover), 0) AS goals_conceded,
+                       COUNT(*) FILTER (WHERE NOT is_null_match AND NOT is_walkover AND goals_against = 0) AS clean_sheets,
+                       COALESCE(SUM(
+                           CASE WHEN goals_against = 0 THEN 5 ELSE 0 END
+                           + CASE WHEN winner_id = player_id THEN 2 ELSE 0 END
+                           - goals_against
+                       ) FILTER (WHERE NOT is_null_match AND NOT is_walkover), 0) AS golden_glove_points
+                FROM ordered
+                GROUP BY player_id
+            )
+            UPDATE players SET
+                rating = CASE WHEN t.player_id IS NULL THEN NULL
+                              ELSE GREATEST(%(min_rating)s, LEAST(%(max_rating)s, t.rating)) END,
+                matches_played = COALESCE(t.matches_played, 0),
+                matches_won = COALESCE(t.wins, 0),
+                matches_drawn = COALESCE(t.draws, 0),
+                matches_lost = COALESCE(t.losses, 0),
+                goals_scored = COALESCE(t.goals_scored, 0),
+                goals_conceded = COALESCE(t.goals_conceded, 0),
+                clean_sheets = COALESCE(t.clean_sheets, 0),
+                golden_glove_points = COALESCE(t.golden_glove_points, 0)
+            FROM target
+            LEFT JOIN totals t ON t.player_id = target.id
+            WHERE players.id = target.id
+        """, {
+            'player_ids': player_ids,
+            'min_rating': rating_engine.MIN_RATING,
+            'max_rating': rating_engine.MAX_RATING
+        })
+        return cursor.rowcount
+    
+    @staticmethod
+    def _refresh_award_standings(cursor, tournament_ids=(), overall=True):
+        """Re-rank award_standings for the overall scope and the given tournaments.
+
+        tournament_ids=None re-ranks every tournament. Call it in the same
+        transaction as any write that changes players or player_stats totals
+        so award lookups never see stale rankings.
+        """
+        all_tournaments = tournament_ids is None
+        params = {
+            'overall': overall,
+            'all_tournaments': all_tournaments,
+            'tournament_ids': [] if all_tournaments else list(tournament_ids),
+            'overall_scope': OVERALL_AWARD_SCOPE
+        }
+        
+        cursor.execute("""
+            DELETE FROM award_standings
+            WHERE (%(overall)s AND tournament_id = %(overall_scope)s)
+               OR (tournament_id <> %(overall_scope)s
+                   AND (%(all_tournaments)s OR tournament_id = ANY(%(tournament_ids)s::int[])))
+        """, params)
+        
+        # Same qualification rules and ordering as the public award tables;
+        # player_id breaks remaining ties so ranks are stable
+        cursor.execute("""
+            WITH source AS (
+                SELECT %(overall_scope)s AS tournament_id, p.id AS player_id, p.rating,
+                       p.matches_played, p.matches_won AS wins, p.goals_scored,
+                       p.goals_conceded, p.golden_glove_points
+                FROM players p
+                WHERE %(overall)s
+                UNION ALL
+                SELECT ps.tournament_id, ps.player_id, ps.tournament_rating,
+                       ps.matches_played, ps.wins, ps.goals_scored,
+                       ps.goals_conceded, ps.golden_glove_points
+                FROM player_stats ps
+                WHERE %(all_tournaments)s OR ps.tournament_id = ANY(%(tournament_ids)s::int[])
+            ),
+            scored AS (
+                SELECT source.*,
+                       CASE WHEN matches_played > 0
+                            THEN ROUND((wins * 100.0 / matches_played), 1)
+                            ELSE 0 END AS win_percentage,
+                       ROUND(goals_scored::decimal / GREATEST(matches_played, 1), 2) AS goals_per_match,
+                       ROUND(goals_conceded::decimal / GREATEST(matches_played, 1), 2) AS goals_conceded_per_match,
+                       ROUND(golden_glove_points::decimal / GREATEST(matches_played, 1), 2) AS points_per_match
+                FROM source
+            )
+            INSERT INTO award_standings (tournament_id, award, rank, player_id)
+            SELECT tournament_id, 'golden_ball', ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY rating DESC, win_percentage DESC, matches_played DESC, player_id), player_id
+            FROM scored
+            WHERE tournament_id = %(overall_scope)s AND matches_played >= 5
+            UNION ALL
+            SELECT tournament_id, 'golden_ball', ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY win_percentage DESC, goals_scored DESC, goals_conceded ASC, player_id), player_id
+            FROM scored
+            WHERE tournament_id <> %(overall_scope)s AND matches_played >= 3
+            UNION ALL
+            SELECT tournament_id, 'golden_boot', ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY goals_scored DESC, goals_per_match DESC, player_id), player_id
+            FROM scored
+            WHERE matches_played > 0
+            UNION ALL
+            SELECT tournament_id, 'golden_glove', ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY goals_conceded_per_match ASC, goals_conceded ASC, player_id), player_id
+            FROM scored
+            WHERE matches_played >= 10
+            UNION ALL
+            SELECT tournament_id, 'golden_glove_points', ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY golden_glove_points DESC, points_per_match DESC, player_id), player_id
+            FROM scored
+            WHERE matches_played >= 4
+        """, params)
+    
+    @staticmethod
+    def _bump_data_versions(cursor, tournament_ids=(), player_ids=(), related=False, everything=False):
+        """Advance the global data version and those of the given tournaments and players.
+
+        Call inside the write's transaction so the stamps commit (or roll back)
+        with it. related=True also bumps the players of the tournaments and the
+        opponents and tournaments of the players, whose pages show their names.
+        everything=True bumps every tournament and player.
+        """
+        params = {
+            'tournaments': [t_id for t_id in tournament_ids or () if t_id is not None],
+            'players': [p_id for p_id in player_ids or () if p_id is not None]
+        }
+        targets = [
+            "SELECT 'global', 0",
+            "SELECT 'tournament', unnest(%(tournaments)s::int[])",
+            "SELECT 'player', unnest(%(players)s::int[])"
+        ]
+        if related:
+            targets += [
+                "SELECT 'player', player_id FROM tournament_players WHERE tournament_id = ANY(%(tournaments)s)",
+                "SELECT 'player', player1_id FROM player_matches WHERE tournament_id = ANY(%(tournaments)s)",
+                "SELECT 'player', player2_id FROM player_matches WHERE tournament_id = ANY(%(tournaments)s) AND player2_id IS NOT NULL",
+                "SELECT 'player', player1_id FROM player_matches WHERE player2_id = ANY(%(players)s)",
+                "SELECT 'player', player2_id FROM player_matches WHERE player1_id = ANY(%(players)s) AND player2_id IS NOT NULL",
+                "SELECT 'tournament', tournament_id FROM tournament_players WHERE player_id = ANY(%(players)s)",
+                "SELECT 'tournament', tournament_id FROM player_matches WHERE player1_id = ANY(%(players)s) OR player2_id = ANY(%(players)s)"
+            ]
+        if everything:
+            targets += ["SELECT 'tournament', id FROM tournaments", "SELECT 'player', id FROM players"]
+        # Rows are locked in (scope, scope_id) order so concurrent writers cannot deadlock
+        cursor.execute(f"""
+            WITH targets(scope, scope_id) AS ({' UNION '.join(targets)})
+            INSERT INTO data_versions (scope, scope_id, version, updated_at)
+            SELECT scope, scope_id, 1, CURRENT_TIMESTAMP FROM targets
+            ORDER BY scope, scope_id
+            ON CONFLICT (scope, scope_id) DO UPDATE
+            SET version = data_versions.version + 1, updated_at = EXCLUDED.updated_at
+        """, params)
+    
+    @staticmethod
+    def get_data_version(scope='global', scope_id=0):
+        """Current data version of the whole site, a tournament or a player (0 if never written)"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT version FROM data_versions WHERE scope = %s AND scope_id = %s",
+                    (scope, scope_id)
+                )
+                row = cursor.fetchone()
+                return row['version'] if row else 0
         finally:
             conn.close()
     
     @staticmethod
-    def recalculate_all_ratings():
-        """Recalculate all player ratings and stats by replaying ALL tournaments.
-        Uses tournament-specific ratings for each tournament, then calculates cumulative overall ratings.
-        Optimized to prevent hanging on large datasets.
+    def get_player_page_version(player_id):
+        """Everything a public player profile depends on, as a version string.
+
+        Besides the player's own version this covers the two parts of the page
+        that other players' matches can change: the overall rank and the awards.
         """
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                print("Step 1: Resetting player stats...")
-                # 1) Reset all players to initial state
                 cursor.execute("""
-                    UPDATE players SET
-                        rating = 300,
-                        matches_played = 0,
-                        matches_won = 0,
-                        matches_drawn = 0,
-                        matches_lost = 0,
-                        goals_scored = 0,
-                        goals_conceded = 0,
-                        clean_sheets = 0,
-                        golden_glove_points = 0
-                """)
-                conn.commit()
-                print("  ✓ Players reset")
+                    SELECT
+                        COALESCE(dv.version, 0) as version,
+                        (SELECT COUNT(*) FROM players o
+                         WHERE p.rating IS NOT NULL AND o.rating IS NOT NULL
+                           AND (o.rating, o.matches_won, o.goals_scored) > (p.rating, p.matches_won, p.goals_scored)
+                        ) as players_ahead,
+                        (SELECT string_agg(award || '@' || tournament_id, ',' ORDER BY award, tournament_id)
+                         FROM award_standings WHERE player_id = p.id AND rank = 1) as awards
+                    FROM players p
+                    LEFT JOIN data_versions dv ON dv.scope = 'player' AND dv.scope_id = p.id
+                    WHERE p.id = %s
+                """, (player_id,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                return f"{row['version']}.{row['players_ahead']}.{row['awards'] or ''}"
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @invalidates_reads
+    def recalculate_all_ratings(parallel=False, max_workers=None, progress=None):
+        """Recalculate all player ratings and stats by replaying ALL tournaments.
+        Each tournament is replayed in memory with its own tournament ratings,
+        then cumulative overall ratings are rebuilt from the replayed matches.
+
+        With parallel=True tournaments are replayed across a process pool
+        (max_workers processes, default one per CPU). Either way the results
+        are written back in one COPY-based pass.
+
+        progress(event), if given, receives a start event and a status event
+        per replayed tournament and write step (see run_recalculation_job).
+        """
+        emit = progress or (lambda event: None)
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                print("Step 1: Loading matches and starting ratings...")
+                matches_by_tournament = TournamentDB._fetch_replay_matches(cursor)
+                starting_ratings = TournamentDB._load_starting_ratings(cursor)
+                total_matches = sum(len(matches) for matches in matches_by_tournament.values())
+                print(f"  ✓ {total_matches} matches in {len(matches_by_tournament)} tournaments")
+                emit({'type': 'start', 'total': total_matches, 'initial_ratings': {}})
                 
                 print("\nStep 2: Clearing tournament stats...")
-                # 2) Clear tournament-specific aggregates
                 cursor.execute("DELETE FROM player_stats")
-                conn.commit()
-                print("  ✓ Tournament stats cleared")
-                
-                print("\nStep 3: Fetching tournaments...")
-                # 3) Get all tournaments in chronological order
-                cursor.execute("""
-                    SELECT id, tournament_type FROM tournaments
-                    ORDER BY created_at ASC, id ASC
-                """)
-                tournaments = cursor.fetchall()
-                print(f"  ✓ Found {len(tournaments)} tournaments")
-                
-                # Pre-fetch division data to avoid repeated queries
-                cursor.execute("""
-                    SELECT id, starting_rating FROM divisions
-                """)
-                divisions_data = {row['id']: row['starting_rating'] for row in cursor.fetchall()}
+                cursor.execute("DELETE FROM rating_checkpoints")
+                print("  ✓ Tournament stats and checkpoints cleared")
                 
-                print("\nStep 4: Processing tournaments...")
-                # 4) Process each tournament separately
-                for idx, tournament in enumerate(tournaments):
-                    t_id = tournament['id']
-                    is_division = tournament.get('tournament_type') == 'division'
-                    print(f"\nTournament {idx+1}/{len(tournaments)} (ID: {t_id})...")
-                    
-                    # Get all players in this tournament with their divisions
-                    cursor.execute("""
-                        SELECT player_id, division_id FROM tournament_players
-                        WHERE tournament_id = %s
-                    """, (t_id,))
-                    tournament_players = cursor.fetchall()
-                    
-                    # Initialize tournament ratings for each player (using pre-fetched division data)
-                    tournament_ratings = {}
-                    for tp in tournament_players:
-                        player_id = tp['player_id']
-                        if is_division and tp['division_id'] and tp['division_id'] in divisions_data:
-                            tournament_ratings[player_id] = divisions_data[tp['division_id']]
-                        else:
-                            tournament_ratings[player_id] = 300
-                    
-                    # Get all matches for this tournament
-                    cursor.execute("""
-                        SELECT * FROM player_matches
-                        WHERE tournament_id = %s
-                        ORDER BY played_at ASC NULLS LAST, match_id ASC
-                    """, (t_id,))
-                    matches = cursor.fetchall()
-                    print(f"  - {len(matches)} matches to process")
+                print("\nStep 3: Replaying tournaments...")
+                if parallel:
+                    done = []
                     
-                    # Prepare batch data structures
-                    match_updates = []
-                    player_stats_cache = {}
+                    def report(t_id, result):
+                        done.append(t_id)
+                        print(f"  ✓ Tournament {len(done)}/{len(matches_by_tournament)} (ID: {t_id}): "
+                              f"{len(result.match_ratings)} matches")
+                        emit({'type': 'status', 'message': f"Replayed tournament {len(done)}/{len(matches_by_tournament)}"})
                     
-                    # Process each match in this tournament
-                    for match_idx, m in enumerate(matches):
-                        # Show progress every 100 matches
-                        if match_idx > 0 and match_idx % 100 == 0:
-                            print(f"    Progress: {match_idx}/{len(matches)} matches...")
-                        
-                        p1 = m['player1_id']
-                        p2 = m['player2_id']
-                        g1 = m['player1_goals']
-                        g2 = m['player2_goals']
-                        is_walkover = m.get('is_walkover', False)
-                        is_null = m.get('is_null_match', False)
-                        p1_absent = m.get('player1_absent', False)
-                        p2_absent = m.get('player2_absent', False)
-                        winner_id = m.get('winner_id')
-                        is_draw = m.get('is_draw', False)
-                        
-                        # Get tournament ratings before this match
-                        t_r1_before = tournament_ratings.get(p1, 300)
-                        t_r2_before = tournament_ratings.get(p2, 300)
-                        
-                        # Calculate rating changes based on match type
-                        if is_null:
-                            NULL_PENALTY = 15
-                            t_r1_after = max(0, min(1000, t_r1_before - NULL_PENALTY))
-                            t_r2_after = max(0, min(1000, t_r2_before - NULL_PENALTY))
-                        elif is_walkover:
-                            if winner_id == p1:
-                                change_w, change_l = TournamentDB.calculate_rating_change(t_r1_before, t_r2_before, is_draw=False)
-                                t_change1 = int(change_w * 0.75)
-                                t_change2 = int(change_l * 0.75)
-                            else:
-                                change_w, change_l = TournamentDB.calculate_rating_change(t_r2_before, t_r1_before, is_draw=False)
-                                t_change2 = int(change_w * 0.75)
-                                t_change1 = int(change_l * 0.75)
-                            t_r1_after = max(0, min(1000, t_r1_before + t_change1))
-                            t_r2_after = max(0, min(1000, t_r2_before + t_change2))
-                        else:
-                            t_change1, t_change2 = TournamentDB.calculate_enhanced_rating_change(
-                                t_r1_before, t_r2_before, g1, g2, p1_absent, p2_absent
-                            )
-                            t_r1_after = max(0, min(1000, t_r1_before + t_change1))
-                            t_r2_after = max(0, min(1000, t_r2_before + t_change2))
-                        
-                        # Update tournament ratings
-                        tournament_ratings[p1] = t_r1_after
-                        tournament_ratings[p2] = t_r2_after
-                        
-                        # Store match update for batch processing
-                        match_updates.append((t_r1_before, t_r2_before, t_r1_after, t_r2_after, m['id']))
-                        
-                        # Update player stats cache (only if not null match)
-                        if not is_null:
-                            for pid, t_rating_after, won, drawn, lost, gf, ga in [
-                                (p1, t_r1_after, 1 if winner_id == p1 else 0, 1 if is_draw else 0, 1 if winner_id == p2 else 0, g1, g2),
-                                (p2, t_r2_after, 1 if winner_id == p2 else 0, 1 if is_draw else 0, 1 if winner_id == p1 else 0, g2, g1)
-                            ]:
-                                # Calculate golden glove points
-                                glove_points = 0
-                                if not is_walkover:
-                                    glove_points = TournamentDB.calculate_golden_glove_points(
-                                        gf, ga, winner_id == pid, is_draw
-                                    )
-                                
-                                # Accumulate stats in cache
-                                if pid not in player_stats_cache:
-                                    player_stats_cache[pid] = {
-                                        'rating': t_rating_after,
-                                        'matches': 0, 'wins': 0, 'draws': 0, 'losses': 0,
-                                        'gf': 0, 'ga': 0, 'cs': 0, 'glove': 0
-                                    }
-                                
-                                player_stats_cache[pid]['rating'] = t_rating_after
-                                player_stats_cache[pid]['matches'] += 1
-                                player_stats_cache[pid]['wins'] += won
-                                player_stats_cache[pid]['draws'] += drawn
-                                player_stats_cache[pid]['losses'] += lost
-                                player_stats_cache[pid]['gf'] += gf
-                                player_stats_cache[pid]['ga'] += ga
-                                player_stats_cache[pid]['cs'] += (1 if ga == 0 else 0)
-                                player_stats_cache[pid]['glove'] += glove_points
-                        
-                        # Commit every 200 matches to prevent timeout
-                        if (match_idx + 1) % 200 == 0:
-                            # Execute batch updates for matches
-                            cursor.executemany("""
-                                UPDATE player_matches SET
-                                    player1_rating_before = %s,
-                                    player2_rating_before = %s,
-                                    player1_rating_after = %s,
-                                    player2_rating_after = %s
-                                WHERE id = %s
-                            """, match_updates)
-                            match_updates = []
-                            conn.commit()
-                    
-                    # Final batch update for remaining matches
-                    if match_updates:
-                        print(f"    Updating match ratings...")
-                        cursor.executemany("""
-                            UPDATE player_matches SET
-                                player1_rating_before = %s,
-                                player2_rating_before = %s,
-                                player1_rating_after = %s,
-                                player2_rating_after = %s
-                            WHERE id = %s
-                        """, match_updates)
-                    
-                    # Update player_stats from cache
-                    print(f"    Updating player stats for {len(player_stats_cache)} players...")
-                    for pid, stats in player_stats_cache.items():
-                        cursor.execute("""
-                            INSERT INTO player_stats
-                                (player_id, tournament_id, tournament_rating, matches_played, wins, draws, losses, 
-                                 goals_scored, goals_conceded, clean_sheets, golden_glove_points)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (player_id, tournament_id)
-                            DO UPDATE SET
-                                tournament_rating = %s,
-                                matches_played = %s,
-                                wins = %s,
-                                draws = %s,
-                                losses = %s,
-                                goals_scored = %s,
-                                goals_conceded = %s,
-                                clean_sheets = %s,
-                                golden_glove_points = %s
-                        """, (pid, t_id, stats['rating'], stats['matches'], stats['wins'], stats['draws'], stats['losses'],
-                              stats['gf'], stats['ga'], stats['cs'], stats['glove'],
-                              stats['rating'], stats['matches'], stats['wins'], stats['draws'], stats['losses'],
-                              stats['gf'], stats['ga'], stats['cs'], stats['glove']))
-                    
-                    # Commit after each tournament to prevent timeout
-                    conn.commit()
-                    print(f"  ✓ Tournament {idx+1} complete")
-                
-                # After processing all tournaments, calculate cumulative overall ratings and stats for each player
-                print("\nStep 5: Calculating overall player ratings and stats...")
-                cursor.execute("SELECT id FROM players WHERE id IN (SELECT DISTINCT player1_id FROM player_matches UNION SELECT DISTINCT player2_id FROM player_matches)")
-                all_players = cursor.fetchall()
-                total_players = len(all_players)
-                print(f"  - {total_players} players with matches")
-                
-                # Process in batches and commit periodically
-                batch_size = 50
-                for batch_start in range(0, total_players, batch_size):
-                    batch_end = min(batch_start + batch_size, total_players)
-                    print(f"  - Processing players {batch_start+1}-{batch_end}/{total_players}...")
-                    
-                    for player_idx in range(batch_start, batch_end):
-                        player = all_players[player_idx]
-                        player_id = player['id']
-                        
-                        # Get all matches for this player in chronological order
-                        cursor.execute("""
-                            SELECT * FROM player_matches
-                            WHERE player1_id = %s OR player2_id = %s
-                            ORDER BY played_at ASC NULLS LAST, match_id ASC
-                        """, (player_id, player_id))
-                        player_matches = cursor.fetchall()
-                        
-                        if not player_matches:
-                            continue
-                        
-                        # Initialize counters
-                        first_match = player_matches[0]
-                        if first_match['player1_id'] == player_id:
-                            cumulative_rating = first_match['player1_rating_before']
-                        else:
-                            cumulative_rating = first_match['player2_rating_before']
-                        
-                        matches_played = 0
-                        matches_won = 0
-                        matches_drawn = 0
-                        matches_lost = 0
-                        goals_scored = 0
-                        goals_conceded = 0
-                        clean_sheets = 0
-                        golden_glove_points = 0
-                        
-                        # Aggregate all stats
-                        for pm in player_matches:
-                            is_p1 = (pm['player1_id'] == player_id)
-                            is_null = pm.get('is_null_match', False)
-                            is_draw = pm.get('is_draw', False)
-                            is_walkover = pm.get('is_walkover', False)
-                            winner_id = pm.get('winner_id')
-                            
-                            # Calculate rating change
-                            if is_p1:
-                                rating_change = pm['player1_rating_after'] - pm['player1_rating_before']
-                                gf = pm['player1_goals']
-                                ga = pm['player2_goals']
-                            else:
-                                rating_change = pm['player2_rating_after'] - pm['player2_rating_before']
-                                gf = pm['player2_goals']
-                                ga = pm['player1_goals']
-                            
-                            cumulative_rating += rating_change
-                            
-                            # Aggregate stats (only if not null match)
-                            if not is_null:
-                                matches_played += 1
-                                if winner_id == player_id:
-                                    matches_won += 1
-                                elif is_draw:
-                                    matches_drawn += 1
-                                else:
-                                    matches_lost += 1
-                                
-                                goals_scored += gf
-                                goals_conceded += ga
-                                if ga == 0:
-                                    clean_sheets += 1
-                                
-                                if not is_walkover:
-                                    golden_glove_points += TournamentDB.calculate_golden_glove_points(
-                                        gf, ga, winner_id == player_id, is_draw
-                                    )
-                        
-                        # Single update with all calculated values
-                        cursor.execute("""
-                            UPDATE players SET
-                                rating = %s,
-                                matches_played = %s,
-                                matches_won = %s,
-                                matches_drawn = %s,
-                                matches_lost = %s,
-                                goals_scored = %s,
-                                goals_conceded = %s,
-                                clean_sheets = %s,
-                                golden_glove_points = %s
-                            WHERE id = %s
-                        """, (cumulative_rating, matches_played, matches_won, matches_drawn, matches_lost,
-                              goals_scored, goals_conceded, clean_sheets, golden_glove_points, player_id))
-                    
-                    # Commit after each batch
-                    conn.commit()
+                    results = rating_engine.replay_tournaments(
+                        matches_by_tournament, starting_ratings, max_workers=max_workers, on_result=report
+                    )
+                else:
+                    results = {}
+                    for idx, (t_id, matches) in enumerate(matches_by_tournament.items()):
+                        results[t_id] = rating_engine.replay_tournament(matches, starting_ratings.get(t_id, {}))
+                        print(f"  ✓ Tournament {idx+1}/{len(matches_by_tournament)} (ID: {t_id}): {len(matches)} matches")
+                        emit({'type': 'status', 'message': f"Replayed tournament {idx+1}/{len(matches_by_tournament)}"})
+                
+                # Every tournament's ratings and stats in one COPY-based pass
+                emit({'type': 'status', 'message': 'Saving match ratings...'})
+                TournamentDB._copy_tournament_replays(cursor, results)
+                for t_id, result in results.items():
+                    TournamentDB._write_checkpoints(cursor, t_id, rating_engine.checkpoint_states(
+                        matches_by_tournament[t_id], result.match_ratings
+                    ))
+                print(f"  ✓ Wrote {len(results)} tournaments")
+                
+                print("\nStep 4: Calculating overall player ratings and stats...")
+                emit({'type': 'status', 'message': 'Updating overall ratings and awards...'})
+                players_updated = TournamentDB._refresh_overall_stats(cursor)
+                print(f"  ✓ {players_updated} players updated")
+                
+                print("\nStep 5: Ranking awards...")
+                TournamentDB._refresh_award_standings(cursor, tournament_ids=None)
+                print("  ✓ Award standings rebuilt")
+                TournamentDB._bump_data_versions(cursor, everything=True)
                 
-                print("  ✓ Overall ratings calculated")
+                conn.commit()
                 print("\n" + "=" * 80)
                 print("✓ RECALCULATION COMPLETE!")
                 print("=" * 80)
@@ -2155,256 +3460,62 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
-    def recalculate_tournament_ratings(tournament_id):
+    @invalidates_reads
+    def recalculate_tournament_ratings(tournament_id, progress=None):
         """Recalculate ratings and stats for a specific tournament only.
-        This processes all matches in the tournament chronologically and recalculates:
-        - Tournament-specific ratings (player_stats.tournament_rating)
-        - Tournament-specific stats (player_stats table)
-        - Overall player ratings and stats (players table) by applying cumulative changes
+        This replays all matches in the tournament chronologically and rewrites:
+        - Tournament-specific ratings and stats (player_matches, player_stats)
+        - Overall player ratings and stats (players table) for everyone involved
+
+        progress(event), if given, receives a start event, one progress event
+        per replayed match and a status event per write step, before the
+        transaction commits (see run_recalculation_job).
         """
+        emit = progress or (lambda event: None)
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                # Get tournament info to check if it's a division tournament
-                cursor.execute("SELECT * FROM tournaments WHERE id = %s", (tournament_id,))
-                tournament = cursor.fetchone()
-                if not tournament:
+                cursor.execute("SELECT id FROM tournaments WHERE id = %s", (tournament_id,))
+                if not cursor.fetchone():
                     raise ValueError(f"Tournament with ID {tournament_id} not found")
                 
-                is_division_tournament = tournament.get('tournament_type') == 'division'
-                
-                # Step 1: Get all players in this tournament
                 cursor.execute("""
-                    SELECT DISTINCT player_id, division_id
+                    SELECT DISTINCT player_id
                     FROM tournament_players
                     WHERE tournament_id = %s
                 """, (tournament_id,))
-                tournament_players = cursor.fetchall()
+                tournament_players = [row['player_id'] for row in cursor.fetchall()]
                 
                 if not tournament_players:
                     return {'success': True, 'message': 'No players in this tournament', 'matches_processed': 0}
                 
-                # Step 2: Clear tournament-specific stats for these players
-                cursor.execute("""
-                    DELETE FROM player_stats
-                    WHERE tournament_id = %s
-                """, (tournament_id,))
+                matches = TournamentDB._fetch_replay_matches(cursor, tournament_id).get(tournament_id, [])
+                starting_ratings = TournamentDB._load_starting_ratings(cursor, tournament_id).get(tournament_id, {})
                 
-                # Step 3: Initialize tournament ratings based on division (for division tournaments)
-                player_initial_ratings = {}
-                if is_division_tournament:
-                    for tp in tournament_players:
-                        player_id = tp['player_id']
-                        division_id = tp['division_id']
-                        if division_id:
-                            cursor.execute("SELECT starting_rating FROM divisions WHERE id = %s", (division_id,))
-                            division = cursor.fetchone()
-                            player_initial_ratings[player_id] = division['starting_rating'] if division else 300
-                        else:
-                            player_initial_ratings[player_id] = 300
-                else:
-                    # For non-division tournaments, start at 300
-                    for tp in tournament_players:
-                        player_initial_ratings[tp['player_id']] = 300
+                result = rating_engine.replay_tournament(matches, starting_ratings)
+                emit({'type': 'start', 'total': len(matches), 'initial_ratings': result.initial_ratings})
+                for index, (match, ratings) in enumerate(zip(matches, result.match_ratings)):
+                    emit(TournamentDB._match_progress_event(index, match, ratings))
                 
-                # Step 4: Track current tournament ratings for each player
-                current_tournament_ratings = player_initial_ratings.copy()
+                emit({'type': 'status', 'message': 'Saving match ratings...'})
+                TournamentDB._write_tournament_replay(cursor, tournament_id, result)
+                TournamentDB._rebuild_checkpoints(cursor, tournament_id, matches, result.match_ratings)
                 
-                # Step 5: Get all matches for this tournament in chronological order
-                cursor.execute("""
-                    SELECT * FROM player_matches
-                    WHERE tournament_id = %s
-                    ORDER BY played_at ASC NULLS LAST, match_id ASC
-                """, (tournament_id,))
-                matches = cursor.fetchall()
-                
-                matches_processed = 0
-                
-                # Step 6: Process each match
-                for match in matches:
-                    p1_id = match['player1_id']
-                    p2_id = match['player2_id']
-                    g1 = match['player1_goals']
-                    g2 = match['player2_goals']
-                    is_walkover = match.get('is_walkover', False)
-                    is_null = match.get('is_null_match', False)
-                    p1_absent = match.get('player1_absent', False)
-                    p2_absent = match.get('player2_absent', False)
-                    is_draw = match.get('is_draw', False)
-                    winner_id = match.get('winner_id')
-                    
-                    # Get tournament ratings before this match
-                    p1_t_rating_before = current_tournament_ratings.get(p1_id, 300)
-                    p2_t_rating_before = current_tournament_ratings.get(p2_id, 300)
-                    
-                    # Calculate rating changes
-                    if is_null:
-                        # Null match: apply penalty
-                        NULL_PENALTY = 15
-                        p1_t_rating_after = max(0, min(1000, p1_t_rating_before - NULL_PENALTY))
-                        p2_t_rating_after = max(0, min(1000, p2_t_rating_before - NULL_PENALTY))
-                    elif is_walkover:
-                        # Walkover: use basic ELO with 75% factor
-                        if winner_id == p1_id:
-                            t_change_w, t_change_l = TournamentDB.calculate_rating_change(p1_t_rating_before, p2_t_rating_before, is_draw=False)
-                            t_change1 = int(t_change_w * 0.75)
-                            t_change2 = int(t_change_l * 0.75)
-                        else:
-                            t_change_w, t_change_l = TournamentDB.calculate_rating_change(p2_t_rating_before, p1_t_rating_before, is_draw=False)
-                            t_change2 = int(t_change_w * 0.75)
-                            t_change1 = int(t_change_l * 0.75)
-                        p1_t_rating_after = max(0, min(1000, p1_t_rating_before + t_change1))
-                        p2_t_rating_after = max(0, min(1000, p2_t_rating_before + t_change2))
-                    else:
-                        # Normal match: use enhanced rating calculation
-                        t_change1, t_change2 = TournamentDB.calculate_enhanced_rating_change(
-                            p1_t_rating_before, p2_t_rating_before, g1, g2, p1_absent, p2_absent
-                        )
-                        p1_t_rating_after = max(0, min(1000, p1_t_rating_before + t_change1))
-                        p2_t_rating_after = max(0, min(1000, p2_t_rating_before + t_change2))
-                    
-                    # Update current tournament ratings
-                    current_tournament_ratings[p1_id] = p1_t_rating_after
-                    current_tournament_ratings[p2_id] = p2_t_rating_after
-                    
-                    # Update match records with new ratings
-                    cursor.execute("""
-                        UPDATE player_matches SET
-                            player1_rating_before = %s,
-                            player2_rating_before = %s,
-                            player1_rating_after = %s,
-                            player2_rating_after = %s
-                        WHERE id = %s
-                    """, (p1_t_rating_before, p2_t_rating_before, p1_t_rating_after, p2_t_rating_after, match['id']))
-                    
-                    # Update tournament-specific stats (only if not a null match)
-                    if not is_null:
-                        for pid, t_rating_after, won, drawn, lost, gf, ga in [
-                            (p1_id, p1_t_rating_after, 1 if winner_id == p1_id else 0, 1 if is_draw else 0, 1 if winner_id == p2_id else 0, g1, g2),
-                            (p2_id, p2_t_rating_after, 1 if winner_id == p2_id else 0, 1 if is_draw else 0, 1 if winner_id == p1_id else 0, g2, g1)
-                        ]:
-                            # Calculate golden glove points
-                            glove_points = 0
-                            if not is_walkover:
-                                glove_points = TournamentDB.calculate_golden_glove_points(
-                                    gf, ga, winner_id == pid, is_draw
-                                )
-                            
-                            cursor.execute("""
-                                INSERT INTO player_stats
-                                    (player_id, tournament_id, tournament_rating, matches_played, wins, draws, losses, 
-                                     goals_scored, goals_conceded, clean_sheets, golden_glove_points)
-                                VALUES (%s, %s, %s, 1, %s, %s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (player_id, tournament_id)
-                                DO UPDATE SET
-                                    tournament_rating = %s,
-                                    matches_played = player_stats.matches_played + 1,
-                                    wins = player_stats.wins + %s,
-                                    draws = player_stats.draws + %s,
-                                    losses = player_stats.losses + %s,
-                                    goals_scored = player_stats.goals_scored + %s,
-                                    goals_conceded = player_stats.goals_conceded + %s,
-                                    clean_sheets = player_stats.clean_sheets + %s,
-                                    golden_glove_points = player_stats.golden_glove_points + %s
-                            """, (pid, tournament_id, t_rating_after, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove_points,
-                                  t_rating_after, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove_points))
-                    
-                    matches_processed += 1
-                
-                # Step 7: Recalculate overall player ratings from ALL tournaments
-                # We need to recalculate overall ratings for affected players by summing up all their tournament changes
-                affected_player_ids = [tp['player_id'] for tp in tournament_players]
-                
-                for player_id in affected_player_ids:
-                    # Reset player overall stats
-                    cursor.execute("""
-                        UPDATE players SET
-                            rating = 300,
-                            matches_played = 0,
-                            matches_won = 0,
-                            matches_drawn = 0,
-                            matches_lost = 0,
-                            goals_scored = 0,
-                            goals_conceded = 0,
-                            clean_sheets = 0,
-                            golden_glove_points = 0
-                        WHERE id = %s
-                    """, (player_id,))
-                    
-                    # Get all matches for this player across all tournaments in chronological order
-                    cursor.execute("""
-                        SELECT * FROM player_matches
-                        WHERE player1_id = %s OR player2_id = %s
-                        ORDER BY played_at ASC NULLS LAST, match_id ASC
-                    """, (player_id, player_id))
-                    all_player_matches = cursor.fetchall()
-                    
-                    # Determine starting rating from first match (will be division rating if first tournament is division)
-                    if all_player_matches:
-                        first_match = all_player_matches[0]
-                        if first_match['player1_id'] == player_id:
-                            cumulative_overall_rating = first_match['player1_rating_before']  # Use initial tournament rating
-                        else:
-                            cumulative_overall_rating = first_match['player2_rating_before']  # Use initial tournament rating
-                    else:
-                        cumulative_overall_rating = 300  # Default if no matches
-                    
-                    for pm in all_player_matches:
-                        is_p1 = (pm['player1_id'] == player_id)
-                        is_null = pm.get('is_null_match', False)
-                        is_draw = pm.get('is_draw', False)
-                        winner_id = pm.get('winner_id')
-                        
-                        # Calculate rating change from tournament ratings (cumulative)
-                        if is_p1:
-                            rating_change = pm['player1_rating_after'] - pm['player1_rating_before']
-                            gf = pm['player1_goals']
-                            ga = pm['player2_goals']
-                        else:
-                            rating_change = pm['player2_rating_after'] - pm['player2_rating_before']
-                            gf = pm['player2_goals']
-                            ga = pm['player1_goals']
-                        
-                        # Apply rating change cumulatively
-                        cumulative_overall_rating += rating_change
-                        
-                        # Update overall stats (only if not null match)
-                        if not is_null:
-                            won = 1 if winner_id == player_id else 0
-                            drawn = 1 if is_draw else 0
-                            lost = 1 if (not is_draw and winner_id != player_id) else 0
-                            
-                            glove_points = 0
-                            if not pm.get('is_walkover', False):
-                                glove_points = TournamentDB.calculate_golden_glove_points(
-                                    gf, ga, winner_id == player_id, is_draw
-                                )
-                            
-                            cursor.execute("""
-                                UPDATE players SET
-                                    rating = %s,
-                                    matches_played = matches_played + 1,
-                                    matches_won = matches_won + %s,
-                                    matches_drawn = matches_drawn + %s,
-                                    matches_lost = matches_lost + %s,
-                                    goals_scored = goals_scored + %s,
-                                    goals_conceded = goals_conceded + %s,
-                                    clean_sheets = clean_sheets + %s,
-                                    golden_glove_points = golden_glove_points + %s
-                                WHERE id = %s
-                            """, (cumulative_overall_rating, won, drawn, lost, gf, ga, 1 if ga == 0 else 0, glove_points, player_id))
-                    
-                    # Final update to ensure rating is set correctly
-                    cursor.execute("""
-                        UPDATE players SET rating = %s WHERE id = %s
-                    """, (cumulative_overall_rating, player_id))
+                emit({'type': 'status', 'message': 'Updating overall ratings and awards...'})
+                affected_player_ids = set(tournament_players) | set(result.ratings)
+                TournamentDB._refresh_overall_stats(cursor, affected_player_ids)
+                TournamentDB._refresh_award_standings(cursor, [tournament_id])
+                TournamentDB._bump_data_versions(cursor, [tournament_id], affected_player_ids)
                 
                 conn.commit()
                 return {
                     'success': True,
-                    'message': f'Successfully recalculated stats for {len(tournament_players)} players across {matches_processed} matches',
+                    'message': f'Successfully recalculated stats for {len(tournament_players)} players across {len(matches)} matches',
                     'players_updated': len(tournament_players),
-                    'matches_processed': matches_processed
+                    'matches_processed': len(matches),
+                    'initial_ratings': result.initial_ratings,
+                    'matches': matches,
+                    'match_ratings': result.match_ratings
                 }
                 
         except Exception as e:
@@ -2414,6 +3525,202 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    def enqueue_recalculation(tournament_id=None):
+        """Queue a recalculation for worker.py and return the job id.
+
+        tournament_id None recalculates every tournament. A job for the same
+        scope that is still queued or running is reused instead of adding another.
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                if tournament_id is not None:
+                    cursor.execute("SELECT id FROM tournaments WHERE id = %s", (tournament_id,))
+                    if not cursor.fetchone():
+                        raise ValueError(f"Tournament with ID {tournament_id} not found")
+                
+                # Serialize enqueues for one scope so two clicks can't queue twice
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext('recalculation_jobs'), %s)",
+                               (tournament_id or 0,))
+                cursor.execute("""
+                    SELECT id FROM recalculation_jobs
+                    WHERE tournament_id IS NOT DISTINCT FROM %s AND status IN ('queued', 'running')
+                    ORDER BY id LIMIT 1
+                """, (tournament_id,))
+                row = cursor.fetchone()
+                if row:
+                    conn.commit()
+                    return row['id']
+                
+                cursor.execute("""
+                    INSERT INTO recalculation_jobs (tournament_id) VALUES (%s) RETURNING id
+                """, (tournament_id,))
+                job_id = cursor.fetchone()['id']
+                conn.commit()
+                return job_id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def claim_recalculation_job(worker):
+        """Mark the oldest runnable job as running for this worker and return it.
+
+        Runnable means queued, or running with a stale heartbeat (its worker
+        died). Jobs that already used up their attempts are failed instead.
+        Returns None when there is nothing to do.
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE recalculation_jobs
+                    SET status = 'failed', finished_at = CURRENT_TIMESTAMP,
+                        error = COALESCE(error, 'Worker stopped responding')
+                    WHERE status = 'running'
+                      AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+                      AND attempts >= %s
+                """, (RECALC_JOB_STALE_SECONDS, RECALC_JOB_MAX_ATTEMPTS))
+                cursor.execute("""
+                    UPDATE recalculation_jobs
+                    SET status = 'running', worker = %s, attempts = attempts + 1,
+                        started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+                    WHERE id = (
+                        SELECT id FROM recalculation_jobs
+                        WHERE status = 'queued'
+                           OR (status = 'running'
+                               AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                        ORDER BY id
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING *
+                """, (worker, RECALC_JOB_STALE_SECONDS))
+                job = cursor.fetchone()
+                if job:
+                    # A retried job starts its progress log over
+                    cursor.execute("DELETE FROM recalculation_job_events WHERE job_id = %s", (job['id'],))
+                conn.commit()
+                return job
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def touch_recalculation_job(job_id):
+        """Refresh a running job's heartbeat so it isn't taken for abandoned"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE recalculation_jobs SET heartbeat_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND status = 'running'
+                """, (job_id,))
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _match_progress_event(index, match, ratings):
+        """The live page's 'progress' event for one replayed match"""
+        _, p1_rating_before, p2_rating_before, p1_rating_after, p2_rating_after = ratings
+        return {'type': 'progress', 'data': {
+            'index': index,
+            'player1_goals': match['player1_goals'],
+            'player2_goals': match['player2_goals'],
+            'player1_rating_before': float(p1_rating_before),
+            'player1_rating_after': float(p1_rating_after),
+            'player2_rating_before': float(p2_rating_before),
+            'player2_rating_after': float(p2_rating_after),
+            'is_guest_match': match['player2_id'] is None
+        }}
+    
+    @staticmethod
+    def run_recalculation_job(job):
+        """Run a claimed job, recording its progress events as it goes.
+
+        Events use the format the live recalculation page expects (start,
+        progress per match, status per write step, then complete or error)
+        and are committed while the recalculation runs. The recalculation
+        commits on its own, so a job interrupted before finishing is simply
+        run again.
+        """
+        tournament_id = job['tournament_id']
+        events = RecalculationEventLog(job['id'])
+        try:
+            try:
+                if tournament_id is None:
+                    TournamentDB.recalculate_all_ratings(progress=events.add)
+                    message = 'Successfully recalculated all tournaments'
+                else:
+                    result = TournamentDB.recalculate_tournament_ratings(tournament_id, progress=events.add)
+                    message = f"Successfully recalculated {result.get('matches_processed', 0)} matches"
+                events.add({'type': 'complete', 'message': message})
+                status, error = 'done', None
+            except Exception as e:
+                print(f"Recalculation job {job['id']} failed: {e}")
+                events.add({'type': 'error', 'message': str(e)})
+                status, error = 'failed', str(e)
+        finally:
+            events.close()
+        
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE recalculation_jobs
+                    SET status = %s, error = %s, finished_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (status, error, job['id']))
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return status
+    
+    @staticmethod
+    def get_recalculation_job(job_id=None, tournament_id=None):
+        """A job by id, or the latest job of a tournament"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                if job_id is not None:
+                    cursor.execute("SELECT * FROM recalculation_jobs WHERE id = %s", (job_id,))
+                else:
+                    cursor.execute("""
+                        SELECT * FROM recalculation_jobs WHERE tournament_id = %s
+                        ORDER BY id DESC LIMIT 1
+                    """, (tournament_id,))
+                return cursor.fetchone()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def get_recalculation_events(job_id, after_seq=0):
+        """Progress events of a job after the given sequence number, in order"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT seq, payload FROM recalculation_job_events
+                    WHERE job_id = %s AND seq > %s
+                    ORDER BY seq
+                """, (job_id, after_seq))
+                return cursor.fetchall()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    @invalidates_reads
     def remove_player_from_tournament(tournament_id, player_id):
         """Remove a player from a tournament"""
         conn = get_db_connection()
@@ -2423,6 +3730,7 @@ class TournamentDB:
                     "DELETE FROM tournament_players WHERE tournament_id = %s AND player_id = %s",
                     (tournament_id, player_id)
                 )
+                TournamentDB._bump_data_versions(cursor, [tournament_id], [player_id])
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -2431,11 +3739,13 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def remove_all_players_from_tournament(tournament_id):
         """Remove all players from a tournament"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
+                TournamentDB._bump_data_versions(cursor, [tournament_id], related=True)
                 cursor.execute(
                     "DELETE FROM tournament_players WHERE tournament_id = %s",
                     (tournament_id,)
@@ -2448,6 +3758,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def record_guest_match(tournament_id, clan_player_id, guest_name, clan_goals, guest_goals, clan_absent=False, guest_absent=False):
         """Record a match between a clan member and guest player.
         Creates entries in BOTH guest_matches and player_matches tables.
@@ -2461,9 +3772,8 @@ class TournamentDB:
                 if not clan_player:
                     raise ValueError("Clan player not found")
                 
-                # Get next match ID - use the shared match_id from player_matches
-                cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 AS next_id FROM player_matches")
-                next_match_id = cursor.fetchone()['next_id']
+                # Get next match ID - shared between player_matches and guest_matches
+                next_match_id = TournamentDB._next_match_id(cursor)
                 
                 # Get tournament type and division info
                 cursor.execute("SELECT tournament_type FROM tournaments WHERE id = %s", (tournament_id,))
@@ -2606,9 +3916,13 @@ class TournamentDB:
                         WHERE id = %s
                     """, (won, drawn, lost, clan_goals, guest_goals, 1 if guest_goals == 0 else 0, glove_points, clan_player_id))
                 
-                # Calculate and update overall rating from all matches
-                new_overall_rating = TournamentDB.calculate_overall_rating_from_last_matches(cursor, clan_player_id, limit=40)
-                cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating, clan_player_id))
+                # Update overall rating with this match's change
+                TournamentDB._apply_overall_rating_change(
+                    cursor, clan_player_id, next_match_id, clan_rating_before, clan_rating_after
+                )
+                TournamentDB._extend_checkpoints(cursor, [tournament_id])
+                TournamentDB._refresh_award_standings(cursor, [tournament_id])
+                TournamentDB._bump_data_versions(cursor, [tournament_id], [clan_player_id])
                 
                 conn.commit()
                 return next_match_id
@@ -2619,6 +3933,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def _update_player_stats_for_guest_match(player_id, player_goals, opponent_goals, player_absent, opponent_absent, new_rating):
         """Update player stats after a guest match"""
         conn = get_db_connection()
@@ -2668,6 +3983,7 @@ class TournamentDB:
                     """,
                     (matches_won, matches_drawn, matches_lost, player_goals, opponent_goals, new_rating, player_id)
                 )
+                TournamentDB._bump_data_versions(cursor, player_ids=[player_id])
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -2676,437 +3992,501 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def record_bulk_matches(matches_data):
-        """Record multiple matches at once - uses regular record_match to ensure consistency"""
-        match_ids = []
+        """Record multiple matches in a single transaction (all or nothing).
+
+        Ratings for every player/tournament involved are loaded in one query,
+        the matches are applied in order in memory with the same rules as
+        record_match(), and the results are written with multi-row statements.
+        Raises BulkMatchError listing every invalid row before anything is written.
+        """
+        if not matches_data:
+            return []
         
-        for match_data in matches_data:
-            tournament_id = match_data['tournament_id']
-            player1_id = match_data['player1_id']
-            player2_id = match_data['player2_id']
-            player1_goals = match_data['player1_goals']
-            player2_goals = match_data['player2_goals']
-            player1_absent = match_data.get('player1_absent', False)
-            player2_absent = match_data.get('player2_absent', False)
-            
-            # Validate different players
-            if player1_id == player2_id:
-                raise ValueError(f"Cannot record match between same player")
+        # Validate rows up front so errors can be reported per row
+        errors = []
+        rows = []
+        for index, match_data in enumerate(matches_data):
+            row_number = match_data.get('row', index + 1)
+            player1_id = match_data.get('player1_id')
+            player2_id = match_data.get('player2_id')
+            player1_goals = match_data.get('player1_goals') or 0
+            player2_goals = match_data.get('player2_goals') or 0
             
-            # Use the regular record_match function to ensure consistency
-            match_id = TournamentDB.record_match(
-                tournament_id, player1_id, player2_id,
-                player1_goals, player2_goals,
-                player1_absent, player2_absent
-            )
-            
-            match_ids.append(match_id)
+            if not match_data.get('tournament_id'):
+                errors.append((row_number, "Tournament is required"))
+            elif not player1_id or not player2_id:
+                errors.append((row_number, "Both players are required"))
+            elif player1_id == player2_id:
+                errors.append((row_number, "Cannot record match between same player"))
+            elif player1_goals < 0 or player2_goals < 0:
+                errors.append((row_number, "Goals must be 0 or higher"))
+            else:
+                rows.append({
+                    'row': row_number,
+                    'tournament_id': match_data['tournament_id'],
+                    'player1_id': player1_id,
+                    'player2_id': player2_id,
+                    'player1_goals': player1_goals,
+                    'player2_goals': player2_goals,
+                    'player1_absent': bool(match_data.get('player1_absent', False)),
+                    'player2_absent': bool(match_data.get('player2_absent', False))
+                })
+        if errors:
+            raise BulkMatchError(errors)
         
-        return match_ids
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                # Load every rating the batch depends on in one query
+                pairs = set()
+                for row in rows:
+                    pairs.add((row['tournament_id'], row['player1_id']))
+                    pairs.add((row['tournament_id'], row['player2_id']))
+                
+                loaded = execute_values(cursor, """
+                    SELECT req.tournament_id, req.player_id,
+                           p.id IS NOT NULL AS player_exists,
+                           t.id IS NOT NULL AS tournament_exists,
+                           p.rating, p.initial_rating,
+                           d.starting_rating AS division_rating,
+                           ps.tournament_rating,
+                           EXISTS (
+                               SELECT 1 FROM player_matches pm
+                               WHERE pm.player1_id = req.player_id OR pm.player2_id = req.player_id
+                           ) AS has_history
+                    FROM (VALUES %s) AS req(tournament_id, player_id)
+                    LEFT JOIN players p ON p.id = req.player_id
+                    LEFT JOIN tournaments t ON t.id = req.tournament_id
+                    LEFT JOIN tournament_players tp
+                        ON tp.tournament_id = req.tournament_id AND tp.player_id = req.player_id
+                    LEFT JOIN divisions d
+                        ON d.id = tp.division_id AND t.tournament_type = 'division'
+                    LEFT JOIN player_stats ps
+                        ON ps.tournament_id = req.tournament_id AND ps.player_id = req.player_id
+                """, sorted(pairs), page_size=len(pairs), fetch=True)
+                
+                tournament_ratings = {}
+                overall = {}
+                missing = {}
+                for rec in loaded:
+                    key = (rec['tournament_id'], rec['player_id'])
+                    if not rec['tournament_exists']:
+                        missing[key] = f"Tournament {rec['tournament_id']} not found"
+                        continue
+                    if not rec['player_exists']:
+                        missing[key] = f"Player {rec['player_id']} not found"
+                        continue
+                    
+                    # Same precedence as the single-match path:
+                    # tournament rating > division starting rating > initial_rating > 300
+                    if rec['tournament_rating'] is not None:
+                        tournament_ratings[key] = rec['tournament_rating']
+                    elif rec['division_rating'] is not None:
+                        tournament_ratings[key] = rec['division_rating']
+                    elif rec['initial_rating'] is not None:
+                        tournament_ratings[key] = rec['initial_rating']
+                    else:
+                        tournament_ratings[key] = 300
+                    
+                    if rec['player_id'] not in overall:
+                        rating = rec['rating']
+                        # 'total' is the unclamped running total the rating is clamped from;
+                        # a stored rating at a bound doesn't tell it, so replay the history
+                        total = rating
+                        if rec['has_history'] and (rating is None or not rating_engine.MIN_RATING < rating < rating_engine.MAX_RATING):
+                            total = TournamentDB._overall_rating_total(cursor, rec['player_id'])
+                            rating = int(round(rating_engine.clamp_rating(total)))
+                        overall[rec['player_id']] = {'rating': rating, 'total': total, 'has_history': rec['has_history']}
+                
+                for row in rows:
+                    for player_id in (row['player1_id'], row['player2_id']):
+                        message = missing.get((row['tournament_id'], player_id))
+                        if message:
+                            errors.append((row['row'], message))
+                if errors:
+                    raise BulkMatchError(errors)
+                
+                reserved_match_ids = iter(TournamentDB._reserve_match_ids(cursor, len(rows)))
+                
+                def apply_overall(player_id, rating_before, rating_after):
+                    state = overall[player_id]
+                    if not state['has_history']:
+                        state['total'] = rating_after
+                        state['has_history'] = True
+                    else:
+                        state['total'] += rating_after - rating_before
+                    # Clamped once from the running total, like the history replay
+                    state['rating'] = int(round(rating_engine.clamp_rating(state['total'])))
+                
+                player_totals = {}
+                tournament_totals = {}
+                
+                match_rows = []
+                match_ids = []
+                for row in rows:
+                    tournament_id = row['tournament_id']
+                    player1_id, player2_id = row['player1_id'], row['player2_id']
+                    player1_absent, player2_absent = row['player1_absent'], row['player2_absent']
+                    is_null_match = player1_absent and player2_absent
+                    is_walkover = (player1_absent or player2_absent) and not is_null_match
+                    key1, key2 = (tournament_id, player1_id), (tournament_id, player2_id)
+                    
+                    if is_null_match or is_walkover:
+                        # No goals are recorded when a player is absent
+                        player1_goals = player2_goals = 0
+                        is_draw = False
+                        winner_id = None if is_null_match else (player2_id if player1_absent else player1_id)
+                        for player_id in (player1_id, player2_id):
+                            if overall[player_id]['rating'] is None:
+                                overall[player_id]['rating'] = 300
+                    else:
+                        player1_goals, player2_goals = row['player1_goals'], row['player2_goals']
+                        is_draw = player1_goals == player2_goals
+                        winner_id = None if is_draw else (player1_id if player1_goals > player2_goals else player2_id)
+                    
+                    match = {
+                        'player1_id': player1_id,
+                        'player2_id': player2_id,
+                        'player1_goals': player1_goals,
+                        'player2_goals': player2_goals,
+                        'winner_id': winner_id,
+                        'is_draw': is_draw,
+                        'is_walkover': is_walkover,
+                        'is_null_match': is_null_match,
+                        'player1_absent': player1_absent,
+                        'player2_absent': player2_absent
+                    }
+                    
+                    if is_null_match:
+                        # Null matches are rated from overall ratings, like the single-match path
+                        player1_rating = overall[player1_id]['rating']
+                        player2_rating = overall[player2_id]['rating']
+                    else:
+                        player1_rating = tournament_ratings[key1]
+                        player2_rating = tournament_ratings[key2]
+                    new_rating1, new_rating2 = rating_engine.rate_match(match, player1_rating, player2_rating)
+                    
+                    match_id = next(reserved_match_ids)
+                    match_rows.append((match_id, tournament_id, player1_id, player2_id,
+                                       player1_goals, player2_goals, winner_id, is_draw,
+                                       is_walkover, is_null_match, player1_absent, player2_absent,
+                                       player1_rating, player2_rating, new_rating1, new_rating2))
+                    
+                    for player_id, key, new_rating in ((player1_id, key1, new_rating1),
+                                                       (player2_id, key2, new_rating2)):
+                        stats = rating_engine.match_stats(match, player_id)
+                        if stats is None:
+                            continue
+                        tournament_ratings[key] = new_rating
+                        rating_engine.add_stats(player_totals.setdefault(player_id, rating_engine.new_totals()), stats)
+                        t_totals = tournament_totals.setdefault(key, rating_engine.new_totals())
+                        rating_engine.add_stats(t_totals, stats)
+                        t_totals['tournament_rating'] = new_rating
+                    
+                    apply_overall(player1_id, player1_rating, new_rating1)
+                    apply_overall(player2_id, player2_rating, new_rating2)
+                    match_ids.append(match_id)
+                
+                # Write everything with multi-row statements
+                execute_values(cursor, """
+                    INSERT INTO player_matches
+                    (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals,
+                     winner_id, is_draw, is_walkover, is_null_match, player1_absent, player2_absent,
+                     player1_rating_before, player2_rating_before, player1_rating_after, player2_rating_after)
+                    VALUES %s
+                """, match_rows, page_size=500)
+                
+                if tournament_totals:
+                    execute_values(cursor, """
+                        INSERT INTO player_stats
+                        (player_id, tournament_id, tournament_rating, matches_played, wins, draws, losses,
+                         goals_scored, goals_conceded, clean_sheets, golden_glove_points)
+                        VALUES %s
+                        ON CONFLICT (player_id, tournament_id)
+                        DO UPDATE SET
+                            tournament_rating = EXCLUDED.tournament_rating,
+                            matches_played = player_stats.matches_played + EXCLUDED.matches_played,
+                            wins = player_stats.wins + EXCLUDED.wins,
+                            draws = player_stats.draws + EXCLUDED.draws,
+                            losses = player_stats.losses + EXCLUDED.losses,
+                            goals_scored = player_stats.goals_scored + EXCLUDED.goals_scored,
+                            goals_conceded = player_stats.goals_conceded + EXCLUDED.goals_conceded,
+                            clean_sheets = player_stats.clean_sheets + EXCLUDED.clean_sheets,
+                            golden_glove_points = player_stats.golden_glove_points + EXCLUDED.golden_glove_points
+                    """, [
+                        (player_id, tournament_id, totals['tournament_rating'])
+                        + tuple(totals[field] for field in rating_engine.STAT_FIELDS)
+                        for (tournament_id, player_id), totals in tournament_totals.items()
+                    ], page_size=500)
+                
+                player_updates = []
+                for player_id, state in overall.items():
+                    totals = player_totals.get(player_id, rating_engine.new_totals())
+                    player_updates.append((player_id, state['rating'])
+                                          + tuple(totals[field] for field in rating_engine.STAT_FIELDS))
+                execute_values(cursor, """
+                    UPDATE players SET
+                        rating = v.rating,
+                        matches_played = players.matches_played + v.matches_played,
+                        matches_won = players.matches_won + v.wins,
+                        matches_drawn = players.matches_drawn + v.draws,
+                        matches_lost = players.matches_lost + v.losses,
+                        goals_scored = players.goals_scored + v.goals_scored,
+                        goals_conceded = players.goals_conceded + v.goals_conceded,
+                        clean_sheets = players.clean_sheets + v.clean_sheets,
+                        golden_glove_points = players.golden_glove_points + v.golden_glove_points
+                    FROM (VALUES %s) AS v(id, rating, matches_played, wins, draws, losses,
+                                          goals_scored, goals_conceded, clean_sheets, golden_glove_points)
+                    WHERE players.id = v.id
+                """, player_updates, page_size=500)
+                
+                TournamentDB._extend_checkpoints(cursor, {t_id for t_id, _ in pairs})
+                TournamentDB._refresh_award_standings(cursor, {t_id for t_id, _ in pairs})
+                TournamentDB._bump_data_versions(cursor, {t_id for t_id, _ in pairs}, {p_id for _, p_id in pairs})
+                
+                conn.commit()
+                return match_ids
+        except Exception as e:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
     
     @staticmethod
-    def _record_bulk_null_match(cursor, tournament_id, player1_id, player2_id):
-        """Record a null match in bulk operations where both players are absent"""
-        # Get current ratings (for record keeping, handle null ratings for new players)
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player1_id,))
-        player1_rating_result = cursor.fetchone()['rating']
-        player1_rating = 300 if player1_rating_result is None else player1_rating_result
-        
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player2_id,))
-        player2_rating_result = cursor.fetchone()['rating']
-        player2_rating = 300 if player2_rating_result is None else player2_rating_result
-        
-        # Apply negative points for both absent players (penalty: -15 rating points)
-        NULL_MATCH_PENALTY = 15
-        new_rating1 = max(0, min(1000, player1_rating - NULL_MATCH_PENALTY))
-        new_rating2 = max(0, min(1000, player2_rating - NULL_MATCH_PENALTY))
-        
-        # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
+    def _like_pattern(search_query):
+        """Case-insensitive substring LIKE pattern with wildcards in the input escaped"""
+        escaped = search_query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escaped}%"
+    
+    @staticmethod
+    def _match_list_filters(tournament_id=None, search_query=None, key=None, direction='after'):
+        """WHERE clauses and params for the regular and guest halves of the match list"""
+        conditions_regular = []
+        conditions_guest = []
+        params_regular = []
+        params_guest = []
         
-        # Record the null match with negative penalty applied
-        cursor.execute("""
-            INSERT INTO player_matches 
-            (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals,
-             winner_id, is_draw, is_walkover, is_null_match, player1_absent, player2_absent,
-             player1_rating_before, player2_rating_before, player1_rating_after, player2_rating_after)
-            VALUES (%s, %s, %s, %s, 0, 0, NULL, false, false, true, true, true, %s, %s, %s, %s)
-        """, (match_id, tournament_id, player1_id, player2_id, 
-              player1_rating, player2_rating, new_rating1, new_rating2))
+        if tournament_id:
+            conditions_regular.append("pm.tournament_id = %s")
+            conditions_guest.append("gm.tournament_id = %s")
+            params_regular.append(tournament_id)
+            params_guest.append(tournament_id)
         
-        # Calculate and update overall ratings for both players
-        # Null matches apply penalty so they affect cumulative rating
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
+        if search_query:
+            # Matching players are found through the trigram index on LOWER(name)
+            # and matches are then probed by player id, so no match row has to
+            # be joined just to be filtered out
+            search_pattern = TournamentDB._like_pattern(search_query)
+            matching_players = "(SELECT id FROM players WHERE LOWER(name) LIKE %s)"
+            conditions_regular.append(
+                f"(pm.player1_id IN {matching_players} OR pm.player2_id IN {matching_players})"
+            )
+            conditions_guest.append(
+                f"(gm.clan_player_id IN {matching_players} OR LOWER(gm.guest_name) LIKE %s)"
+            )
+            params_regular.extend([search_pattern, search_pattern])
+            params_guest.extend([search_pattern, search_pattern])
         
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
+        if key:
+            comparison = '<' if direction == 'after' else '>'
+            conditions_regular.append(f"(pm.played_at, pm.match_id) {comparison} (%s, %s)")
+            conditions_guest.append(f"(gm.played_at, gm.match_id) {comparison} (%s, %s)")
+            params_regular.extend(key)
+            params_guest.extend(key)
         
-        return match_id
+        filter_regular = "WHERE " + " AND ".join(conditions_regular) if conditions_regular else ""
+        filter_guest = "WHERE " + " AND ".join(conditions_guest) if conditions_guest else ""
+        return filter_regular, filter_guest, params_regular + params_guest
     
     @staticmethod
-    def _record_bulk_walkover_match(cursor, tournament_id, player1_id, player2_id, player1_absent, player2_absent):
-        """Record a walkover match in bulk operations where one player is absent"""
-        # Get current ratings (handle null ratings for new players)
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player1_id,))
-        player1_rating_result = cursor.fetchone()['rating']
-        player1_rating = 300 if player1_rating_result is None else player1_rating_result
-        
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player2_id,))
-        player2_rating_result = cursor.fetchone()['rating']
-        player2_rating = 300 if player2_rating_result is None else player2_rating_result
-        
-        # Determine winner (present player wins by walkover)
-        winner_id = player2_id if player1_absent else player1_id
-        loser_id = player1_id if player1_absent else player2_id
-        winner_rating = player2_rating if player1_absent else player1_rating
-        loser_rating = player1_rating if player1_absent else player2_rating
+    @cached_read
+    def get_all_matches(tournament_id=None, limit=None, offset=0, search_query=None, key=None, direction='after'):
+        """Get all matches (both regular and guest) with player details, with pagination and search support.
+
+        Matches come newest first, ordered by (played_at, match_id). For keyset
+        paging pass the (played_at, match_id) of a boundary match as key:
+        direction='after' returns older matches, 'before' the newer ones
+        (still newest first). Each half of the union is limited on its own
+        index, so a page costs the same however deep it is.
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(*TournamentDB._match_list_query(
+                    tournament_id, limit, offset, search_query, key, direction
+                ))
+                matches = cursor.fetchall()
+                if direction == 'before':
+                    matches.reverse()
+                return matches
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _match_list_query(tournament_id=None, limit=None, offset=0, search_query=None, key=None, direction='after'):
+        """(query, params) run by get_all_matches()"""
+        order = "DESC" if direction == 'after' else "ASC"
+        # Union query to get both regular and guest matches with division info
+        query = """
+            (
+                SELECT pm.match_id, pm.tournament_id, pm.played_at,
+                       p1.name as player1_name, p2.name as player2_name,
+                       t.name as tournament_name,
+                       pm.player1_goals, pm.player2_goals,
+                       pm.winner_id, pm.is_draw, pm.is_walkover, pm.is_null_match,
+                       pm.player1_absent, pm.player2_absent,
+                       pm.player1_rating_before, pm.player2_rating_before,
+                       pm.player1_rating_after, pm.player2_rating_after,
+                       'regular' as match_type,
+                       pm.player1_id, pm.player2_id,
+                       pm.id as record_id,
+                       t.tournament_type,
+                       tp1.division_id as player1_division_id,
+                       d1.name as player1_division_name,
+                       tp2.division_id as player2_division_id,
+                       d2.name as player2_division_name
+                FROM player_matches pm
+                JOIN players p1 ON pm.player1_id = p1.id
+                JOIN players p2 ON pm.player2_id = p2.id
+                JOIN tournaments t ON pm.tournament_id = t.id
+                LEFT JOIN tournament_players tp1 ON pm.player1_id = tp1.player_id AND pm.tournament_id = tp1.tournament_id
+                LEFT JOIN divisions d1 ON tp1.division_id = d1.id
+                LEFT JOIN tournament_players tp2 ON pm.player2_id = tp2.player_id AND pm.tournament_id = tp2.tournament_id
+                LEFT JOIN divisions d2 ON tp2.division_id = d2.id
+                {filter_regular}
+                {branch_limit_regular}
+            )
+            UNION ALL
+            (
+                SELECT gm.match_id, gm.tournament_id, gm.played_at,
+                       p.name as player1_name, gm.guest_name as player2_name,
+                       t.name as tournament_name,
+                       gm.clan_goals as player1_goals, gm.guest_goals as player2_goals,
+                       CASE WHEN gm.clan_goals > gm.guest_goals THEN gm.clan_player_id
+                            WHEN gm.guest_goals > gm.clan_goals THEN NULL
+                            ELSE NULL END as winner_id,
+                       CASE WHEN gm.clan_goals = gm.guest_goals THEN true ELSE false END as is_draw,
+                       gm.is_walkover, gm.is_null_match,
+                       gm.clan_absent as player1_absent, gm.guest_absent as player2_absent,
+                       gm.clan_rating_before as player1_rating_before,
+                       300 as player2_rating_before,
+                       gm.clan_rating_after as player1_rating_after,
+                       300 as player2_rating_after,
+                       'guest' as match_type,
+                       gm.clan_player_id as player1_id, NULL as player2_id,
+                       gm.id as record_id,
+                       t.tournament_type,
+                       tp.division_id as player1_division_id,
+                       d.name as player1_division_name,
+                       NULL as player2_division_id,
+                       NULL as player2_division_name
+                FROM guest_matches gm
+                JOIN players p ON gm.clan_player_id = p.id
+                JOIN tournaments t ON gm.tournament_id = t.id
+                LEFT JOIN tournament_players tp ON gm.clan_player_id = tp.player_id AND gm.tournament_id = tp.tournament_id
+                LEFT JOIN divisions d ON tp.division_id = d.id
+                {filter_guest}
+                {branch_limit_guest}
+            )
+            ORDER BY played_at {order}, match_id {order}
+        """
         
-        # Calculate rating changes (smaller changes for walkover)
-        rating_change_winner, rating_change_loser = TournamentDB.calculate_rating_change(
-            winner_rating, loser_rating, is_draw=False
+        filter_regular, filter_guest, params = TournamentDB._match_list_filters(
+            tournament_id, search_query, key, direction
         )
         
-        # Reduce rating changes for walkover (75% of normal change)
-        rating_change_winner = int(rating_change_winner * 0.75)
-        rating_change_loser = int(rating_change_loser * 0.75)
-        
-        # Apply rating bounds (0-1000)
-        new_winner_rating = max(0, min(1000, winner_rating + rating_change_winner))
-        new_loser_rating = max(0, min(1000, loser_rating + rating_change_loser))
-        
-        new_rating1 = new_winner_rating if winner_id == player1_id else new_loser_rating
-        new_rating2 = new_winner_rating if winner_id == player2_id else new_loser_rating
-        
-        # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
-        
-        # Record the walkover match (0-0 score, update ratings, matches_played, wins/losses but NO goals)
-        cursor.execute("""
-            INSERT INTO player_matches 
-            (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals,
-             winner_id, is_draw, is_walkover, is_null_match, player1_absent, player2_absent,
-             player1_rating_before, player2_rating_before, player1_rating_after, player2_rating_after)
-            VALUES (%s, %s, %s, %s, 0, 0, %s, false, true, false, %s, %s, %s, %s, %s, %s)
-        """, (match_id, tournament_id, player1_id, player2_id,
-              winner_id, player1_absent, player2_absent,
-              player1_rating, player2_rating, new_rating1, new_rating2))
-        
-        # Update player stats, matches_played, wins/losses (but NO goals for walkover)
-        cursor.execute("""
-            UPDATE players SET 
-                matches_played = matches_played + 1,
-                matches_won = matches_won + %s,
-                matches_lost = matches_lost + %s
-            WHERE id = %s
-        """, (1 if winner_id == player1_id else 0,
-              1 if winner_id != player1_id else 0,
-              player1_id))
-        
-        cursor.execute("""
-            UPDATE players SET 
-                matches_played = matches_played + 1,
-                matches_won = matches_won + %s,
-                matches_lost = matches_lost + %s
-            WHERE id = %s
-        """, (1 if winner_id == player2_id else 0,
-              1 if winner_id != player2_id else 0,
-              player2_id))
-        
-        # Update tournament stats - matches_played, wins/losses (but NO goals)
-        for player_id, is_winner in [
-            (player1_id, winner_id == player1_id),
-            (player2_id, winner_id == player2_id)
-        ]:
-            cursor.execute("""
-                INSERT INTO player_stats 
-                (player_id, tournament_id, matches_played, wins, draws, losses, goals_scored, goals_conceded)
-                VALUES (%s, %s, 1, %s, 0, %s, 0, 0)
-                ON CONFLICT (player_id, tournament_id)
-                DO UPDATE SET
-                    matches_played = player_stats.matches_played + 1,
-                    wins = player_stats.wins + %s,
-                    losses = player_stats.losses + %s
-            """, (player_id, tournament_id,
-                  1 if is_winner else 0,
-                  1 if not is_winner else 0,
-                  1 if is_winner else 0,
-                  1 if not is_winner else 0))
-        
-        # Calculate and update overall ratings for both players
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
+        # Neither half can contribute more than offset + limit rows
+        branch_limit_regular = branch_limit_guest = ""
+        if limit:
+            branch_limit = int(limit) + int(offset or 0)
+            branch_limit_regular = f"ORDER BY pm.played_at {order}, pm.match_id {order} LIMIT {branch_limit}"
+            branch_limit_guest = f"ORDER BY gm.played_at {order}, gm.match_id {order} LIMIT {branch_limit}"
         
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
+        query = query.format(
+            filter_regular=filter_regular,
+            filter_guest=filter_guest,
+            branch_limit_regular=branch_limit_regular,
+            branch_limit_guest=branch_limit_guest,
+            order=order
+        )
         
-        return match_id
+        if limit:
+            query += f" LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
+        return query, params
     
     @staticmethod
-    def _record_bulk_normal_match(cursor, tournament_id, player1_id, player2_id, player1_goals, player2_goals):
-        """Record a normal match in bulk operations with both players present"""
-        # Get current ratings (handle null ratings for new players)
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player1_id,))
-        player1_rating_result = cursor.fetchone()['rating']
-        player1_rating = 300 if player1_rating_result is None else player1_rating_result
-        
-        cursor.execute("SELECT rating FROM players WHERE id = %s", (player2_id,))
-        player2_rating_result = cursor.fetchone()['rating']
-        player2_rating = 300 if player2_rating_result is None else player2_rating_result
-        
-        # Determine winner and calculate enhanced rating changes with goals and clean sheets
-        is_draw = player1_goals == player2_goals
-        winner_id = None if is_draw else (player1_id if player1_goals > player2_goals else player2_id)
+    @cached_read
+    def get_matches_page(tournament_id=None, search_query=None, page_token=None, per_page=25):
+        """One page of the match list using keyset pagination.
+
+        page_token is a token from a previous page (None for the newest page).
+        Returns the matches plus next_token (older) / prev_token (newer),
+        each None at the ends of the list. Raises ValueError for a bad token.
+        """
+        direction, key = decode_page_token(page_token) if page_token else ('after', None)
         
-        # Use enhanced rating calculation that includes goal scoring bonuses
-        rating_change1, rating_change2 = TournamentDB.calculate_enhanced_rating_change(
-            player1_rating, player2_rating, player1_goals, player2_goals
+        # One extra row tells whether there is another page beyond this one
+        matches = TournamentDB.get_all_matches(
+            tournament_id=tournament_id, limit=per_page + 1, search_query=search_query,
+            key=key, direction=direction
         )
+        has_more = len(matches) > per_page
+        if direction == 'after':
+            matches = matches[:per_page]
+            has_next, has_prev = has_more, key is not None
+        else:
+            matches = matches[-per_page:]
+            has_next, has_prev = True, has_more
         
-        # Apply rating bounds (0-1000)
-        new_rating1 = max(0, min(1000, player1_rating + rating_change1))
-        new_rating2 = max(0, min(1000, player2_rating + rating_change2))
-        
-        # Get next match ID
-        cursor.execute("SELECT COALESCE(MAX(match_id), 0) + 1 as next_id FROM player_matches")
-        match_id = cursor.fetchone()['next_id']
-        
-        # Record the match
-        cursor.execute("""
-            INSERT INTO player_matches 
-            (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals,
-             winner_id, is_draw, is_walkover, is_null_match, player1_absent, player2_absent,
-             player1_rating_before, player2_rating_before, player1_rating_after, player2_rating_after)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, false, false, false, false, %s, %s, %s, %s)
-        """, (match_id, tournament_id, player1_id, player2_id, player1_goals, player2_goals,
-              winner_id, is_draw, player1_rating, player2_rating, new_rating1, new_rating2))
-        
-        # Update player stats (without rating first)
-        cursor.execute("""
-            UPDATE players SET 
-                matches_played = matches_played + 1,
-                matches_won = matches_won + %s,
-                matches_drawn = matches_drawn + %s,
-                matches_lost = matches_lost + %s,
-                goals_scored = goals_scored + %s,
-                goals_conceded = goals_conceded + %s
-            WHERE id = %s
-        """, (1 if winner_id == player1_id else 0,
-              1 if is_draw else 0,
-              1 if winner_id == player2_id else 0,
-              player1_goals, player2_goals, player1_id))
-        
-        cursor.execute("""
-            UPDATE players SET 
-                matches_played = matches_played + 1,
-                matches_won = matches_won + %s,
-                matches_drawn = matches_drawn + %s,
-                matches_lost = matches_lost + %s,
-                goals_scored = goals_scored + %s,
-                goals_conceded = goals_conceded + %s
-            WHERE id = %s
-        """, (1 if winner_id == player2_id else 0,
-              1 if is_draw else 0,
-              1 if winner_id == player1_id else 0,
-              player2_goals, player1_goals, player2_id))
-        
-        # Update tournament stats
-        for player_id, goals_scored, goals_conceded, is_winner in [
-            (player1_id, player1_goals, player2_goals, winner_id == player1_id),
-            (player2_id, player2_goals, player1_goals, winner_id == player2_id)
-        ]:
-            cursor.execute("""
-                INSERT INTO player_stats 
-                (player_id, tournament_id, matches_played, wins, draws, losses, goals_scored, goals_conceded)
-                VALUES (%s, %s, 1, %s, %s, %s, %s, %s)
-                ON CONFLICT (player_id, tournament_id)
-                DO UPDATE SET
-                    matches_played = player_stats.matches_played + 1,
-                    wins = player_stats.wins + %s,
-                    draws = player_stats.draws + %s,
-                    losses = player_stats.losses + %s,
-                    goals_scored = player_stats.goals_scored + %s,
-                    goals_conceded = player_stats.goals_conceded + %s
-            """, (player_id, tournament_id,
-                  1 if is_winner else 0,
-                  1 if is_draw else 0,
-                  1 if not is_winner and not is_draw else 0,
-                  goals_scored, goals_conceded,
-                  1 if is_winner else 0,
-                  1 if is_draw else 0,
-                  1 if not is_winner and not is_draw else 0,
-                  goals_scored, goals_conceded))
-        
-        # Calculate and update overall ratings for both players
-        new_overall_rating1 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player1_id, limit=40)
-        new_overall_rating2 = TournamentDB.calculate_overall_rating_from_last_matches(cursor, player2_id, limit=40)
-        
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating1, player1_id))
-        cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating2, player2_id))
-        
-        return match_id
+        return {
+            'matches': matches,
+            'next_token': encode_page_token(matches[-1], 'after') if matches and has_next else None,
+            'prev_token': encode_page_token(matches[0], 'before') if matches and has_prev else None
+        }
     
     @staticmethod
-    def get_all_matches(tournament_id=None, limit=None, offset=0, search_query=None):
-        """Get all matches (both regular and guest) with player details, with pagination and search support"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                # Union query to get both regular and guest matches with division info
-                query = """
-                    (
-                        SELECT pm.match_id, pm.tournament_id, pm.played_at,
-                               p1.name as player1_name, p2.name as player2_name,
-                               t.name as tournament_name,
-                               pm.player1_goals, pm.player2_goals,
-                               pm.winner_id, pm.is_draw, pm.is_walkover, pm.is_null_match,
-                               pm.player1_absent, pm.player2_absent,
-                               pm.player1_rating_before, pm.player2_rating_before,
-                               pm.player1_rating_after, pm.player2_rating_after,
-                               'regular' as match_type,
-                               pm.player1_id, pm.player2_id,
-                               pm.id as record_id,
-                               t.tournament_type,
-                               tp1.division_id as player1_division_id,
-                               d1.name as player1_division_name,
-                               tp2.division_id as player2_division_id,
-                               d2.name as player2_division_name
-                        FROM player_matches pm
-                        JOIN players p1 ON pm.player1_id = p1.id
-                        JOIN players p2 ON pm.player2_id = p2.id
-                        JOIN tournaments t ON pm.tournament_id = t.id
-                        LEFT JOIN tournament_players tp1 ON pm.player1_id = tp1.player_id AND pm.tournament_id = tp1.tournament_id
-                        LEFT JOIN divisions d1 ON tp1.division_id = d1.id
-                        LEFT JOIN tournament_players tp2 ON pm.player2_id = tp2.player_id AND pm.tournament_id = tp2.tournament_id
-                        LEFT JOIN divisions d2 ON tp2.division_id = d2.id
-                        {tournament_filter_regular}
-                    )
-                    UNION ALL
-                    (
-                        SELECT gm.match_id, gm.tournament_id, gm.played_at,
-                               p.name as player1_name, gm.guest_name as player2_name,
-                               t.name as tournament_name,
-                               gm.clan_goals as player1_goals, gm.guest_goals as player2_goals,
-                               CASE WHEN gm.clan_goals > gm.guest_goals THEN gm.clan_player_id
-                                    WHEN gm.guest_goals > gm.clan_goals THEN NULL
-                                    ELSE NULL END as winner_id,
-                               CASE WHEN gm.clan_goals = gm.guest_goals THEN true ELSE false END as is_draw,
-                               gm.is_walkover, gm.is_null_match,
-                               gm.clan_absent as player1_absent, gm.guest_absent as player2_absent,
-                               gm.clan_rating_before as player1_rating_before,
-                               300 as player2_rating_before,
-                               gm.clan_rating_after as player1_rating_after,
-                               300 as player2_rating_after,
-                               'guest' as match_type,
-                               gm.clan_player_id as player1_id, NULL as player2_id,
-                               gm.id as record_id,
-                               t.tournament_type,
-                               tp.division_id as player1_division_id,
-                               d.name as player1_division_name,
-                               NULL as player2_division_id,
-                               NULL as player2_division_name
-                        FROM guest_matches gm
-                        JOIN players p ON gm.clan_player_id = p.id
-                        JOIN tournaments t ON gm.tournament_id = t.id
-                        LEFT JOIN tournament_players tp ON gm.clan_player_id = tp.player_id AND gm.tournament_id = tp.tournament_id
-                        LEFT JOIN divisions d ON tp.division_id = d.id
-                        {tournament_filter_guest}
-                    )
-                    ORDER BY played_at DESC
-                """
-                
-                params = []
-                
-                # Build WHERE clauses for tournament and search filters
-                conditions_regular = []
-                conditions_guest = []
-                
-                if tournament_id:
-                    conditions_regular.append("pm.tournament_id = %s")
-                    conditions_guest.append("gm.tournament_id = %s")
-                    params.extend([tournament_id, tournament_id])
-                
-                if search_query:
-                    search_pattern = f"%{search_query.lower()}%"
-                    conditions_regular.append("(LOWER(p1.name) LIKE %s OR LOWER(p2.name) LIKE %s)")
-                    conditions_guest.append("(LOWER(p.name) LIKE %s OR LOWER(gm.guest_name) LIKE %s)")
-                    params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
-                
-                tournament_filter_regular = "WHERE " + " AND ".join(conditions_regular) if conditions_regular else ""
-                tournament_filter_guest = "WHERE " + " AND ".join(conditions_guest) if conditions_guest else ""
-                
-                query = query.format(
-                    tournament_filter_regular=tournament_filter_regular,
-                    tournament_filter_guest=tournament_filter_guest
-                )
-                
-                if limit:
-                    query += f" LIMIT %s OFFSET %s"
-                    params.extend([limit, offset])
-                
-                cursor.execute(query, params)
-                return cursor.fetchall()
-        finally:
-            conn.close()
-    
-    @staticmethod
-    def get_matches_count(tournament_id=None, search_query=None):
-        """Get total count of matches for pagination"""
+    def get_matches_count(tournament_id=None, search_query=None, max_age=None):
+        """Get total count of matches for pagination.
+
+        With max_age (seconds) a count this worker computed within that window
+        is reused instead of counting again.
+        """
+        cache_key = (tournament_id, search_query or None)
+        if max_age:
+            with _match_count_lock:
+                cached = _match_count_cache.get(cache_key)
+                if cached and time.monotonic() - cached[0] < max_age:
+                    _match_count_cache.move_to_end(cache_key)
+                    return cached[1]
+        
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                # Count query for both regular and guest matches
                 query = """
-                    SELECT COUNT(*) as total FROM (
-                        (
-                            SELECT pm.match_id
-                            FROM player_matches pm
-                            JOIN players p1 ON pm.player1_id = p1.id
-                            JOIN players p2 ON pm.player2_id = p2.id
-                            {tournament_filter_regular}
-                        )
-                        UNION ALL
-                        (
-                            SELECT gm.match_id
-                            FROM guest_matches gm
-                            JOIN players p ON gm.clan_player_id = p.id
-                            {tournament_filter_guest}
-                        )
-                    ) as all_matches
+                    SELECT (SELECT COUNT(*) FROM player_matches pm {filter_regular})
+                         + (SELECT COUNT(*) FROM guest_matches gm {filter_guest}) as total
                 """
                 
-                params = []
-                
-                # Build WHERE clauses for tournament and search filters
-                conditions_regular = []
-                conditions_guest = []
-                
-                if tournament_id:
-                    conditions_regular.append("pm.tournament_id = %s")
-                    conditions_guest.append("gm.tournament_id = %s")
-                    params.extend([tournament_id, tournament_id])
-                
-                if search_query:
-                    search_pattern = f"%{search_query.lower()}%"
-                    conditions_regular.append("(LOWER(p1.name) LIKE %s OR LOWER(p2.name) LIKE %s)")
-                    conditions_guest.append("(LOWER(p.name) LIKE %s OR LOWER(gm.guest_name) LIKE %s)")
-                    params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
+                filter_regular, filter_guest, params = TournamentDB._match_list_filters(tournament_id, search_query)
+                # Guest rows in player_matches are listed from guest_matches
+                filter_regular = (filter_regular + " AND " if filter_regular else "WHERE ") + "pm.player2_id IS NOT NULL"
                 
-                tournament_filter_regular = "WHERE " + " AND ".join(conditions_regular) if conditions_regular else ""
-                tournament_filter_guest = "WHERE " + " AND ".join(conditions_guest) if conditions_guest else ""
-                
-                query = query.format(
-                    tournament_filter_regular=tournament_filter_regular,
-                    tournament_filter_guest=tournament_filter_guest
-                )
-                
-                cursor.execute(query, params)
+                cursor.execute(query.format(filter_regular=filter_regular, filter_guest=filter_guest), params)
                 result = cursor.fetchone()
-                return result['total'] if result else 0
+                total = result['total'] if result else 0
         finally:
             conn.close()
+        
+        if max_age:
+            with _match_count_lock:
+                _match_count_cache[cache_key] = (time.monotonic(), total)
+                _match_count_cache.move_to_end(cache_key)
+                while len(_match_count_cache) > MATCH_COUNT_CACHE_MAX_ENTRIES:
+                    _match_count_cache.popitem(last=False)
+        return total
     
     @staticmethod
     def get_match_by_id(match_id):
@@ -3158,6 +4538,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def delete_match(match_id):
         """Delete a match and recalculate player ratings (handles both regular and guest matches)"""
         conn = get_db_connection()
@@ -3179,6 +4560,70 @@ class TournamentDB:
         finally:
             conn.close()
     
+    @staticmethod
+    @invalidates_reads
+    def delete_matches(match_ids):
+        """Delete several matches, replaying each affected tournament only once.
+
+        Regular matches are deleted together and every tournament is replayed
+        from its earliest deleted match forward; guest matches go through
+        _delete_guest_match. Returns (deleted_count, errors) where errors is a
+        list of (match_id, message).
+        """
+        match_ids = list(dict.fromkeys(match_ids))
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT match_id, tournament_id, played_at, player1_id, player2_id
+                    FROM player_matches
+                    WHERE match_id = ANY(%s) AND player2_id IS NOT NULL
+                """, (match_ids,))
+                regular = cursor.fetchall()
+                
+                # Earliest deleted match per tournament, in replay order
+                starts = {}
+                players = {}
+                for match in regular:
+                    key = (match['played_at'] is None, match['played_at'] or datetime.min, match['match_id'])
+                    current = starts.get(match['tournament_id'])
+                    if current is None or key < current[0]:
+                        starts[match['tournament_id']] = (key, match)
+                    players.setdefault(match['tournament_id'], set()).update(
+                        (match['player1_id'], match['player2_id'])
+                    )
+                
+                if regular:
+                    cursor.execute("DELETE FROM player_matches WHERE match_id = ANY(%s)",
+                                   ([match['match_id'] for match in regular],))
+                for tournament_id, (_, first) in starts.items():
+                    affected = TournamentDB._replay_tournament_from(
+                        cursor, tournament_id, first['played_at'], first['match_id']
+                    )
+                    TournamentDB._finish_partial_replay(cursor, tournament_id, affected | players[tournament_id])
+                
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        deleted_count = len(regular)
+        errors = []
+        regular_ids = {match['match_id'] for match in regular}
+        for match_id in match_ids:
+            if match_id in regular_ids:
+                continue
+            try:
+                if TournamentDB.get_match_by_id(match_id) is None:
+                    raise ValueError("Match not found")
+                TournamentDB._delete_guest_match(match_id)
+                deleted_count += 1
+            except Exception as e:
+                errors.append((match_id, str(e)))
+        return deleted_count, errors
+    
     @staticmethod
     def _delete_regular_match(match_id):
         """Delete a regular player vs player match"""
@@ -3192,8 +4637,12 @@ class TournamentDB:
                 
                 tournament_id = match['tournament_id']
                 
-                # Delete the match
+                # Delete the match and replay the matches that came after it
                 cursor.execute("DELETE FROM player_matches WHERE match_id = %s", (match_id,))
+                affected = TournamentDB._replay_tournament_from(cursor, tournament_id, match['played_at'], match_id)
+                TournamentDB._finish_partial_replay(
+                    cursor, tournament_id, affected | {match['player1_id'], match['player2_id']}
+                )
                 
                 conn.commit()
         except Exception as e:
@@ -3201,9 +4650,6 @@ class TournamentDB:
             raise
         finally:
             conn.close()
-        
-        # Recalculate tournament and overall ratings for the affected tournament
-        TournamentDB.recalculate_tournament_ratings(tournament_id)
     
     @staticmethod
     def _delete_guest_match(match_id):
@@ -3242,11 +4688,14 @@ class TournamentDB:
             with conn.cursor() as cursor:
                 new_overall_rating = TournamentDB.calculate_overall_rating_from_last_matches(cursor, clan_player_id, limit=40)
                 cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating, clan_player_id))
+                TournamentDB._refresh_award_standings(cursor)
+                TournamentDB._bump_data_versions(cursor, [tournament_id], [clan_player_id])
                 conn.commit()
         finally:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_player_details(player_id):
         """Get detailed player information"""
         conn = get_db_connection()
@@ -3258,6 +4707,114 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
+    def get_player_profile_bundle(player_id):
+        """Everything the public player profile shows, from three queries.
+
+        The player's matches are fetched once and the history, rating history
+        and trend, head-to-head records, form and goal totals are derived from
+        them. Returns None if the player doesn't exist.
+        """
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(PLAYER_PROFILE_SQL, {'player_id': player_id})
+                player = cursor.fetchone()
+                if not player:
+                    return None
+                
+                # Range scan on the ledger; guest matches (no opponent) are left
+                # out like in the other profile queries
+                cursor.execute("""
+                    SELECT pm.*, l.opponent_id, l.result as outcome,
+                           l.goals_for as player_goals, l.goals_against as opponent_goals,
+                           l.rating_before, l.rating_after, opp.name as opponent_name,
+                           CASE WHEN l.is_player1 THEN %(name)s ELSE opp.name END as player1_name,
+                           CASE WHEN l.is_player1 THEN opp.name ELSE %(name)s END as player2_name,
+                           t.name as tournament_name
+                    FROM player_match_ledger l
+                    JOIN player_matches pm ON pm.id = l.match_row_id
+                    JOIN players opp ON opp.id = l.opponent_id
+                    JOIN tournaments t ON t.id = l.tournament_id
+                    WHERE l.player_id = %(player_id)s
+                    ORDER BY l.played_at DESC, l.match_id DESC
+                """, {'player_id': player_id, 'name': player['name']})
+                matches = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        match_history = []
+        opponents = {}
+        for row in matches:
+            match = dict(row)
+            outcome = match.pop('outcome')
+            winner_id = match['winner_id']
+            if outcome == 'N':
+                result = 'Null Match'
+            elif match['is_walkover'] and outcome == 'W':
+                result = 'Win (W.O.)'
+            elif match['is_walkover'] and winner_id is not None:
+                result = 'Loss (W.O.)'
+            elif outcome == 'D':
+                result = 'Draw'
+            elif outcome == 'W':
+                result = 'Win'
+            else:
+                result = 'Loss'
+            match['result'] = result
+            match_history.append(match)
+            
+            opponent_id = match['opponent_id']
+            record = opponents.setdefault(opponent_id, {
+                'opponent_name': match['opponent_name'],
+                'opponent_id': opponent_id,
+                'total_matches': 0, 'wins': 0, 'draws': 0, 'losses': 0,
+                'goals_for': 0, 'goals_against': 0
+            })
+            record['total_matches'] += 1
+            if winner_id == player_id:
+                record['wins'] += 1
+            if match['is_draw']:
+                record['draws'] += 1
+            elif winner_id is not None and winner_id != player_id:
+                record['losses'] += 1
+            record['goals_for'] += match['player_goals'] or 0
+            record['goals_against'] += match['opponent_goals'] or 0
+        
+        vs_opponents = sorted(opponents.values(), key=lambda r: (r['total_matches'], r['wins']), reverse=True)
+        
+        rating_history = [{'rating': 300, 'date': player['created_at'], 'event': 'Player Created'}]
+        rating_history += [
+            {'rating': m['rating_after'], 'date': m['played_at'], 'event': f"Match vs {m['opponent_name']}"}
+            for m in reversed(match_history)
+        ]
+        rating_history.sort(key=lambda entry: (entry['date'] is None, entry['date'] or datetime.min))
+        
+        # Rating trend over the last 10 matches
+        rating_trend = []
+        recent_ratings = rating_history[-11:]
+        for previous, current in zip(recent_ratings, recent_ratings[1:]):
+            rating_trend.append({
+                'match': current['event'],
+                'change': (current['rating'] or 0) - (previous['rating'] or 0),
+                'rating': current['rating']
+            })
+        
+        return {
+            'player': player,
+            'rank': player['overall_rank'],
+            'match_history': match_history,
+            'rating_history': rating_history,
+            'rating_trend': rating_trend,
+            'vs_opponents': vs_opponents,
+            'recent_form': [m['result'] for m in match_history[:5]],
+            'total_goals_for': sum(m['player_goals'] or 0 for m in match_history),
+            'total_goals_against': sum(m['opponent_goals'] or 0 for m in match_history),
+            'awards': TournamentDB.get_player_awards(player_id)
+        }
+    
+    @staticmethod
+    @cached_read
     def get_player_match_history(player_id):
         """Get all matches for a specific player"""
         conn = get_db_connection()
@@ -3267,46 +4824,33 @@ class TournamentDB:
                     SELECT pm.*, 
                            p1.name as player1_name, p2.name as player2_name,
                            t.name as tournament_name,
+                           CASE WHEN l.is_player1 THEN p2.name ELSE p1.name END as opponent_name,
+                           l.goals_for as player_goals,
+                           l.goals_against as opponent_goals,
+                           l.rating_before,
+                           l.rating_after,
                            CASE 
-                               WHEN pm.player1_id = %s THEN p2.name
-                               ELSE p1.name
-                           END as opponent_name,
-                           CASE 
-                               WHEN pm.player1_id = %s THEN pm.player1_goals
-                               ELSE pm.player2_goals
-                           END as player_goals,
-                           CASE 
-                               WHEN pm.player1_id = %s THEN pm.player2_goals
-                               ELSE pm.player1_goals
-                           END as opponent_goals,
-                           CASE 
-                               WHEN pm.player1_id = %s THEN pm.player1_rating_before
-                               ELSE pm.player2_rating_before
-                           END as rating_before,
-                           CASE 
-                               WHEN pm.player1_id = %s THEN pm.player1_rating_after
-                               ELSE pm.player2_rating_after
-                           END as rating_after,
-                           CASE 
-                               WHEN pm.is_null_match THEN 'Null Match'
-                               WHEN pm.is_walkover AND pm.winner_id = %s THEN 'Win (W.O.)'
-                               WHEN pm.is_walkover AND pm.winner_id != %s THEN 'Loss (W.O.)'
-                               WHEN pm.is_draw THEN 'Draw'
-                               WHEN pm.winner_id = %s THEN 'Win'
+                               WHEN l.result = 'N' THEN 'Null Match'
+                               WHEN l.is_walkover AND l.result = 'W' THEN 'Win (W.O.)'
+                               WHEN l.is_walkover AND pm.winner_id IS NOT NULL THEN 'Loss (W.O.)'
+                               WHEN l.result = 'D' THEN 'Draw'
+                               WHEN l.result = 'W' THEN 'Win'
                                ELSE 'Loss'
                            END as result
-                    FROM player_matches pm
+                    FROM player_match_ledger l
+                    JOIN player_matches pm ON pm.id = l.match_row_id
                     JOIN players p1 ON pm.player1_id = p1.id
                     JOIN players p2 ON pm.player2_id = p2.id
                     JOIN tournaments t ON pm.tournament_id = t.id
-                    WHERE pm.player1_id = %s OR pm.player2_id = %s
-                    ORDER BY pm.played_at DESC
-                """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id))
+                    WHERE l.player_id = %s
+                    ORDER BY l.played_at DESC
+                """, (player_id,))
                 return cursor.fetchall()
         finally:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_player_tournament_participation(player_id):
         """Get all tournaments a player has participated in with their stats"""
         conn = get_db_connection()
@@ -3330,6 +4874,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_player_rating_history(player_id):
         """Get player rating changes over time"""
         conn = get_db_connection()
@@ -3340,24 +4885,14 @@ class TournamentDB:
                     SELECT 300 as rating, created_at as date, 'Player Created' as event
                     FROM players WHERE id = %s
                     UNION ALL
-                    SELECT 
-                        CASE 
-                            WHEN player1_id = %s THEN player1_rating_after
-                            ELSE player2_rating_after
-                        END as rating,
-                        played_at as date,
-                        CONCAT('Match vs ', 
-                            CASE 
-                                WHEN player1_id = %s THEN p2.name
-                                ELSE p1.name
-                            END
-                        ) as event
-                    FROM player_matches pm
-                    JOIN players p1 ON pm.player1_id = p1.id
-                    JOIN players p2 ON pm.player2_id = p2.id
-                    WHERE player1_id = %s OR player2_id = %s
+                    SELECT l.rating_after as rating,
+                           l.played_at as date,
+                           CONCAT('Match vs ', opp.name) as event
+                    FROM player_match_ledger l
+                    JOIN players opp ON opp.id = l.opponent_id
+                    WHERE l.player_id = %s
                     ORDER BY date ASC
-                """, (player_id, player_id, player_id, player_id, player_id))
+                """, (player_id, player_id))
                 return cursor.fetchall()
         finally:
             conn.close()
@@ -3374,6 +4909,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def edit_player(player_id, name, rating, initial_rating=None):
         """Edit player name, rating and initial rating"""
         conn = get_db_connection()
@@ -3404,6 +4940,8 @@ class TournamentDB:
                     "UPDATE players SET name = %s, rating = %s, initial_rating = %s WHERE id = %s",
                     (name.strip(), rating, initial_rating, player_id)
                 )
+                TournamentDB._refresh_award_standings(cursor)
+                TournamentDB._bump_data_versions(cursor, player_ids=[player_id], related=True)
                 conn.commit()
                 return player_id
         except Exception as e:
@@ -3413,6 +4951,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def update_player_photo(player_id, photo_url, photo_file_id):
         """Update player photo information"""
         conn = get_db_connection()
@@ -3429,6 +4968,7 @@ class TournamentDB:
                     "UPDATE players SET photo_url = %s, photo_file_id = %s WHERE id = %s",
                     (photo_url, photo_file_id, player_id)
                 )
+                TournamentDB._bump_data_versions(cursor, player_ids=[player_id], related=True)
                 conn.commit()
                 return player_id
         except Exception as e:
@@ -3438,6 +4978,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def remove_player_photo(player_id):
         """Remove player photo information"""
         conn = get_db_connection()
@@ -3457,6 +4998,7 @@ class TournamentDB:
                     "UPDATE players SET photo_url = NULL, photo_file_id = NULL WHERE id = %s",
                     (player_id,)
                 )
+                TournamentDB._bump_data_versions(cursor, player_ids=[player_id], related=True)
                 conn.commit()
                 return old_file_id
         except Exception as e:
@@ -3479,6 +5021,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def delete_player(player_id):
         """Delete a player and all associated data"""
         conn = get_db_connection()
@@ -3493,12 +5036,20 @@ class TournamentDB:
                 # Get photo info for cleanup before deletion
                 photo_file_id = player.get('photo_file_id')
                 
+                # Opponents and tournaments are found through the rows deleted below
+                TournamentDB._bump_data_versions(cursor, player_ids=[player_id], related=True)
+                
                 # Delete in correct order to maintain referential integrity
                 # 1. Delete player stats
                 cursor.execute("DELETE FROM player_stats WHERE player_id = %s", (player_id,))
                 
-                # 2. Delete player matches
-                cursor.execute("DELETE FROM player_matches WHERE player1_id = %s OR player2_id = %s", (player_id, player_id))
+                # 2. Delete player matches; checkpoints of their tournaments no longer match them
+                cursor.execute("""
+                    DELETE FROM rating_checkpoints WHERE tournament_id IN (
+                        SELECT tournament_id FROM player_match_ledger WHERE player_id = %s
+                    )
+                """, (player_id,))
+                cursor.execute(DELETE_PLAYER_MATCHES_SQL, {'player_id': player_id})
                 
                 # 3. Remove player from tournaments
                 cursor.execute("DELETE FROM tournament_players WHERE player_id = %s", (player_id,))
@@ -3506,6 +5057,9 @@ class TournamentDB:
                 # 4. Finally delete the player
                 cursor.execute("DELETE FROM players WHERE id = %s", (player_id,))
                 
+                # 5. Close the gaps the player leaves in every award ranking
+                TournamentDB._refresh_award_standings(cursor, tournament_ids=None)
+                
                 conn.commit()
                 
                 # Return photo_file_id for cleanup by the calling code
@@ -3517,6 +5071,7 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def delete_tournament(tournament_id):
         """Delete a tournament and all associated data"""
         conn = get_db_connection()
@@ -3531,6 +5086,9 @@ class TournamentDB:
                 # Get photo info for cleanup before deletion
                 tournament_photo_file_id = tournament.get('tournament_photo_file_id')
                 
+                # Players are found through the rows deleted below
+                TournamentDB._bump_data_versions(cursor, [tournament_id], related=True)
+                
                 # Delete in correct order to maintain referential integrity
                 # 1. Delete tournament-specific player stats
                 cursor.execute("DELETE FROM player_stats WHERE tournament_id = %s", (tournament_id,))
@@ -3547,6 +5105,9 @@ class TournamentDB:
                 # 5. Finally delete the tournament itself
                 cursor.execute("DELETE FROM tournaments WHERE id = %s", (tournament_id,))
                 
+                # 6. Drop the tournament's award rankings
+                TournamentDB._refresh_award_standings(cursor, [tournament_id], overall=False)
+                
                 conn.commit()
                 
                 # Return photo_file_id for cleanup by the calling code
@@ -3558,45 +5119,33 @@ class TournamentDB:
             conn.close()
     
     @staticmethod
+    @cached_read
     def get_player_vs_opponents(player_id):
         """Get head-to-head records against all opponents"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT 
-                        CASE 
-                            WHEN pm.player1_id = %s THEN p2.name
-                            ELSE p1.name
-                        END as opponent_name,
-                        CASE 
-                            WHEN pm.player1_id = %s THEN p2.id
-                            ELSE p1.id
-                        END as opponent_id,
-                        COUNT(*) as total_matches,
-                        SUM(CASE WHEN pm.winner_id = %s THEN 1 ELSE 0 END) as wins,
-                        SUM(CASE WHEN pm.is_draw THEN 1 ELSE 0 END) as draws,
-                        SUM(CASE WHEN pm.winner_id != %s AND NOT pm.is_draw THEN 1 ELSE 0 END) as losses,
-                        SUM(CASE 
-                            WHEN pm.player1_id = %s THEN pm.player1_goals
-                            ELSE pm.player2_goals
-                        END) as goals_for,
-                        SUM(CASE 
-                            WHEN pm.player1_id = %s THEN pm.player2_goals
-                            ELSE pm.player1_goals
-                        END) as goals_against
-                    FROM player_matches pm
-                    JOIN players p1 ON pm.player1_id = p1.id
-                    JOIN players p2 ON pm.player2_id = p2.id
-                    WHERE pm.player1_id = %s OR pm.player2_id = %s
-                    GROUP BY opponent_name, opponent_id
+                    SELECT opp.name as opponent_name,
+                           l.opponent_id,
+                           COUNT(*) as total_matches,
+                           SUM(CASE WHEN l.result = 'W' THEN 1 ELSE 0 END) as wins,
+                           SUM(CASE WHEN l.is_draw THEN 1 ELSE 0 END) as draws,
+                           SUM(CASE WHEN l.result = 'L' THEN 1 ELSE 0 END) as losses,
+                           SUM(l.goals_for) as goals_for,
+                           SUM(l.goals_against) as goals_against
+                    FROM player_match_ledger l
+                    JOIN players opp ON opp.id = l.opponent_id
+                    WHERE l.player_id = %s
+                    GROUP BY opp.name, l.opponent_id
                     ORDER BY total_matches DESC, wins DESC
-                """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id))
+                """, (player_id,))
                 return cursor.fetchall()
         finally:
             conn.close()
     
     @staticmethod
+    @invalidates_reads
     def edit_match(match_id, new_player1_goals, new_player2_goals, player1_absent=False, player2_absent=False, new_guest_name=None):
         """Edit a match and recalculate player ratings (handles both regular and guest matches)"""
         conn = get_db_connection()
@@ -3674,6 +5223,12 @@ class TournamentDB:
                 """, (new_player1_goals, new_player2_goals, new_winner_id, new_is_draw,
                       new_is_walkover, new_is_null_match, player1_absent, player2_absent, match_id))
                 
+                # Earlier matches are unaffected; replay from this match forward
+                affected = TournamentDB._replay_tournament_from(cursor, tournament_id, match['played_at'], match_id)
+                TournamentDB._finish_partial_replay(
+                    cursor, tournament_id, affected | {match['player1_id'], match['player2_id']}
+                )
+                
                 conn.commit()
         except Exception as e:
             conn.rollback()
@@ -3681,8 +5236,6 @@ class TournamentDB:
         finally:
             conn.close()
         
-        # Recalculate tournament and overall ratings for the affected tournament
-        TournamentDB.recalculate_tournament_ratings(tournament_id)
         return match_id
     
     @staticmethod
@@ -3763,6 +5316,8 @@ class TournamentDB:
             with conn.cursor() as cursor:
                 new_overall_rating = TournamentDB.calculate_overall_rating_from_last_matches(cursor, clan_player_id, limit=40)
                 cursor.execute("UPDATE players SET rating = %s WHERE id = %s", (new_overall_rating, clan_player_id))
+                TournamentDB._refresh_award_standings(cursor)
+                TournamentDB._bump_data_versions(cursor, [match['tournament_id']], [clan_player_id])
                 conn.commit()
         finally:
             conn.close()
@@ -3770,391 +5325,107 @@ class TournamentDB:
         return match_id
     
     @staticmethod
-    def get_golden_ball_overall():
-        """Get overall Golden Ball winner (best overall player based on rating and performance)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.rating, p.matches_played,
-                           p.matches_won, p.matches_drawn, p.matches_lost,
-                           p.goals_scored, p.goals_conceded,
-                           CASE WHEN p.matches_played > 0 
-                                THEN ROUND((p.matches_won * 100.0 / p.matches_played), 1) 
-                                ELSE 0 END as win_percentage,
-                           ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match,
-                           ROUND(p.goals_conceded::decimal / GREATEST(p.matches_played, 1), 2) as goals_conceded_per_match
-                    FROM players p
-                    WHERE p.matches_played >= 5
-                    ORDER BY p.rating DESC, win_percentage DESC, p.matches_played DESC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
-    
-    @staticmethod
-    def get_golden_ball_tournament(tournament_id):
-        """Get Golden Ball winner for a specific tournament (best overall player)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.rating, ps.matches_played,
-                           ps.wins, ps.draws, ps.losses,
-                           ps.goals_scored, ps.goals_conceded,
-                           CASE WHEN ps.matches_played > 0 
-                                THEN ROUND((ps.wins * 100.0 / ps.matches_played), 1) 
-                                ELSE 0 END as win_percentage,
-                           ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played), 2) as goals_per_match,
-                           ROUND(ps.goals_conceded::decimal / GREATEST(ps.matches_played, 1), 2) as goals_conceded_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played >= 3
-                    ORDER BY win_percentage DESC, ps.goals_scored DESC, ps.goals_conceded ASC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
-    
-    @staticmethod
-    def get_golden_ball_top_players(limit=10, tournament_id=None):
-        """Get top Golden Ball candidates (best overall players)"""
+    @cached_read
+    def _get_award_standings(award, tournament_id=None, limit=None, rank=None):
+        """Ranked award rows from award_standings with the player's current stats.
+
+        Overall rows carry players totals (matches_won/drawn/lost); tournament
+        rows carry player_stats totals (wins/draws/losses).
+        """
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 if tournament_id:
                     cursor.execute("""
-                        SELECT p.id, p.name, p.rating, ps.matches_played,
+                        SELECT s.rank, p.id, p.name, p.rating, ps.matches_played,
                                ps.wins, ps.draws, ps.losses,
-                               ps.goals_scored, ps.goals_conceded,
+                               ps.goals_scored, ps.goals_conceded, ps.clean_sheets, ps.golden_glove_points,
                                CASE WHEN ps.matches_played > 0 
                                     THEN ROUND((ps.wins * 100.0 / ps.matches_played), 1) 
                                     ELSE 0 END as win_percentage,
                                ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match,
-                               ROUND(ps.goals_conceded::decimal / GREATEST(ps.matches_played, 1), 2) as goals_conceded_per_match
-                        FROM players p
-                        JOIN player_stats ps ON p.id = ps.player_id
-                        WHERE ps.tournament_id = %s AND ps.matches_played >= 3
-                        ORDER BY win_percentage DESC, ps.goals_scored DESC, ps.goals_conceded ASC
+                               ROUND(ps.goals_conceded::decimal / GREATEST(ps.matches_played, 1), 2) as goals_conceded_per_match,
+                               ROUND(ps.golden_glove_points::decimal / GREATEST(ps.matches_played, 1), 2) as points_per_match
+                        FROM award_standings s
+                        JOIN players p ON p.id = s.player_id
+                        JOIN player_stats ps ON ps.player_id = s.player_id AND ps.tournament_id = s.tournament_id
+                        WHERE s.tournament_id = %s AND s.award = %s
+                          AND (%s::int IS NULL OR s.rank = %s)
+                        ORDER BY s.rank
                         LIMIT %s
-                    """, (tournament_id, limit))
+                    """, (tournament_id, award, rank, rank, limit))
                 else:
                     cursor.execute("""
-                        SELECT p.id, p.name, p.rating, p.matches_played,
+                        SELECT s.rank, p.id, p.name, p.rating, p.matches_played,
                                p.matches_won, p.matches_drawn, p.matches_lost,
-                               p.goals_scored, p.goals_conceded,
+                               p.goals_scored, p.goals_conceded, p.clean_sheets, p.golden_glove_points,
                                CASE WHEN p.matches_played > 0 
                                     THEN ROUND((p.matches_won * 100.0 / p.matches_played), 1) 
                                     ELSE 0 END as win_percentage,
                                ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match,
-                               ROUND(p.goals_conceded::decimal / GREATEST(p.matches_played, 1), 2) as goals_conceded_per_match
-                        FROM players p
-                        WHERE p.matches_played >= 5
-                        ORDER BY p.rating DESC, win_percentage DESC, p.matches_played DESC
+                               ROUND(p.goals_conceded::decimal / GREATEST(p.matches_played, 1), 2) as goals_conceded_per_match,
+                               ROUND(p.golden_glove_points::decimal / GREATEST(p.matches_played, 1), 2) as points_per_match
+                        FROM award_standings s
+                        JOIN players p ON p.id = s.player_id
+                        WHERE s.tournament_id = %s AND s.award = %s
+                          AND (%s::int IS NULL OR s.rank = %s)
+                        ORDER BY s.rank
                         LIMIT %s
-                    """, (limit,))
+                    """, (OVERALL_AWARD_SCOPE, award, rank, rank, limit))
                 return cursor.fetchall()
         finally:
             conn.close()
     
     @staticmethod
-    def get_golden_boot_overall():
-        """Get overall Golden Boot winner (most goals scored)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.goals_scored, p.matches_played,
-                           ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match
-                    FROM players p
-                    WHERE p.matches_played > 0
-                    ORDER BY p.goals_scored DESC, goals_per_match DESC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
-    
-    @staticmethod
-    def get_golden_glove_overall():
-        """Get overall Golden Glove winner (best goals conceded per match, min 10 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.goals_conceded, p.matches_played,
-                           ROUND(p.goals_conceded::decimal / p.matches_played, 2) as goals_conceded_per_match,
-                           p.matches_played - (p.matches_won + p.matches_drawn + p.matches_lost) as clean_sheets
-                    FROM players p
-                    WHERE p.matches_played >= 10
-                    ORDER BY goals_conceded_per_match ASC, p.goals_conceded ASC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
-    
-    @staticmethod
-    def get_golden_boot_tournament(tournament_id):
-        """Get Golden Boot winner for a specific tournament"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, ps.goals_scored, ps.matches_played,
-                           ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played > 0
-                    ORDER BY ps.goals_scored DESC, goals_per_match DESC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
+    def _get_award_winner(award, tournament_id=None):
+        """Rank 1 of an award, or None when nobody qualifies"""
+        rows = TournamentDB._get_award_standings(award, tournament_id, rank=1)
+        return rows[0] if rows else None
     
     @staticmethod
-    def get_golden_glove_tournament(tournament_id):
-        """Get Golden Glove winner for a specific tournament (min 10 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, ps.goals_conceded, ps.matches_played,
-                           ROUND(ps.goals_conceded::decimal / ps.matches_played, 2) as goals_conceded_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played >= 10
-                    ORDER BY goals_conceded_per_match ASC, ps.goals_conceded ASC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
-                             
     def get_golden_ball_overall():
-        """Get overall Golden Ball winner (best overall player based on rating and performance)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.rating, p.matches_played,
-                           p.matches_won, p.matches_drawn, p.matches_lost,
-                           p.goals_scored, p.goals_conceded,
-                           CASE WHEN p.matches_played > 0 
-                                THEN ROUND((p.matches_won * 100.0 / p.matches_played), 1) 
-                                ELSE 0 END as win_percentage,
-                           ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match,
-                           ROUND(p.goals_conceded::decimal / GREATEST(p.matches_played, 1), 2) as goals_conceded_per_match
-                    FROM players p
-                    WHERE p.matches_played >= 5
-                    ORDER BY p.rating DESC, win_percentage DESC, p.matches_played DESC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        """Get overall Golden Ball winner (best overall player based on rating and performance, min 5 matches)"""
+        return TournamentDB._get_award_winner('golden_ball')
     
     @staticmethod
     def get_golden_ball_tournament(tournament_id):
-        """Get Golden Ball winner for a specific tournament (best overall player)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.rating, ps.matches_played,
-                           ps.wins, ps.draws, ps.losses,
-                           ps.goals_scored, ps.goals_conceded,
-                           CASE WHEN ps.matches_played > 0 
-                                THEN ROUND((ps.wins * 100.0 / ps.matches_played), 1) 
-                                ELSE 0 END as win_percentage,
-                           ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match,
-                           ROUND(ps.goals_conceded::decimal / GREATEST(ps.matches_played, 1), 2) as goals_conceded_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played >= 3
-                    ORDER BY win_percentage DESC, ps.goals_scored DESC, ps.goals_conceded ASC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        """Get Golden Ball winner for a specific tournament (best win rate, min 3 matches)"""
+        return TournamentDB._get_award_winner('golden_ball', tournament_id)
     
     @staticmethod
     def get_golden_ball_top_players(limit=10, tournament_id=None):
         """Get top Golden Ball candidates (best overall players)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                if tournament_id:
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.rating, ps.matches_played,
-                               ps.wins, ps.draws, ps.losses,
-                               ps.goals_scored, ps.goals_conceded,
-                               CASE WHEN ps.matches_played > 0 
-                                    THEN ROUND((ps.wins * 100.0 / ps.matches_played), 1) 
-                                    ELSE 0 END as win_percentage,
-                               ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match,
-                               ROUND(ps.goals_conceded::decimal / GREATEST(ps.matches_played, 1), 2) as goals_conceded_per_match
-                        FROM players p
-                        JOIN player_stats ps ON p.id = ps.player_id
-                        WHERE ps.tournament_id = %s AND ps.matches_played >= 3
-                        ORDER BY win_percentage DESC, ps.goals_scored DESC, ps.goals_conceded ASC
-                        LIMIT %s
-                    """, (tournament_id, limit))
-                else:
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.rating, p.matches_played,
-                               p.matches_won, p.matches_drawn, p.matches_lost,
-                               p.goals_scored, p.goals_conceded,
-                               CASE WHEN p.matches_played > 0 
-                                    THEN ROUND((p.matches_won * 100.0 / p.matches_played), 1) 
-                                    ELSE 0 END as win_percentage,
-                               ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match,
-                               ROUND(p.goals_conceded::decimal / GREATEST(p.matches_played, 1), 2) as goals_conceded_per_match
-                        FROM players p
-                        WHERE p.matches_played >= 5
-                        ORDER BY p.rating DESC, win_percentage DESC, p.matches_played DESC
-                        LIMIT %s
-                    """, (limit,))
-                return cursor.fetchall()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_standings('golden_ball', tournament_id, limit)
     
     @staticmethod
     def get_golden_boot_overall():
         """Get overall Golden Boot winner (most goals scored)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.goals_scored, p.matches_played,
-                           ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match
-                    FROM players p
-                    WHERE p.matches_played > 0
-                    ORDER BY p.goals_scored DESC, goals_per_match DESC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_boot')
     
     @staticmethod
     def get_golden_glove_overall():
         """Get overall Golden Glove winner (best goals conceded per match, min 10 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.goals_conceded, p.matches_played,
-                           ROUND(p.goals_conceded::decimal / p.matches_played, 2) as goals_conceded_per_match,
-                           p.matches_played - (p.matches_won + p.matches_drawn + p.matches_lost) as clean_sheets
-                    FROM players p
-                    WHERE p.matches_played >= 10
-                    ORDER BY goals_conceded_per_match ASC, p.goals_conceded ASC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_glove')
     
     @staticmethod
     def get_golden_boot_tournament(tournament_id):
         """Get Golden Boot winner for a specific tournament"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, ps.goals_scored, ps.matches_played,
-                           ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played > 0
-                    ORDER BY ps.goals_scored DESC, goals_per_match DESC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_boot', tournament_id)
     
     @staticmethod
     def get_golden_glove_tournament(tournament_id):
         """Get Golden Glove winner for a specific tournament (min 10 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, ps.goals_conceded, ps.matches_played,
-                           ROUND(ps.goals_conceded::decimal / ps.matches_played, 2) as goals_conceded_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played >= 10
-                    ORDER BY goals_conceded_per_match ASC, ps.goals_conceded ASC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_glove', tournament_id)
     
     @staticmethod
     def get_golden_boot_top_players(limit=10, tournament_id=None):
         """Get top Golden Boot candidates"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                if tournament_id:
-                    cursor.execute("""
-                        SELECT p.id, p.name, ps.goals_scored, ps.matches_played,
-                               ROUND(ps.goals_scored::decimal / GREATEST(ps.matches_played, 1), 2) as goals_per_match
-                        FROM players p
-                        JOIN player_stats ps ON p.id = ps.player_id
-                        WHERE ps.tournament_id = %s AND ps.matches_played > 0
-                        ORDER BY ps.goals_scored DESC, goals_per_match DESC
-                        LIMIT %s
-                    """, (tournament_id, limit))
-                else:
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.goals_scored, p.matches_played,
-                               ROUND(p.goals_scored::decimal / GREATEST(p.matches_played, 1), 2) as goals_per_match
-                        FROM players p
-                        WHERE p.matches_played > 0
-                        ORDER BY p.goals_scored DESC, goals_per_match DESC
-                        LIMIT %s
-                    """, (limit,))
-                return cursor.fetchall()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_standings('golden_boot', tournament_id, limit)
     
     @staticmethod
     def get_golden_glove_top_players(limit=10, tournament_id=None):
         """Get top Golden Glove candidates (min 10 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                if tournament_id:
-                    cursor.execute("""
-                        SELECT p.id, p.name, ps.goals_conceded, ps.matches_played,
-                               ROUND(ps.goals_conceded::decimal / ps.matches_played, 2) as goals_conceded_per_match
-                        FROM players p
-                        JOIN player_stats ps ON p.id = ps.player_id
-                        WHERE ps.tournament_id = %s AND ps.matches_played >= 10
-                        ORDER BY goals_conceded_per_match ASC, ps.goals_conceded ASC
-                        LIMIT %s
-                    """, (tournament_id, limit))
-                else:
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.goals_conceded, p.matches_played,
-                               ROUND(p.goals_conceded::decimal / p.matches_played, 2) as goals_conceded_per_match
-                        FROM players p
-                        WHERE p.matches_played >= 10
-                        ORDER BY goals_conceded_per_match ASC, p.goals_conceded ASC
-                        LIMIT %s
-                    """, (limit,))
-                return cursor.fetchall()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_standings('golden_glove', tournament_id, limit)
     
     @staticmethod
     def calculate_golden_glove_points(player_goals, opponent_goals, is_winner, is_draw):
@@ -4164,170 +5435,107 @@ class TournamentDB:
         - Goal conceded penalty (-1 per goal)
         - Win bonus (+2) if winner
         """
-        points = 0
-        
-        # Clean sheet bonus
-        if opponent_goals == 0:
-            points += 5
-        
-        # Win bonus
-        if is_winner:
-            points += 2
-        
-        # Goal conceded penalty
-        points -= opponent_goals
-        
-        return points
+        return rating_engine.golden_glove_points(player_goals, opponent_goals, is_winner, is_draw)
     
     @staticmethod
     def get_golden_glove_points_overall():
         """Get overall Golden Glove winner by points (min 4 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, p.golden_glove_points, p.matches_played, p.clean_sheets,
-                           ROUND(p.golden_glove_points::decimal / p.matches_played, 2) as points_per_match
-                    FROM players p
-                    WHERE p.matches_played >= 4
-                    ORDER BY p.golden_glove_points DESC, points_per_match DESC
-                    LIMIT 1
-                """)
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_glove_points')
     
     @staticmethod
     def get_golden_glove_points_tournament(tournament_id):
         """Get Golden Glove winner for a specific tournament by points (min 4 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT p.id, p.name, ps.golden_glove_points, ps.matches_played, ps.clean_sheets,
-                           ROUND(ps.golden_glove_points::decimal / ps.matches_played, 2) as points_per_match
-                    FROM players p
-                    JOIN player_stats ps ON p.id = ps.player_id
-                    WHERE ps.tournament_id = %s AND ps.matches_played >= 4
-                    ORDER BY ps.golden_glove_points DESC, points_per_match DESC
-                    LIMIT 1
-                """, (tournament_id,))
-                return cursor.fetchone()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_winner('golden_glove_points', tournament_id)
     
     @staticmethod
     def get_golden_glove_points_top_players(limit=10, tournament_id=None):
         """Get top Golden Glove candidates by points (min 4 matches)"""
-        conn = get_db_connection()
-        try:
-            with conn.cursor() as cursor:
-                if tournament_id:
-                    cursor.execute("""
-                        SELECT p.id, p.name, ps.golden_glove_points, ps.matches_played, ps.clean_sheets,
-                               ROUND(ps.golden_glove_points::decimal / ps.matches_played, 2) as points_per_match
-                        FROM players p
-                        JOIN player_stats ps ON p.id = ps.player_id
-                        WHERE ps.tournament_id = %s AND ps.matches_played >= 4
-                        ORDER BY ps.golden_glove_points DESC, points_per_match DESC
-                        LIMIT %s
-                    """, (tournament_id, limit))
-                else:
-                    cursor.execute("""
-                        SELECT p.id, p.name, p.golden_glove_points, p.matches_played, p.clean_sheets,
-                               ROUND(p.golden_glove_points::decimal / p.matches_played, 2) as points_per_match
-                        FROM players p
-                        WHERE p.matches_played >= 4
-                        ORDER BY p.golden_glove_points DESC, points_per_match DESC
-                        LIMIT %s
-                    """, (limit,))
-                return cursor.fetchall()
-        finally:
-            conn.close()
+        return TournamentDB._get_award_standings('golden_glove_points', tournament_id, limit)
     
     @staticmethod
+    @cached_read
     def get_player_awards(player_id):
-        """Get all Golden Boot and Golden Glove awards for a player"""
+        """Get all Golden Ball, Golden Boot and Golden Glove awards for a player"""
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
-                awards = []
-                
-                # Check overall Golden Ball
-                golden_ball_overall = TournamentDB.get_golden_ball_overall()
-                if golden_ball_overall and golden_ball_overall['id'] == player_id:
-                    awards.append({
-                        'type': 'Golden Ball',
-                        'scope': 'Overall',
-                        'tournament': None,
-                        'value': golden_ball_overall['rating'],
-                        'description': f"Best overall player - {golden_ball_overall['rating']} rating, {golden_ball_overall['win_percentage']}% win rate"
-                    })
-                
-                # Check overall Golden Boot
-                golden_boot_overall = TournamentDB.get_golden_boot_overall()
-                if golden_boot_overall and golden_boot_overall['id'] == player_id:
-                    awards.append({
-                        'type': 'Golden Boot',
-                        'scope': 'Overall',
-                        'tournament': None,
-                        'value': golden_boot_overall['goals_scored'],
-                        'description': f"{golden_boot_overall['goals_scored']} goals in {golden_boot_overall['matches_played']} matches"
-                    })
-                
-                # Check overall Golden Glove
-                golden_glove_overall = TournamentDB.get_golden_glove_overall()
-                if golden_glove_overall and golden_glove_overall['id'] == player_id:
-                    awards.append({
-                        'type': 'Golden Glove',
-                        'scope': 'Overall',
-                        'tournament': None,
-                        'value': golden_glove_overall['goals_conceded_per_match'],
-                        'description': f"{golden_glove_overall['goals_conceded_per_match']} goals conceded per match"
-                    })
-                
-                # Check tournament-specific awards
+                # Every scope the player currently leads, in one indexed lookup
                 cursor.execute("""
-                    SELECT DISTINCT t.id, t.name
-                    FROM tournaments t
-                    JOIN player_stats ps ON t.id = ps.tournament_id
-                    WHERE ps.player_id = %s
-                """, (player_id,))
-                tournaments = cursor.fetchall()
+                    SELECT s.tournament_id, s.award, t.name AS tournament_name,
+                           p.rating, v.matches_played, v.goals_scored,
+                           CASE WHEN v.matches_played > 0 
+                                THEN ROUND((v.wins * 100.0 / v.matches_played), 1) 
+                                ELSE 0 END as win_percentage,
+                           ROUND(v.goals_conceded::decimal / GREATEST(v.matches_played, 1), 2) as goals_conceded_per_match
+                    FROM award_standings s
+                    JOIN players p ON p.id = s.player_id
+                    LEFT JOIN player_stats ps ON ps.player_id = s.player_id AND ps.tournament_id = s.tournament_id
+                    LEFT JOIN tournaments t ON t.id = s.tournament_id
+                    CROSS JOIN LATERAL (
+                        SELECT CASE WHEN s.tournament_id = %(overall_scope)s THEN p.matches_played ELSE ps.matches_played END AS matches_played,
+                               CASE WHEN s.tournament_id = %(overall_scope)s THEN p.matches_won ELSE ps.wins END AS wins,
+                               CASE WHEN s.tournament_id = %(overall_scope)s THEN p.goals_scored ELSE ps.goals_scored END AS goals_scored,
+                               CASE WHEN s.tournament_id = %(overall_scope)s THEN p.goals_conceded ELSE ps.goals_conceded END AS goals_conceded
+                    ) v
+                    WHERE s.player_id = %(player_id)s AND s.rank = 1
+                      AND s.award IN ('golden_ball', 'golden_boot', 'golden_glove')
+                    ORDER BY s.tournament_id,
+                             CASE s.award WHEN 'golden_ball' THEN 1 WHEN 'golden_boot' THEN 2 ELSE 3 END
+                """, {'player_id': player_id, 'overall_scope': OVERALL_AWARD_SCOPE})
                 
-                for tournament in tournaments:
-                    # Check Golden Ball for this tournament
-                    golden_ball_tournament = TournamentDB.get_golden_ball_tournament(tournament['id'])
-                    if golden_ball_tournament and golden_ball_tournament['id'] == player_id:
-                        awards.append({
-                            'type': 'Golden Ball',
-                            'scope': 'Tournament',
-                            'tournament': tournament['name'],
-                            'value': golden_ball_tournament['win_percentage'],
-                            'description': f"Best overall player in {tournament['name']} - {golden_ball_tournament['win_percentage']}% win rate"
-                        })
-                    
-                    # Check Golden Boot for this tournament
-                    golden_boot_tournament = TournamentDB.get_golden_boot_tournament(tournament['id'])
-                    if golden_boot_tournament and golden_boot_tournament['id'] == player_id:
-                        awards.append({
-                            'type': 'Golden Boot',
-                            'scope': 'Tournament',
-                            'tournament': tournament['name'],
-                            'value': golden_boot_tournament['goals_scored'],
-                            'description': f"{golden_boot_tournament['goals_scored']} goals in {tournament['name']}"
-                        })
-                    
-                    # Check Golden Glove for this tournament
-                    golden_glove_tournament = TournamentDB.get_golden_glove_tournament(tournament['id'])
-                    if golden_glove_tournament and golden_glove_tournament['id'] == player_id:
-                        awards.append({
-                            'type': 'Golden Glove',
-                            'scope': 'Tournament',
-                            'tournament': tournament['name'],
-                            'value': golden_glove_tournament['goals_conceded_per_match'],
-                            'description': f"{golden_glove_tournament['goals_conceded_per_match']} goals conceded per match in {tournament['name']}"
-                        })
+                awards = []
+                for row in cursor.fetchall():
+                    if row['tournament_id'] == OVERALL_AWARD_SCOPE:
+                        if row['award'] == 'golden_ball':
+                            awards.append({
+                                'type': 'Golden Ball',
+                                'scope': 'Overall',
+                                'tournament': None,
+                                'value': row['rating'],
+                                'description': f"Best overall player - {row['rating']} rating, {row['win_percentage']}% win rate"
+                            })
+                        elif row['award'] == 'golden_boot':
+                            awards.append({
+                                'type': 'Golden Boot',
+                                'scope': 'Overall',
+                                'tournament': None,
+                                'value': row['goals_scored'],
+                                'description': f"{row['goals_scored']} goals in {row['matches_played']} matches"
+                            })
+                        else:
+                            awards.append({
+                                'type': 'Golden Glove',
+                                'scope': 'Overall',
+                                'tournament': None,
+                                'value': row['goals_conceded_per_match'],
+                                'description': f"{row['goals_conceded_per_match']} goals conceded per match"
+                            })
+                    else:
+                        tournament_name = row['tournament_name']
+                        if row['award'] == 'golden_ball':
+                            awards.append({
+                                'type': 'Golden Ball',
+                                'scope': 'Tournament',
+                                'tournament': tournament_name,
+                                'value': row['win_percentage'],
+                                'description': f"Best overall player in {tournament_name} - {row['win_percentage']}% win rate"
+                            })
+                        elif row['award'] == 'golden_boot':
+                            awards.append({
+                                'type': 'Golden Boot',
+                                'scope': 'Tournament',
+                                'tournament': tournament_name,
+                                'value': row['goals_scored'],
+                                'description': f"{row['goals_scored']} goals in {tournament_name}"
+                            })
+                        else:
+                            awards.append({
+                                'type': 'Golden Glove',
+                                'scope': 'Tournament',
+                                'tournament': tournament_name,
+                                'value': row['goals_conceded_per_match'],
+                                'description': f"{row['goals_conceded_per_match']} goals conceded per match in {tournament_name}"
+                            })
                 
                 return awards
         finally:
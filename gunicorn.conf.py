@@ -39,4 +39,27 @@ wsgi_file = "app:app"
 pythonpath = "."
 
 # Preload application for better performance
-preload_app = True
\ No newline at end of file
+preload_app = True
+# Background recalculation worker (worker.py), started next to the web server.
+# Set RECALC_WORKER_EMBEDDED=0 when it runs as a separate service.
+_recalc_worker = None
+
+
+def when_ready(server):
+    global _recalc_worker
+    if os.environ.get('RECALC_WORKER_EMBEDDED', '1') == '0':
+        return
+    import subprocess
+    import sys
+    worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+    _recalc_worker = subprocess.Popen([sys.executable, worker_script])
+    server.log.info(f"Started recalculation worker (pid {_recalc_worker.pid})")
+
+
+def on_exit(server):
+    if _recalc_worker and _recalc_worker.poll() is None:
+        _recalc_worker.terminate()
+        try:
+            _recalc_worker.wait(timeout=30)
+        except Exception:
+            _recalc_worker.kill()
@@ -0,0 +1,368 @@
+"""In-memory rating replay engine.
+
+Every recalculation path (full rebuild, single tournament, live recalculation,
+bulk recording) applies matches through the functions in this module so the
+rating rules live in one place. Nothing here touches the database: callers
+load matches and starting ratings, replay them here and persist the result
+with TournamentDB's batched writers.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_RATING = 300
+GUEST_RATING = 300
+MIN_RATING = 0
+MAX_RATING = 1000
+
+K_FACTOR = 32
+NULL_MATCH_PENALTY = 15
+WALKOVER_FACTOR = 0.75
+
+# Enhanced rating constants
+GOAL_SCORED_POINTS = 2      # +2 points per goal scored
+GOAL_CONCEDED_PENALTY = -1  # -1 point per goal conceded
+CLEAN_SHEET_BONUS = 5       # +5 points for clean sheet
+
+STAT_FIELDS = ('matches_played', 'wins', 'draws', 'losses', 'goals_scored',
+               'goals_conceded', 'clean_sheets', 'golden_glove_points')
+
+# Matches between two stored tournament checkpoints
+CHECKPOINT_INTERVAL = 50
+
+
+def clamp_rating(rating):
+    """Keep a rating within the 0-1000 bounds"""
+    return max(MIN_RATING, min(MAX_RATING, rating))
+
+
+def rating_change(winner_rating, loser_rating, is_draw=False):
+    """Calculate rating change based on ELO-like system"""
+    expected_winner = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
+    expected_loser = 1 / (1 + 10 ** ((winner_rating - loser_rating) / 400))
+
+    if is_draw:
+        winner_change = K_FACTOR * (0.5 - expected_winner)
+        loser_change = K_FACTOR * (0.5 - expected_loser)
+    else:
+        winner_change = K_FACTOR * (1 - expected_winner)
+        loser_change = K_FACTOR * (0 - expected_loser)
+
+    return int(round(winner_change)), int(round(loser_change))
+
+
+def enhanced_rating_change(player1_rating, player2_rating, player1_goals, player2_goals,
+                           player1_absent=False, player2_absent=False):
+    """Calculate enhanced rating change with constant points for goals and clean sheets"""
+    if player1_goals == player2_goals:
+        base_change1, base_change2 = rating_change(player1_rating, player2_rating, is_draw=True)
+    elif player1_goals > player2_goals:
+        base_change1, base_change2 = rating_change(player1_rating, player2_rating)
+    else:
+        base_change2, base_change1 = rating_change(player2_rating, player1_rating)
+
+    constant_points1 = 0
+    if not player1_absent:
+        constant_points1 += player1_goals * GOAL_SCORED_POINTS
+        constant_points1 += player2_goals * GOAL_CONCEDED_PENALTY
+        if player2_goals == 0:
+            constant_points1 += CLEAN_SHEET_BONUS
+
+    constant_points2 = 0
+    if not player2_absent:
+        constant_points2 += player2_goals * GOAL_SCORED_POINTS
+        constant_points2 += player1_goals * GOAL_CONCEDED_PENALTY
+        if player1_goals == 0:
+            constant_points2 += CLEAN_SHEET_BONUS
+
+    return int(round(base_change1 + constant_points1)), int(round(base_change2 + constant_points2))
+
+
+def golden_glove_points(player_goals, opponent_goals, is_winner, is_draw):
+    """Golden Glove points: +5 clean sheet, +2 win, -1 per goal conceded"""
+    points = 0
+    if opponent_goals == 0:
+        points += 5
+    if is_winner:
+        points += 2
+    points -= opponent_goals
+    return points
+
+
+def rate_match(match, rating1, rating2):
+    """Return both players' ratings after a match, given their ratings before it.
+
+    ``match`` is a player_matches-shaped mapping. A walkover goes to
+    ``winner_id`` (player 2 when it is not player 1, which also covers a guest
+    winning by walkover).
+    """
+    if match.get('is_null_match'):
+        return clamp_rating(rating1 - NULL_MATCH_PENALTY), clamp_rating(rating2 - NULL_MATCH_PENALTY)
+
+    if match.get('is_walkover'):
+        if match.get('winner_id') == match['player1_id']:
+            change_winner, change_loser = rating_change(rating1, rating2)
+            change1 = int(change_winner * WALKOVER_FACTOR)
+            change2 = int(change_loser * WALKOVER_FACTOR)
+        else:
+            change_winner, change_loser = rating_change(rating2, rating1)
+            change2 = int(change_winner * WALKOVER_FACTOR)
+            change1 = int(change_loser * WALKOVER_FACTOR)
+        return clamp_rating(rating1 + change1), clamp_rating(rating2 + change2)
+
+    change1, change2 = enhanced_rating_change(
+        rating1, rating2, match['player1_goals'], match['player2_goals'],
+        match.get('player1_absent', False), match.get('player2_absent', False)
+    )
+    return clamp_rating(rating1 + change1), clamp_rating(rating2 + change2)
+
+
+def new_totals():
+    """Empty per-player stat accumulator"""
+    return dict.fromkeys(STAT_FIELDS, 0)
+
+
+def match_stats(match, player_id):
+    """Stat increments a match contributes to one of its players (None for null matches)"""
+    if match.get('is_null_match'):
+        return None
+
+    is_player1 = match['player1_id'] == player_id
+    goals_for = match['player1_goals'] if is_player1 else match['player2_goals']
+    goals_against = match['player2_goals'] if is_player1 else match['player1_goals']
+    is_winner = match.get('winner_id') == player_id
+    is_draw = bool(match.get('is_draw'))
+
+    stats = {
+        'matches_played': 1,
+        'wins': 1 if is_winner else 0,
+        'draws': 1 if is_draw else 0,
+        'losses': 1 if not is_winner and not is_draw else 0,
+        'goals_scored': 0,
+        'goals_conceded': 0,
+        'clean_sheets': 0,
+        'golden_glove_points': 0
+    }
+    if not match.get('is_walkover'):
+        # Walkovers count as a result only: no goals, clean sheets or glove points
+        stats['goals_scored'] = goals_for or 0
+        stats['goals_conceded'] = goals_against or 0
+        stats['clean_sheets'] = 1 if not goals_against else 0
+        stats['golden_glove_points'] = golden_glove_points(
+            goals_for or 0, goals_against or 0, is_winner, is_draw
+        )
+    return stats
+
+
+def add_stats(totals, stats):
+    """Accumulate match_stats() increments into a totals dict"""
+    for field in STAT_FIELDS:
+        totals[field] += stats[field]
+
+
+class ReplayResult:
+    """Outcome of replaying one tournament"""
+
+    def __init__(self):
+        # (player_matches.id, p1 before, p2 before, p1 after, p2 after) in match order
+        self.match_ratings = []
+        # player_id -> stat totals plus 'tournament_rating' (players with non-null matches)
+        self.player_totals = {}
+        # player_id -> rating after the last match
+        self.ratings = {}
+        self.initial_ratings = {}
+
+
+def replay_tournament(matches, starting_ratings, default_rating=DEFAULT_RATING, vectorized=None):
+    """Replay a tournament's matches in order.
+
+    ``matches`` are player_matches rows sorted by (played_at, match_id);
+    ``starting_ratings`` maps player_id to the tournament starting rating.
+    Rows without a player 2 are guest matches: the guest is always rated
+    GUEST_RATING and gets no stats.
+
+    Large tournaments go through the NumPy kernel in rating_kernel when it is
+    available; ``vectorized`` forces (True) or disables (False) that choice.
+    """
+    if vectorized is not False and matches:
+        import rating_kernel
+        if rating_kernel.HAS_NUMPY:
+            waves = rating_kernel.plan_waves(matches)
+            if vectorized or rating_kernel.worth_vectorizing(matches, waves):
+                return rating_kernel.replay_waves(matches, waves, starting_ratings, default_rating)
+    return replay_tournament_scalar(matches, starting_ratings, default_rating)
+
+
+def replay_tournament_scalar(matches, starting_ratings, default_rating=DEFAULT_RATING):
+    """Pure-Python replay_tournament(); the reference implementation"""
+    result = ReplayResult()
+    ratings = dict(starting_ratings)
+    result.initial_ratings = dict(starting_ratings)
+    totals = result.player_totals
+
+    for match in matches:
+        player1_id = match['player1_id']
+        player2_id = match['player2_id']
+
+        rating1_before = ratings.get(player1_id, default_rating)
+        rating2_before = ratings.get(player2_id, default_rating) if player2_id is not None else GUEST_RATING
+        rating1_after, rating2_after = rate_match(match, rating1_before, rating2_before)
+
+        if player2_id is None:
+            # Guest ratings are never carried forward
+            rating2_after = GUEST_RATING if not match.get('is_null_match') else rating2_after
+
+        result.match_ratings.append((match['id'], rating1_before, rating2_before, rating1_after, rating2_after))
+
+        for player_id, rating_after in ((player1_id, rating1_after), (player2_id, rating2_after)):
+            if player_id is None:
+                continue
+            ratings[player_id] = rating_after
+            stats = match_stats(match, player_id)
+            if stats is None:
+                continue
+            player_totals = totals.get(player_id)
+            if player_totals is None:
+                player_totals = totals[player_id] = new_totals()
+            add_stats(player_totals, stats)
+            player_totals['tournament_rating'] = rating_after
+
+    result.ratings = ratings
+    return result
+
+
+def new_state():
+    """Empty tournament state: current ratings and stat totals per player"""
+    return {'ratings': {}, 'totals': {}}
+
+
+def copy_state(state):
+    return {
+        'ratings': dict(state['ratings']),
+        'totals': {player_id: dict(totals) for player_id, totals in state['totals'].items()}
+    }
+
+
+def checkpoint_states(matches, match_ratings, every=CHECKPOINT_INTERVAL, state=None, match_count=0):
+    """Snapshot a tournament's state every ``every`` matches of a replay.
+
+    Walks ``matches`` with the replay's ``match_ratings`` (nothing is
+    re-rated), starting from ``state`` taken after ``match_count`` matches -
+    the checkpoint the replay resumed from, or the empty state. A snapshot is
+    what replay_tournament() holds after that many matches: every player's
+    current rating and their stat totals with tournament_rating.
+    Returns [(match_count, match, state)] for every multiple of ``every``.
+    """
+    state = copy_state(state) if state else new_state()
+    ratings, totals = state['ratings'], state['totals']
+    snapshots = []
+    for match, (_, _, _, rating1_after, rating2_after) in zip(matches, match_ratings):
+        for player_id, rating_after in ((match['player1_id'], rating1_after), (match['player2_id'], rating2_after)):
+            if player_id is None:
+                continue
+            ratings[player_id] = int(rating_after)
+            stats = match_stats(match, player_id)
+            if stats is None:
+                continue
+            player_totals = totals.get(player_id)
+            if player_totals is None:
+                player_totals = totals[player_id] = new_totals()
+            add_stats(player_totals, stats)
+            player_totals['tournament_rating'] = int(rating_after)
+        match_count += 1
+        if match_count % every == 0:
+            snapshots.append((match_count, match, copy_state(state)))
+    return snapshots
+
+
+def replay_from_state(matches, starting_ratings, state, default_rating=DEFAULT_RATING):
+    """Replay the matches that follow a checkpoint.
+
+    Players enter with their checkpoint rating, or their starting rating if
+    they had not played yet. Returns (ReplayResult, totals) where totals are
+    the checkpoint totals plus the replayed matches - the same as
+    player_totals of a full replay up to the last of ``matches``.
+    """
+    ratings = dict(starting_ratings)
+    ratings.update(state['ratings'])
+    result = replay_tournament(matches, ratings, default_rating)
+    totals = {player_id: dict(player_totals) for player_id, player_totals in state['totals'].items()}
+    for player_id, player_totals in result.player_totals.items():
+        merged = totals.setdefault(player_id, new_totals())
+        add_stats(merged, player_totals)
+        merged['tournament_rating'] = player_totals['tournament_rating']
+    return result, totals
+
+
+def _replay_job(tournament_id, matches, starting_ratings, default_rating):
+    """Worker entry point for replay_tournaments(); must stay importable at module level"""
+    return tournament_id, replay_tournament(matches, starting_ratings, default_rating)
+
+
+def replay_tournaments(matches_by_tournament, starting_ratings, default_rating=DEFAULT_RATING,
+                       max_workers=None, on_result=None):
+    """Replay many tournaments, fanning them out to a process pool.
+
+    Tournament ratings never cross tournaments, so each one is replayed
+    independently. ``starting_ratings`` maps tournament_id to that
+    tournament's starting ratings. Returns {tournament_id: ReplayResult}.
+    ``on_result(tournament_id, result)`` is called in the parent as each
+    tournament finishes. ``max_workers`` defaults to the CPU count; with one
+    worker (or a single tournament) everything runs in this process.
+    """
+    # Largest tournaments first so one big replay does not start last
+    jobs = sorted(matches_by_tournament.items(), key=lambda item: len(item[1]), reverse=True)
+    results = {}
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers == 1 or len(jobs) <= 1:
+        for tournament_id, matches in jobs:
+            results[tournament_id] = replay_tournament(matches, starting_ratings.get(tournament_id, {}), default_rating)
+            if on_result:
+                on_result(tournament_id, results[tournament_id])
+        return results
+
+    # spawn, not fork: the parent holds open database connections and pool threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(_replay_job, tournament_id,
+                            [dict(match) for match in matches],
+                            dict(starting_ratings.get(tournament_id, {})), default_rating)
+            for tournament_id, matches in jobs
+        ]
+        for future in as_completed(futures):
+            tournament_id, result = future.result()
+            results[tournament_id] = result
+            if on_result:
+                on_result(tournament_id, result)
+    return results
+
+
+def overall_totals(player_id, matches):
+    """Overall rating and career stats for one player.
+
+    ``matches`` are every player_matches row of the player across all
+    tournaments, sorted by (played_at, match_id). The overall rating starts at
+    the first match's rating_before and adds each match's tournament rating
+    change; a player without matches has no rating (None).
+    """
+    totals = new_totals()
+    if not matches:
+        totals['rating'] = None
+        return totals
+
+    first = matches[0]
+    rating = first['player1_rating_before'] if first['player1_id'] == player_id else first['player2_rating_before']
+    for match in matches:
+        if match['player1_id'] == player_id:
+            rating += match['player1_rating_after'] - match['player1_rating_before']
+        else:
+            rating += match['player2_rating_after'] - match['player2_rating_before']
+        stats = match_stats(match, player_id)
+        if stats is not None:
+            add_stats(totals, stats)
+
+    totals['rating'] = int(round(clamp_rating(rating)))
+    return totals
@@ -0,0 +1,291 @@
+"""NumPy kernel for replaying large tournaments.
+
+Matches are split into "waves": a wave never contains two matches sharing a
+player, so every match in it can be rated in one vectorized call while each
+player's matches still happen in their original order. Results are identical
+to the scalar functions in rating_engine (same int(round()) and int(x * 0.75)
+rounding); test_rating_kernel.py checks this.
+"""
+import rating_engine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    print("Warning: numpy not installed. Vectorized rating replay is disabled.")
+
+HAS_NUMPY = np is not None
+
+# Below this many matches per wave on average the per-call overhead of NumPy
+# outweighs the vectorized math and the scalar replay is faster.
+MIN_AVERAGE_WAVE_SIZE = 32
+
+# Expected scores for every integer rating difference in this range are taken
+# from a table computed with Python floats, so the kernel sees exactly the
+# values the scalar path computes (NumPy's power() may differ in the last ulp,
+# which would flip round() on .5 ties).
+_TABLE_SPAN = 2000
+_EXPECTED_TABLE = None
+
+
+def _expected_table():
+    global _EXPECTED_TABLE
+    if _EXPECTED_TABLE is None:
+        _EXPECTED_TABLE = np.array(
+            [1 / (1 + 10 ** (diff / 400)) for diff in range(-_TABLE_SPAN, _TABLE_SPAN + 1)],
+            dtype=np.float64
+        )
+    return _EXPECTED_TABLE
+
+
+def expected_scores(diff):
+    """1 / (1 + 10 ** (diff / 400)) for an integer array of rating differences"""
+    diff = np.asarray(diff, dtype=np.int64)
+    in_table = np.abs(diff) <= _TABLE_SPAN
+    if in_table.all():
+        return _expected_table()[diff + _TABLE_SPAN]
+    result = np.empty(diff.shape, dtype=np.float64)
+    result[in_table] = _expected_table()[diff[in_table] + _TABLE_SPAN]
+    result[~in_table] = [1 / (1 + 10 ** (int(d) / 400)) for d in diff[~in_table]]
+    return result
+
+
+def _round_int(values):
+    # np.round rounds half to even, like Python's round()
+    return np.round(values).astype(np.int64)
+
+
+def elo_changes(winner_ratings, loser_ratings, is_draw):
+    """Vectorized rating_engine.rating_change()"""
+    winner_ratings = np.asarray(winner_ratings, dtype=np.int64)
+    loser_ratings = np.asarray(loser_ratings, dtype=np.int64)
+    is_draw = np.asarray(is_draw, dtype=bool)
+
+    expected_winner = expected_scores(loser_ratings - winner_ratings)
+    expected_loser = expected_scores(winner_ratings - loser_ratings)
+    winner_score = np.where(is_draw, 0.5, 1.0)
+    loser_score = np.where(is_draw, 0.5, 0.0)
+
+    winner_change = rating_engine.K_FACTOR * (winner_score - expected_winner)
+    loser_change = rating_engine.K_FACTOR * (loser_score - expected_loser)
+    return _round_int(winner_change), _round_int(loser_change)
+
+
+def enhanced_changes(ratings1, ratings2, goals1, goals2, absent1, absent2):
+    """Vectorized rating_engine.enhanced_rating_change()"""
+    ratings1 = np.asarray(ratings1, dtype=np.int64)
+    ratings2 = np.asarray(ratings2, dtype=np.int64)
+    goals1 = np.asarray(goals1, dtype=np.int64)
+    goals2 = np.asarray(goals2, dtype=np.int64)
+    absent1 = np.asarray(absent1, dtype=bool)
+    absent2 = np.asarray(absent2, dtype=bool)
+
+    is_draw = goals1 == goals2
+    # Draws are rated as (player 1, player 2); otherwise as (winner, loser)
+    player1_first = is_draw | (goals1 > goals2)
+    first = np.where(player1_first, ratings1, ratings2)
+    second = np.where(player1_first, ratings2, ratings1)
+    first_change, second_change = elo_changes(first, second, is_draw)
+    base1 = np.where(player1_first, first_change, second_change)
+    base2 = np.where(player1_first, second_change, first_change)
+
+    constant1 = (goals1 * rating_engine.GOAL_SCORED_POINTS
+                 + goals2 * rating_engine.GOAL_CONCEDED_PENALTY
+                 + np.where(goals2 == 0, rating_engine.CLEAN_SHEET_BONUS, 0))
+    constant2 = (goals2 * rating_engine.GOAL_SCORED_POINTS
+                 + goals1 * rating_engine.GOAL_CONCEDED_PENALTY
+                 + np.where(goals1 == 0, rating_engine.CLEAN_SHEET_BONUS, 0))
+    constant1 = np.where(absent1, 0, constant1)
+    constant2 = np.where(absent2, 0, constant2)
+    return base1 + constant1, base2 + constant2
+
+
+def walkover_changes(ratings1, ratings2, player1_wins):
+    """Vectorized walkover change: basic Elo scaled by 75%, truncated like int()"""
+    ratings1 = np.asarray(ratings1, dtype=np.int64)
+    ratings2 = np.asarray(ratings2, dtype=np.int64)
+    player1_wins = np.asarray(player1_wins, dtype=bool)
+
+    winner = np.where(player1_wins, ratings1, ratings2)
+    loser = np.where(player1_wins, ratings2, ratings1)
+    winner_change, loser_change = elo_changes(winner, loser, np.zeros(winner.shape, dtype=bool))
+    winner_change = np.trunc(winner_change * rating_engine.WALKOVER_FACTOR).astype(np.int64)
+    loser_change = np.trunc(loser_change * rating_engine.WALKOVER_FACTOR).astype(np.int64)
+    return (np.where(player1_wins, winner_change, loser_change),
+            np.where(player1_wins, loser_change, winner_change))
+
+
+def rate_matches(ratings1, ratings2, goals1, goals2, absent1, absent2,
+                 is_null_match, is_walkover, player1_wins):
+    """Vectorized rating_engine.rate_match() for independent matches"""
+    ratings1 = np.asarray(ratings1, dtype=np.int64)
+    ratings2 = np.asarray(ratings2, dtype=np.int64)
+    is_null_match = np.asarray(is_null_match, dtype=bool)
+    is_walkover = np.asarray(is_walkover, dtype=bool) & ~is_null_match
+
+    change1, change2 = enhanced_changes(ratings1, ratings2, goals1, goals2, absent1, absent2)
+    walkover1, walkover2 = walkover_changes(ratings1, ratings2, player1_wins)
+    change1 = np.where(is_walkover, walkover1, change1)
+    change2 = np.where(is_walkover, walkover2, change2)
+    change1 = np.where(is_null_match, -rating_engine.NULL_MATCH_PENALTY, change1)
+    change2 = np.where(is_null_match, -rating_engine.NULL_MATCH_PENALTY, change2)
+
+    return (np.clip(ratings1 + change1, rating_engine.MIN_RATING, rating_engine.MAX_RATING),
+            np.clip(ratings2 + change2, rating_engine.MIN_RATING, rating_engine.MAX_RATING))
+
+
+def plan_waves(matches):
+    """Group match indexes into waves with no player appearing twice per wave.
+
+    A match lands in the wave after the latest wave holding any of its
+    players, so each player's matches keep their original order.
+    """
+    last_wave = {}
+    waves = []
+    for index, match in enumerate(matches):
+        player1_id = match['player1_id']
+        player2_id = match['player2_id']
+        wave = last_wave.get(player1_id, -1)
+        if player2_id is not None:
+            wave = max(wave, last_wave.get(player2_id, -1))
+        wave += 1
+        last_wave[player1_id] = wave
+        if player2_id is not None:
+            last_wave[player2_id] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(index)
+    return waves
+
+
+def worth_vectorizing(matches, waves):
+    """Whether the waves are wide enough for the kernel to beat the scalar loop"""
+    return bool(waves) and len(matches) / len(waves) >= MIN_AVERAGE_WAVE_SIZE
+
+
+def replay_waves(matches, waves, starting_ratings, default_rating=rating_engine.DEFAULT_RATING):
+    """Vectorized rating_engine.replay_tournament() over precomputed waves"""
+    result = rating_engine.ReplayResult()
+    result.initial_ratings = dict(starting_ratings)
+    count = len(matches)
+
+    # Dense player indexes so ratings live in one array
+    player_index = {}
+    player_ids = []
+    player1_idx = np.empty(count, dtype=np.int64)
+    player2_idx = np.empty(count, dtype=np.int64)
+    for i, match in enumerate(matches):
+        for column, target in (('player1_id', player1_idx), ('player2_id', player2_idx)):
+            player_id = match[column]
+            if player_id is None:
+                target[i] = -1
+                continue
+            index = player_index.get(player_id)
+            if index is None:
+                index = player_index[player_id] = len(player_ids)
+                player_ids.append(player_id)
+            target[i] = index
+
+    ratings = np.array([starting_ratings.get(player_id, default_rating) for player_id in player_ids],
+                       dtype=np.int64)
+    goals1 = np.array([match['player1_goals'] or 0 for match in matches], dtype=np.int64)
+    goals2 = np.array([match['player2_goals'] or 0 for match in matches], dtype=np.int64)
+    absent1 = np.array([bool(match.get('player1_absent')) for match in matches], dtype=bool)
+    absent2 = np.array([bool(match.get('player2_absent')) for match in matches], dtype=bool)
+    is_null = np.array([bool(match.get('is_null_match')) for match in matches], dtype=bool)
+    is_walkover = np.array([bool(match.get('is_walkover')) for match in matches], dtype=bool)
+    player1_wins = np.array([match.get('winner_id') == match['player1_id'] for match in matches], dtype=bool)
+
+    before1 = np.empty(count, dtype=np.int64)
+    before2 = np.empty(count, dtype=np.int64)
+    after1 = np.empty(count, dtype=np.int64)
+    after2 = np.empty(count, dtype=np.int64)
+
+    for wave in waves:
+        wave = np.asarray(wave, dtype=np.int64)
+        idx1 = player1_idx[wave]
+        idx2 = player2_idx[wave]
+        guest = idx2 < 0
+        ratings1 = ratings[idx1]
+        ratings2 = np.where(guest, rating_engine.GUEST_RATING, ratings[np.where(guest, 0, idx2)])
+
+        new1, new2 = rate_matches(ratings1, ratings2, goals1[wave], goals2[wave],
+                                  absent1[wave], absent2[wave], is_null[wave],
+                                  is_walkover[wave], player1_wins[wave])
+        # Guest ratings are never carried forward
+        new2 = np.where(guest & ~is_null[wave], rating_engine.GUEST_RATING, new2)
+
+        before1[wave] = ratings1
+        before2[wave] = ratings2
+        after1[wave] = new1
+        after2[wave] = new2
+        ratings[idx1] = new1
+        ratings[idx2[~guest]] = new2[~guest]
+
+    result.match_ratings = list(zip(
+        [match['id'] for match in matches],
+        before1.tolist(), before2.tolist(), after1.tolist(), after2.tolist()
+    ))
+
+    result.player_totals = _player_totals(
+        player_ids, player1_idx, player2_idx, goals1, goals2, after1, after2,
+        is_null, is_walkover, player1_wins,
+        np.array([bool(match.get('is_draw')) for match in matches], dtype=bool),
+        np.array([match.get('winner_id') is not None and match.get('winner_id') == match['player2_id']
+                  for match in matches], dtype=bool)
+    )
+
+    result.ratings = dict(starting_ratings)
+    result.ratings.update(zip(player_ids, ratings.tolist()))
+    return result
+
+
+def _player_totals(player_ids, player1_idx, player2_idx, goals1, goals2, after1, after2,
+                   is_null, is_walkover, player1_wins, is_draw, player2_wins):
+    """Vectorized rating_engine.match_stats() accumulation per player"""
+    count = len(player1_idx)
+    match_index = np.arange(count)
+    guest = player2_idx < 0
+
+    # One row per (match, player) side; null matches and guests carry no stats
+    valid = np.concatenate([~is_null, ~is_null & ~guest])
+    idx = np.concatenate([player1_idx, player2_idx])[valid]
+    order = np.concatenate([match_index, match_index])[valid]
+    goals_for = np.concatenate([goals1, goals2])[valid]
+    goals_against = np.concatenate([goals2, goals1])[valid]
+    won = np.concatenate([player1_wins, player2_wins])[valid]
+    drawn = np.concatenate([is_draw, is_draw])[valid]
+    rating_after = np.concatenate([after1, after2])[valid]
+    scored = ~np.concatenate([is_walkover, is_walkover])[valid]
+
+    clean_sheet = scored & (goals_against == 0)
+    fields = {
+        'matches_played': np.ones(idx.shape, dtype=np.int64),
+        'wins': won,
+        'draws': drawn,
+        'losses': ~won & ~drawn,
+        'goals_scored': np.where(scored, goals_for, 0),
+        'goals_conceded': np.where(scored, goals_against, 0),
+        'clean_sheets': clean_sheet,
+        'golden_glove_points': np.where(scored, 5 * clean_sheet + 2 * won - goals_against, 0)
+    }
+    size = len(player_ids)
+    sums = {field: np.bincount(idx, weights=values.astype(np.int64), minlength=size).astype(np.int64)
+            for field, values in fields.items()}
+
+    # Tournament rating is the rating after each player's last counted match
+    last_match = np.full(size, -1, dtype=np.int64)
+    np.maximum.at(last_match, idx, order)
+    tournament_rating = np.zeros(size, dtype=np.int64)
+    is_last = order == last_match[idx]
+    tournament_rating[idx[is_last]] = rating_after[is_last]
+
+    totals = {}
+    played = sums['matches_played']
+    columns = {field: values.tolist() for field, values in sums.items()}
+    ratings = tournament_rating.tolist()
+    for i in np.nonzero(played)[0].tolist():
+        player_totals = {field: columns[field][i] for field in rating_engine.STAT_FIELDS}
+        player_totals['tournament_rating'] = ratings[i]
+        totals[player_ids[i]] = player_totals
+    return totals
@@ -13,6 +13,9 @@ The enhanced system includes:
 - -15 point penalty for nullified matches (both players absent)
 
 SAFETY: This script preserves all match data and only updates calculated values.
+
+Usage: python recalculate_ratings.py [--parallel]
+  --parallel  replay tournaments across a process pool (one worker per CPU)
 """
 
 import sys
@@ -70,7 +73,7 @@ def main():
         start_time = datetime.now()
         print(f"⏰ Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        TournamentDB.recalculate_all_ratings()
+        TournamentDB.recalculate_all_ratings(parallel='--parallel' in sys.argv)
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -38,8 +38,14 @@ def reset_database():
                 'knockout_games', 
                 'knockout_matches',
                 'matches',
+                'rating_checkpoints',
+                'recalculation_job_events',
+                'recalculation_jobs',
+                'award_standings',
+                'data_versions',
                 'tournament_players',
                 'player_stats',
+                'player_match_ledger',
                 'player_matches',
                 'players',
                 'tournaments',
@@ -0,0 +1,75 @@
+"""
+Request-scoped connections: what a connection looks like when the pool hands it out again.
+Run with: python -m pytest test_connection_pool.py
+"""
+import os
+import time
+from types import SimpleNamespace
+
+from flask import Flask
+from psycopg2 import extensions as pg_extensions
+
+import database
+
+app = Flask(__name__)
+app.teardown_request(database.close_request_connection)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.isolation_level = pg_extensions.ISOLATION_LEVEL_DEFAULT
+        self.info = SimpleNamespace(transaction_status=pg_extensions.TRANSACTION_STATUS_IDLE)
+
+    def set_session(self, isolation_level=None):
+        if isolation_level is not None:
+            self.isolation_level = isolation_level
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.idle = [conn]
+
+    def getconn(self):
+        return self.idle.pop()
+
+    def putconn(self, conn, close=False):
+        if not close:
+            self.idle.append(conn)
+
+
+def setup_function():
+    database._pool = FakePool(FakeConnection())
+    database._pool_pid = os.getpid()
+    database._pool_last_used.clear()
+    # Recently used, so it is handed out without a ping
+    database._pool_last_used[id(database._pool.conn)] = time.monotonic()
+
+
+def teardown_function():
+    database._pool = None
+    database._pool_pid = None
+    database._pool_last_used.clear()
+
+
+def test_connection_reused_after_a_get_is_back_at_the_default_isolation_level():
+    conn = database._pool.conn
+    with app.test_request_context('/public', method='GET'):
+        database.get_db_connection()
+        assert conn.isolation_level == pg_extensions.ISOLATION_LEVEL_REPEATABLE_READ
+        app.do_teardown_request()
+
+    assert database._pool.idle == [conn]
+    assert conn.isolation_level == pg_extensions.ISOLATION_LEVEL_DEFAULT
+
+    with app.test_request_context('/admin/matches/record', method='POST'):
+        database.get_db_connection()
+        assert conn.isolation_level == pg_extensions.ISOLATION_LEVEL_DEFAULT
+        app.do_teardown_request()
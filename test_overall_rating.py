@@ -0,0 +1,54 @@
+"""
+Incremental overall rating updates agree with the full history replay, also at the 0/1000 bounds.
+Run with: python -m pytest test_overall_rating.py
+"""
+import pytest
+
+from database import TournamentDB
+
+
+class LedgerCursor:
+    """Serves the players row and player_match_ledger queries for one player"""
+
+    def __init__(self, rating):
+        self.rating = rating
+        self.ledger = []
+        self._result = None
+
+    def execute(self, query, params=None):
+        if query.lstrip().startswith('UPDATE players'):
+            self.rating = params[0]
+        elif 'EXISTS' in query:
+            match_id = params[1]
+            self._result = {'rating': self.rating,
+                            'has_history': any(row['match_id'] != match_id for row in self.ledger)}
+        else:
+            self._result = [{'tournament_rating_before': row['before'], 'tournament_rating_after': row['after']}
+                            for row in self.ledger]
+
+    def fetchone(self):
+        return self._result
+
+    def fetchall(self):
+        return self._result
+
+
+def play(cursor, match_id, before, after):
+    """Record a ledger row, then apply it the way record_match does"""
+    cursor.ledger.append({'match_id': match_id, 'before': before, 'after': after})
+    return TournamentDB._apply_overall_rating_change(cursor, 1, match_id, before, after)
+
+
+@pytest.mark.parametrize('matches', [
+    # Two tournaments take the running total below 0, then it recovers
+    [(20, 5), (300, 280), (280, 300)],
+    # Above 1000 and back down
+    [(990, 1000), (300, 320), (320, 300), (300, 295)],
+    # Only inside the bounds
+    [(300, 310), (310, 305), (400, 420)],
+])
+def test_incremental_rating_matches_replay(matches):
+    cursor = LedgerCursor(rating=None)
+    for match_id, (before, after) in enumerate(matches, start=1):
+        stored = play(cursor, match_id, before, after)
+        assert stored == TournamentDB.calculate_overall_rating_from_last_matches(cursor, 1)
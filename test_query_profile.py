@@ -0,0 +1,58 @@
+"""
+Query profiler: per-request totals, slowest statements, call sites and Server-Timing.
+Run with: python -m pytest test_query_profile.py
+"""
+from flask import Flask
+
+import database
+from database import QueryProfile, finish_query_profile, start_query_profile, summarize_query_profiles
+
+app = Flask(__name__)
+
+
+@app.route('/page')
+def page():
+    return 'ok'
+
+
+def setup_function():
+    database.query_profiles.clear()
+
+
+def test_totals_slowest_and_call_sites():
+    profile = QueryProfile('GET', '/page', 'page')
+    for ms in (1.0, 9.0, 2.0, 7.0, 3.0, 8.0):
+        profile.record(b"SELECT  *\n FROM players WHERE id = 1", ms, 'get_player_by_id (database.py:10)')
+    profile.record("SELECT 1", 0.5, 'get_data_version (database.py:20)')
+
+    assert profile.count == 7
+    assert profile.db_ms == 30.5
+    assert [statement['ms'] for statement in profile.slowest] == [9.0, 8.0, 7.0, 3.0, 2.0]
+    assert profile.slowest[0]['sql'] == "SELECT * FROM players WHERE id = 1"
+    assert profile.top_call_sites(1) == [('get_player_by_id (database.py:10)', 6, 30.0)]
+
+
+def test_request_hooks_set_server_timing_and_fill_ring_buffer():
+    with app.test_request_context('/page?x=1'):
+        app.preprocess_request()
+        start_query_profile()
+        database.g._query_profile.record("SELECT 1", 4.0, 'page (app.py:1)')
+        response = finish_query_profile(app.make_response('ok'))
+
+    assert response.headers['Server-Timing'].startswith('db;dur=4.0;desc="1 queries", total;dur=')
+    assert len(database.query_profiles) == 1
+    assert database.query_profiles[0].path == '/page?x=1'
+    assert summarize_query_profiles()[0]['endpoint'] == 'page'
+
+
+def test_call_site_skips_the_cursor_layer():
+    def execute():
+        return _profiled()
+
+    def _profiled():
+        return database._query_call_site()
+
+    def get_player_awards():
+        return execute()
+
+    assert get_player_awards().startswith('get_player_awards (test_query_profile.py:')
@@ -0,0 +1,130 @@
+"""
+Checkpoints: resuming a replay from a snapshot gives the same result as a full replay.
+Run with: python -m pytest test_rating_checkpoints.py
+"""
+import contextlib
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import database
+import rating_engine
+from database import TournamentDB
+from test_rating_kernel import make_matches
+
+TOURNAMENT_ID = 1
+
+
+@pytest.mark.parametrize("seed", [3, 11])
+def test_resume_from_checkpoint_matches_full_replay(seed):
+    matches, starting_ratings = make_matches(seed, match_count=230)
+    full = rating_engine.replay_tournament_scalar(matches, starting_ratings)
+    snapshots = rating_engine.checkpoint_states(matches, full.match_ratings, every=50)
+    assert [count for count, _, _ in snapshots] == [50, 100, 150, 200]
+
+    for count, last_match, state in snapshots:
+        assert last_match is matches[count - 1]
+        result, totals = rating_engine.replay_from_state(matches[count:], starting_ratings, state)
+        assert result.match_ratings == full.match_ratings[count:]
+        assert totals == full.player_totals
+
+
+def test_snapshot_equals_replay_of_prefix():
+    matches, starting_ratings = make_matches(5, match_count=120)
+    full = rating_engine.replay_tournament_scalar(matches, starting_ratings)
+    count, _, state = rating_engine.checkpoint_states(matches, full.match_ratings, every=60)[0]
+    prefix = rating_engine.replay_tournament_scalar(matches[:count], starting_ratings)
+    assert state['totals'] == prefix.player_totals
+    assert all(prefix.ratings[player_id] == rating for player_id, rating in state['ratings'].items())
+
+
+def test_resumed_checkpoints_continue_the_count():
+    matches, starting_ratings = make_matches(8, match_count=130)
+    full = rating_engine.replay_tournament_scalar(matches, starting_ratings)
+    first = rating_engine.checkpoint_states(matches, full.match_ratings, every=40)
+    count, _, state = first[1]
+    resumed = rating_engine.checkpoint_states(matches[count:], full.match_ratings[count:], every=40,
+                                              state=state, match_count=count)
+    assert [(c, s) for c, _, s in resumed] == [(c, s) for c, _, s in first[2:]]
+
+
+class LeagueCursor:
+    """Serves one tournament's matches, checkpoints and roster from memory"""
+
+    def __init__(self, starting_ratings):
+        self.starting_ratings = starting_ratings
+        self.matches = []
+        self.checkpoints = {}
+        self._result = []
+
+    def execute(self, query, params=None):
+        if 'FROM rating_checkpoints' in query:
+            rows = list(self.checkpoints.values())
+            if 'played_at <=' in query:
+                rows = [row for row in rows if row['played_at'] <= params[1]]
+            self._result = [max(rows, key=lambda row: row['match_count'])] if rows else []
+        elif 'WITH participants' in query:
+            self._result = [{'tournament_id': TOURNAMENT_ID, 'player_id': player_id, 'starting_rating': rating}
+                            for player_id, rating in self.starting_ratings.items()]
+        elif 'FROM players p' in query:
+            self._result = [{'player_id': player_id, 'name': f'Player {player_id}', 'photo_url': None,
+                             'overall_rating': None, 'division_id': None, 'division_name': None,
+                             'division_starting_rating': None} for player_id in params[1]]
+        else:
+            rows = self.matches
+            if 'match_id' in params:
+                position = (params['played_at'], params['match_id'])
+                rows = [row for row in rows if (row['played_at'], row['match_id']) > position]
+            if 'as_of' in params:
+                rows = [row for row in rows if row['played_at'] <= params['as_of']]
+            self._result = [{'pending': len(rows)}] if 'COUNT(*)' in query else [dict(row) for row in rows]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def write_checkpoints(self, cursor, query, rows, page_size=None):
+        """Stands in for execute_values() in _write_checkpoints (the state column is JSONB)"""
+        for tournament_id, match_count, played_at, match_id, state in rows:
+            self.checkpoints[match_count] = {'tournament_id': tournament_id, 'match_count': match_count,
+                                             'played_at': played_at, 'match_id': match_id,
+                                             'state': json.loads(state)}
+
+
+class LeagueConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return contextlib.nullcontext(self._cursor)
+
+    def close(self):
+        pass
+
+
+def test_recorded_matches_get_checkpoints_and_as_of_matches_full_replay(monkeypatch):
+    interval = rating_engine.CHECKPOINT_INTERVAL
+    matches, starting_ratings = make_matches(13, match_count=2 * interval + 17)
+    started = datetime(2024, 1, 1)
+    for match in matches:
+        match.update(match_id=match['id'], tournament_id=TOURNAMENT_ID,
+                     played_at=started + timedelta(minutes=match['id']))
+
+    cursor = LeagueCursor(starting_ratings)
+    monkeypatch.setattr(database, 'execute_values', cursor.write_checkpoints)
+    monkeypatch.setattr(database, 'get_db_connection', lambda: LeagueConnection(cursor))
+
+    # What every record path does in its transaction after inserting a match
+    for match in matches:
+        cursor.matches.append(match)
+        TournamentDB._extend_checkpoints(cursor, [TOURNAMENT_ID])
+    assert sorted(cursor.checkpoints) == [interval, 2 * interval]
+
+    for count in (len(matches), 2 * interval + 3, interval, interval - 1):
+        expected = rating_engine.replay_tournament(matches[:count], starting_ratings).player_totals
+        standings = TournamentDB.get_tournament_standings_as_of(TOURNAMENT_ID, matches[count - 1]['played_at'])
+        assert {row['player_id']: {field: row[field] for field in expected[row['player_id']]}
+                for row in standings} == expected
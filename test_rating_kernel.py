@@ -0,0 +1,143 @@
+"""
+Parity tests: NumPy rating kernel vs the scalar rating engine.
+Run with: python -m pytest test_rating_kernel.py
+"""
+import random
+
+import pytest
+
+import rating_engine
+
+np = pytest.importorskip("numpy")
+import rating_kernel  # noqa: E402
+
+
+def make_matches(seed, player_count=30, match_count=600, guest_share=0.1):
+    """Random tournament in player_matches shape, including guests, walkovers and null matches"""
+    rng = random.Random(seed)
+    players = list(range(1, player_count + 1))
+    matches = []
+    for i in range(match_count):
+        player1_id = rng.choice(players)
+        player2_id = None if rng.random() < guest_share else rng.choice([p for p in players if p != player1_id])
+        kind = rng.random()
+        match = {
+            'id': i + 1,
+            'player1_id': player1_id,
+            'player2_id': player2_id,
+            'player1_goals': 0,
+            'player2_goals': 0,
+            'winner_id': None,
+            'is_draw': False,
+            'is_walkover': False,
+            'is_null_match': False,
+            'player1_absent': False,
+            'player2_absent': False
+        }
+        if kind < 0.05:
+            match.update(is_null_match=True, player1_absent=True, player2_absent=True)
+        elif kind < 0.15:
+            player1_absent = rng.random() < 0.5
+            match.update(is_walkover=True, player1_absent=player1_absent, player2_absent=not player1_absent,
+                         winner_id=player2_id if player1_absent else player1_id)
+        else:
+            goals1, goals2 = rng.randint(0, 7), rng.randint(0, 7)
+            match.update(player1_goals=goals1, player2_goals=goals2, is_draw=goals1 == goals2,
+                         winner_id=None if goals1 == goals2 else (player1_id if goals1 > goals2 else player2_id))
+        matches.append(match)
+    starting_ratings = {p: rng.choice([300, 300, 400, 500, 950, 20]) for p in players}
+    return matches, starting_ratings
+
+
+def test_expected_scores_match_python_floats():
+    diffs = np.arange(-2600, 2601)
+    expected = [1 / (1 + 10 ** (int(d) / 400)) for d in diffs]
+    assert rating_kernel.expected_scores(diffs).tolist() == expected
+
+
+def test_elo_changes_match_scalar():
+    ratings = np.arange(0, 1001, 7)
+    winners, losers = np.meshgrid(ratings, ratings)
+    winners, losers = winners.ravel(), losers.ravel()
+    for is_draw in (False, True):
+        winner_changes, loser_changes = rating_kernel.elo_changes(winners, losers, np.full(winners.shape, is_draw))
+        scalar = [rating_engine.rating_change(int(w), int(l), is_draw) for w, l in zip(winners, losers)]
+        assert list(zip(winner_changes.tolist(), loser_changes.tolist())) == scalar
+
+
+def test_enhanced_changes_match_scalar():
+    rng = random.Random(7)
+    rows = [(rng.randint(0, 1000), rng.randint(0, 1000), rng.randint(0, 9), rng.randint(0, 9),
+             rng.random() < 0.1, rng.random() < 0.1) for _ in range(20000)]
+    columns = [np.array(column) for column in zip(*rows)]
+    changes1, changes2 = rating_kernel.enhanced_changes(*columns)
+    scalar = [rating_engine.enhanced_rating_change(*row) for row in rows]
+    assert list(zip(changes1.tolist(), changes2.tolist())) == scalar
+
+
+def test_walkover_changes_truncate_like_int():
+    rng = random.Random(11)
+    rows = [(rng.randint(0, 1000), rng.randint(0, 1000), rng.random() < 0.5) for _ in range(20000)]
+    ratings1, ratings2, player1_wins = (np.array(column) for column in zip(*rows))
+    changes1, changes2 = rating_kernel.walkover_changes(ratings1, ratings2, player1_wins)
+    for (rating1, rating2, p1_wins), change1, change2 in zip(rows, changes1.tolist(), changes2.tolist()):
+        match = {'player1_id': 1, 'winner_id': 1 if p1_wins else 2, 'is_walkover': True}
+        after1, after2 = rating_engine.rate_match(match, rating1, rating2)
+        assert rating_engine.clamp_rating(rating1 + change1) == after1
+        assert rating_engine.clamp_rating(rating2 + change2) == after2
+
+
+def test_waves_have_no_shared_players_and_keep_order():
+    matches, _ = make_matches(seed=3)
+    waves = rating_kernel.plan_waves(matches)
+    assert sorted(i for wave in waves for i in wave) == list(range(len(matches)))
+
+    wave_of = {}
+    for number, wave in enumerate(waves):
+        players = [p for i in wave for p in (matches[i]['player1_id'], matches[i]['player2_id']) if p is not None]
+        assert len(players) == len(set(players))
+        for i in wave:
+            wave_of[i] = number
+
+    last_seen = {}
+    for i, match in enumerate(matches):
+        for player_id in (match['player1_id'], match['player2_id']):
+            if player_id is None:
+                continue
+            if player_id in last_seen:
+                assert wave_of[last_seen[player_id]] < wave_of[i]
+            last_seen[player_id] = i
+
+
+@pytest.mark.parametrize("seed,player_count", [(1, 4), (2, 30), (3, 200)])
+def test_replay_matches_scalar_engine(seed, player_count):
+    matches, starting_ratings = make_matches(seed, player_count=player_count)
+    scalar = rating_engine.replay_tournament_scalar(matches, starting_ratings)
+    vectorized = rating_engine.replay_tournament(matches, starting_ratings, vectorized=True)
+
+    assert vectorized.match_ratings == scalar.match_ratings
+    assert vectorized.player_totals == scalar.player_totals
+    assert vectorized.ratings == scalar.ratings
+    assert vectorized.initial_ratings == scalar.initial_ratings
+
+
+def test_players_missing_from_starting_ratings_use_default():
+    matches, _ = make_matches(seed=5, player_count=10, match_count=100)
+    scalar = rating_engine.replay_tournament_scalar(matches, {}, default_rating=450)
+    vectorized = rating_engine.replay_tournament(matches, {}, default_rating=450, vectorized=True)
+    assert vectorized.match_ratings == scalar.match_ratings
+    assert vectorized.ratings == scalar.ratings
+
+
+def test_parallel_replay_matches_sequential():
+    matches_by_tournament, starting_ratings = {}, {}
+    for tournament_id in range(1, 5):
+        matches, ratings = make_matches(seed=tournament_id, match_count=50 * tournament_id)
+        matches_by_tournament[tournament_id] = matches
+        starting_ratings[tournament_id] = ratings
+    sequential = rating_engine.replay_tournaments(matches_by_tournament, starting_ratings, max_workers=1)
+    parallel = rating_engine.replay_tournaments(matches_by_tournament, starting_ratings, max_workers=2)
+    assert sorted(parallel) == sorted(sequential) == [1, 2, 3, 4]
+    for tournament_id, result in sequential.items():
+        assert parallel[tournament_id].match_ratings == result.match_ratings
+        assert parallel[tournament_id].player_totals == result.player_totals
@@ -0,0 +1,126 @@
+"""
+Read-through cache: TTL/LRU behaviour and write-driven invalidation.
+Run with: python -m pytest test_read_cache.py
+"""
+import time
+
+from flask import Flask
+
+import database
+from database import ReadCache, cached_read, enable_read_cache, invalidates_reads
+
+app = Flask(__name__)
+
+
+class FakeDB:
+    calls = 0
+    rows = [{'id': 1, 'name': 'A'}]
+
+    @staticmethod
+    @cached_read
+    def get_rows(tournament_id=None):
+        FakeDB.calls += 1
+        return [dict(row, tournament_id=tournament_id) for row in FakeDB.rows]
+
+    @staticmethod
+    @invalidates_reads
+    def rename(name):
+        FakeDB.rows = [{'id': 1, 'name': name}]
+
+
+def setup_function():
+    database.read_cache = ReadCache(ttl=30, max_entries=2)
+    FakeDB.calls = 0
+    FakeDB.rows = [{'id': 1, 'name': 'A'}]
+
+
+def test_cache_is_opt_in_per_request():
+    with app.test_request_context():
+        FakeDB.get_rows()
+        FakeDB.get_rows()
+    assert FakeDB.calls == 2
+
+
+def test_hits_are_copies_and_writes_invalidate():
+    with app.test_request_context():
+        enable_read_cache()
+        FakeDB.get_rows(1)[0]['name'] = 'mutated'
+        assert FakeDB.get_rows(1)[0]['name'] == 'A'
+        assert FakeDB.calls == 1
+
+        FakeDB.rename('B')
+        assert FakeDB.get_rows(1)[0]['name'] == 'B'
+        assert FakeDB.calls == 2
+
+
+def test_lru_eviction_and_ttl():
+    with app.test_request_context():
+        enable_read_cache()
+        FakeDB.get_rows(1)
+        FakeDB.get_rows(2)
+        FakeDB.get_rows(1)
+        FakeDB.get_rows(3)  # evicts 2, the least recently used
+        FakeDB.get_rows(1)
+        assert FakeDB.calls == 3
+        FakeDB.get_rows(2)
+        assert FakeDB.calls == 4
+
+        database.read_cache.ttl = 0.01
+        time.sleep(0.02)
+        FakeDB.get_rows(1)
+        assert FakeDB.calls == 5
+
+
+def test_result_read_before_a_write_is_not_stored():
+    cache = ReadCache(ttl=30, max_entries=10)
+    version = cache.version
+    cache.bump()
+    cache.put('key', version, 'stale')
+    assert cache.get('key') == (False, None)
+
+
+def test_data_version_change_from_another_process_invalidates():
+    with app.test_request_context():
+        enable_read_cache(data_version=1)
+        FakeDB.get_rows(1)
+        FakeDB.get_rows(1)
+    with app.test_request_context():
+        enable_read_cache(data_version=2)
+        FakeDB.get_rows(1)
+    assert FakeDB.calls == 2
+
+
+def test_match_counts_are_bounded_and_dropped_by_writes(monkeypatch):
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def execute(self, query, params=None):
+            pass
+
+        def fetchone(self):
+            return {'total': 7}
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(database, 'get_db_connection', Connection)
+    monkeypatch.setattr(database, 'MATCH_COUNT_CACHE_MAX_ENTRIES', 2)
+    database.clear_match_count_cache()
+
+    database.TournamentDB.get_matches_count(search_query='admin search')
+    assert len(database._match_count_cache) == 0
+
+    for search in ('a', 'b', 'c'):
+        database.TournamentDB.get_matches_count(search_query=search, max_age=60)
+    assert list(database._match_count_cache) == [(None, 'b'), (None, 'c')]
+
+    FakeDB.rename('B')
+    assert len(database._match_count_cache) == 0
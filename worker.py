@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Recalculation Worker
+
+Runs the rating recalculations queued by the admin pages (recalculation_jobs)
+outside the web workers, so a long replay never holds a request open or hits
+the gunicorn timeout. Progress is written to recalculation_job_events, which
+the live recalculation page tails.
+
+Jobs survive restarts: a job left running by a worker that died is picked up
+again once its heartbeat is older than RECALC_JOB_STALE_SECONDS. Several
+workers can run side by side; each job is claimed by exactly one.
+
+gunicorn.conf.py starts one worker next to the web server unless
+RECALC_WORKER_EMBEDDED=0.
+
+Usage: python worker.py [--once]
+  --once  run the queued jobs and exit instead of polling
+"""
+
+import sys
+import os
+import signal
+import socket
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import TournamentDB, RECALC_JOB_STALE_SECONDS
+
+# Seconds between queue polls when idle
+POLL_SECONDS = float(os.getenv('RECALC_WORKER_POLL_SECONDS', '2'))
+# Heartbeats per stale period, so a slow poll never makes a live job look abandoned
+HEARTBEAT_SECONDS = max(1, RECALC_JOB_STALE_SECONDS // 5)
+
+stopping = threading.Event()
+
+
+def heartbeat(job_id, done):
+    """Keep the job's heartbeat fresh until it finishes"""
+    while not done.wait(HEARTBEAT_SECONDS):
+        try:
+            TournamentDB.touch_recalculation_job(job_id)
+        except Exception as e:
+            print(f"Heartbeat for job {job_id} failed: {e}")
+
+
+def run_job(job):
+    scope = f"tournament {job['tournament_id']}" if job['tournament_id'] else "all tournaments"
+    print(f"▶ Job {job['id']} ({scope}, attempt {job['attempts']})")
+    done = threading.Event()
+    beat = threading.Thread(target=heartbeat, args=(job['id'], done), daemon=True)
+    beat.start()
+    try:
+        status = TournamentDB.run_recalculation_job(job)
+    finally:
+        done.set()
+        beat.join()
+    print(f"{'✓' if status == 'done' else '✗'} Job {job['id']} {status}")
+
+
+def main():
+    once = '--once' in sys.argv[1:]
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    
+    # Finish the current job on shutdown; an interrupted one would be retried anyway
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+    
+    print(f"Recalculation worker {name} started")
+    while not stopping.is_set():
+        try:
+            job = TournamentDB.claim_recalculation_job(name)
+            if job:
+                run_job(job)
+                continue
+        except Exception as e:
+            print(f"Worker error: {e}")
+        if once:
+            break
+        stopping.wait(POLL_SECONDS)
+    print(f"Recalculation worker {name} stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())